@@ -1,2 +1,3 @@
 from .networkx import NetworkXBackend
 from .memory import InMemoryBackend
+from .matrix import MatrixBackend
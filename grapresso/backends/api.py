@@ -1,11 +1,73 @@
+import math
 from abc import ABC, abstractmethod
-from typing import Iterable, Hashable, Any
+from array import array
+from typing import Iterable, Iterator, Hashable, Any, Sequence, Tuple
 
 from grapresso.components.edge import Edge
 from grapresso.components.node import Node
 
 
+class BackendListener:
+    """Gets notified about modifications of the edges and nodes of a backend, see `DataBackend.add_listener`.
+    Notifications are sent after a modification has been made, so listeners query the backend for the new state.
+    They must tolerate notifications about edges that did not change in a way that matters to them.
+    """
+
+    def edge_changed(self, from_node_name: Hashable, to_node_name: Hashable):
+        """The edge (from_node_name, to_node_name) has been added or removed or its attributes have changed."""
+        pass
+
+    def node_removed(self, node_name: Hashable):
+        """The node has been removed, the removal of its edges has been notified before."""
+        pass
+
+
 class DataBackend(ABC):
+    # Number of modifications so far, see `version`:
+    _version = 0
+    # Notified about modifications, see `add_listener`:
+    _listeners: Tuple[BackendListener, ...] = ()
+
+    @property
+    def version(self) -> int:
+        """Counter that changes with every modification through the backend, its nodes or its edges:
+        Adding and removing nodes or edges as well as setting their attributes (e.g. an edge's cost).
+        Results computed at the same version are still valid, which is what `DiGraph`'s result cache relies on.
+
+        Returns:
+            The current version, it only ever increases.
+        """
+        return self._version
+
+    def _modified(self):
+        """Must be called by implementations on every modification that is not covered by `_edge_changed`
+        or `_node_removed`, e.g. setting a node's balance."""
+        self._version += 1
+
+    def _edge_changed(self, from_node_name: Hashable, to_node_name: Hashable):
+        """Must be called by implementations after an edge has been added or removed or its attributes have changed.
+        A symmetric edge that is stored once changes in both directions, both need to be notified.
+        """
+        self._modified()
+        for listener in self._listeners:
+            listener.edge_changed(from_node_name, to_node_name)
+
+    def _node_removed(self, node_name: Hashable):
+        """Must be called by implementations after a node has been removed and its edges have been notified."""
+        self._modified()
+        for listener in self._listeners:
+            listener.node_removed(node_name)
+
+    def add_listener(self, listener: BackendListener):
+        """Notify listener about all following modifications of edges and removals of nodes.
+        Structures that are derived from the graph use this to update themselves incrementally,
+        see e.g. `DynamicShortestPaths`.
+        """
+        self._listeners += (listener,)
+
+    def remove_listener(self, listener: BackendListener):
+        self._listeners = tuple(other for other in self._listeners if other is not listener)
+
     @abstractmethod
     def __getitem__(self, node_name: Hashable) -> Node:
         """Get a node by node id.
@@ -86,17 +148,39 @@ class DataBackend(ABC):
 
     @abstractmethod
     def remove_edge(self, from_node_name: Hashable, to_node_name: Hashable):
+        """Remove the edge (from_node_name, to_node_name).
+        Implementations that store a symmetric edge once remove it in both directions.
+
+        Raises:
+            KeyError: If the edge does not exist.
+
+        Args:
+            from_node_name: The tail node name.
+            to_node_name: The head node name.
+        """
         pass
 
     @abstractmethod
     def remove_node(self, node_name: Hashable):
-        """Remove node with a specific node_name.
+        """Remove node with a specific node_name together with all of its incoming and outgoing edges.
 
              Args:
                  node_name: Node to remove from the data structure.
         """
         pass
 
+    def predecessors(self, node_name: Hashable) -> Iterable[Hashable]:
+        """Get the names of all nodes that have an edge to node_name, i.e. its neighbours in the reverse graph.
+        Backends should override this with an index, the default scans all edges.
+
+        Args:
+            node_name: Head node of the edges.
+
+        Returns:
+            An iterable of distinct node names.
+        """
+        return list(dict.fromkeys(edge.from_node.name for edge in self.edges() if edge.to_node == node_name))
+
     @abstractmethod
     def node_names(self) -> Iterable[Hashable]:
         """Get all stored node names.
@@ -116,6 +200,69 @@ class DataBackend(ABC):
         """
         pass
 
+    def cost_matrix(self, node_names: Sequence[Hashable]) -> array:
+        """Export the edge costs as a dense matrix, which is what matrix-based algorithms operate on.
+        Backends that already store a matrix should override this to avoid creating edge objects.
+
+        Args:
+            node_names: Node names in the order of the matrix' rows and columns.
+
+        Returns:
+            Flat row-major n×n `array('d')` with inf for missing edges.
+            Parallel edges are reduced to the cheapest one.
+        """
+        index = {name: i for i, name in enumerate(node_names)}
+        n = len(index)
+        matrix = array('d', [math.inf]) * (n * n)
+        for name, u in index.items():
+            for edge in self[name].edges:
+                cell = u * n + index[edge.to_node.name]
+                matrix[cell] = min(matrix[cell], edge.cost)
+        return matrix
+
+    @property
+    def canonical(self) -> bool:
+        """Whether the backend guarantees exactly one object per node and per edge (as long as it exists).
+        Then equality checks in dicts and sets are mostly decided by identity and the objects can cache their hash.
+        Backends that create "virtual" nodes or edges on access are not canonical.
+
+        Returns:
+            True if objects are canonical, False per default.
+        """
+        return False
+
+    def memory_objects(self, node_names: Iterable[Hashable]) -> Iterator[Tuple[str, Any]]:
+        """Objects that store the given nodes and their outgoing edges, used for memory accounting.
+        Each object is labelled with the component it belongs to: "nodes", "edges", "attributes" or "indexes".
+        Its size is determined recursively, but without following references to other nodes and edges,
+        and an object that is reachable from multiple yielded objects is only counted for the first one.
+        Indexes are the exception, only their own size counts since their items are accounted for elsewhere.
+        Edges that are shared by both of their nodes must only be yielded for one of them.
+
+        Backends with "virtual" nodes or edges should override this to yield what they actually store.
+
+        Args:
+            node_names: Nodes to account for.
+
+        Returns:
+            Iterator of (component, object) pairs.
+        """
+        for name in node_names:
+            node = self[name]
+            for edge in node.edges:
+                yield 'attributes', edge.data
+                yield 'edges', edge
+            yield 'nodes', node
+
+    def memory_containers(self) -> Iterator[Tuple[str, Any]]:
+        """Containers that span all nodes, e.g. the node name index, labelled like in `memory_objects`.
+        Only the containers' own size is accounted, their items are covered by `memory_objects`.
+
+        Returns:
+            Iterator of (component, container) pairs, none per default.
+        """
+        return iter(())
+
     @property
     @abstractmethod
     def mst_alg_hint(self) -> str:
@@ -124,7 +271,8 @@ class DataBackend(ABC):
         by themselves and know themselves best.
 
         Returns:
-            Either "kruskal" or "prim"
+            Either "kruskal", "prim", "dense-prim" (for complete graphs, see `DiGraph.perform_dense_prim`)
+            or "boruvka" (see `DiGraph.perform_boruvka`)
         """
         pass
 
@@ -0,0 +1,429 @@
+import math
+from array import array
+from collections.abc import MutableMapping
+from typing import Iterable, Hashable, Any, Dict, Callable, Sequence, Iterator, Tuple
+
+from .api import DataBackend, NodeAlreadyExistsError
+from ..components.edge import Edge
+from ..components.node import Node
+
+# Marks a free node slot (a removed node) so that every hashable including None stays a valid node name:
+_FREE = object()
+
+
+def euclidean(a: Sequence[float], b: Sequence[float]) -> float:
+    """Euclidean distance between two positions of the same dimension."""
+    return math.sqrt(sum((x - y) ** 2 for x, y in zip(a, b)))
+
+
+class _MatrixEdgeData(MutableMapping):
+    """Live dict-like view on the attributes of a MatrixEdge.
+    'cost' and 'capacity' are redirected to the backend's matrices, everything else is stored sparsely.
+    """
+
+    def __init__(self, edge: 'MatrixEdge'):
+        self._edge = edge
+
+    def _extra(self, create=False) -> Dict[str, Any]:
+        backend, key = self._edge._backend, (self._edge._u, self._edge._v)
+        extra = backend._extra.get(key)
+        if extra is None and create:
+            extra = backend._extra[key] = {}
+        return extra if extra is not None else {}
+
+    def __getitem__(self, key):
+        if key == 'cost':
+            return self._edge.cost
+        if key == 'capacity':
+            return self._edge.capacity
+        return self._extra()[key]
+
+    def __setitem__(self, key, value):
+        if key == 'cost':
+            self._edge.cost = value
+        elif key == 'capacity':
+            self._edge.capacity = value
+        else:
+            self._extra(create=True)[key] = value
+            self._edge._changed()
+
+    def __delitem__(self, key):
+        if key in ('cost', 'capacity'):
+            raise KeyError(f"'{key}' is part of the matrix and cannot be deleted!")
+        del self._extra()[key]
+        self._edge._changed()
+
+    def __iter__(self) -> Iterator[str]:
+        yield 'cost'
+        if self._edge._backend._capacities is not None:
+            yield 'capacity'
+        yield from self._extra()
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class MatrixEdge(Edge):
+    """MatrixEdge is a "virtual" edge:
+    It only stores the backend and the slots of both nodes, all attributes live in the backend's matrices.
+    """
+
+    def __init__(self, backend: 'MatrixBackend', u: int, v: int):
+        self._backend = backend
+        self._u = u
+        self._v = v
+
+    @property
+    def from_node(self) -> 'Node':
+        return MatrixNode(self._backend, self._u)
+
+    @property
+    def to_node(self) -> 'Node':
+        return MatrixNode(self._backend, self._v)
+
+    @property
+    def cost(self) -> float:
+        return self._backend._cost(self._u, self._v)
+
+    @cost.setter
+    def cost(self, cost):
+        backend = self._backend
+        if backend._costs is None:
+            raise TypeError("Costs of a metric MatrixBackend are computed from node positions and cannot be set!")
+        backend._costs[self._u * backend._stride + self._v] = cost
+        self._changed()
+
+    @property
+    def capacity(self) -> float:
+        caps = self._backend._capacities
+        return caps[self._u * self._backend._stride + self._v] if caps is not None else 0.0
+
+    @capacity.setter
+    def capacity(self, cap):
+        backend = self._backend
+        if backend._capacities is None:
+            backend._capacities = array('d', [0.0]) * (backend._stride * backend._stride)
+        backend._capacities[self._u * backend._stride + self._v] = cap
+        self._changed()
+
+    def _changed(self):
+        names = self._backend._names
+        self._backend._edge_changed(names[self._u], names[self._v])
+
+    @property
+    def eid(self) -> int:
+        # Szudzik pairing of the ids of both slots, which is dense and does not depend on the matrix' stride:
+        ids = self._backend._slot_ids
+        u, v = ids[self._u], ids[self._v]
+        return v * v + u if u < v else u * u + u + v
+
+    @property
+    def key(self) -> Hashable:
+        # Hashes and compares equal to (from_node, to_node) without constructing the node objects:
+        return self._backend._names[self._u], self._backend._names[self._v]
+
+    def inverse(self) -> 'Edge':
+        return MatrixEdge(self._backend, self._v, self._u)
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return _MatrixEdgeData(self)
+
+
+class MatrixNode(Node):
+    """MatrixNode is a "virtual" node that is created on demand.
+    It refers to a slot in the backend, its edges are determined by scanning the slot's matrix row.
+    """
+
+    def __init__(self, backend: 'MatrixBackend', slot: int):
+        self._backend = backend
+        self._slot = slot
+        self._name = backend._names[slot]
+
+    @property
+    def balance(self) -> float:
+        attributes = self._backend._attributes[self._slot]
+        return attributes.get('balance', 0.0) if attributes else 0.0
+
+    @balance.setter
+    def balance(self, balance):
+        self._backend._node_attributes(self._slot)['balance'] = balance
+        self._backend._modified()
+
+    def __hash__(self):
+        # Views are short-lived, caching the hash would not pay off:
+        return hash(self._name)
+
+    def __getattr__(self, item):
+        try:
+            return self._backend._attributes[self._slot][item]
+        except (KeyError, TypeError):
+            raise AttributeError(f"Node '{self._name}' has no attribute '{item}'")
+
+    @property
+    def neighbours(self) -> Iterable[Node]:
+        backend = self._backend
+        return [MatrixNode(backend, v) for v in backend._row(self._slot)]
+
+    @property
+    def edges(self) -> Iterable[Edge]:
+        backend, u = self._backend, self._slot
+        return [MatrixEdge(backend, u, v) for v in backend._row(u)]
+
+    def edge(self, neighbour_node: Node) -> Edge:
+        backend = self._backend
+        v = backend._index.get(neighbour_node)
+        if v is None or not backend._has_edge(self._slot, v):
+            raise KeyError(f"There is no neighbour '{neighbour_node}' accessible from node '{self}'!")
+        return MatrixEdge(backend, self._slot, v)
+
+    def connect(self, edge: Edge):
+        self._backend.add_edge(self._name, edge.to_node.name, **edge.data)
+
+    def sorted_edges(self) -> Iterable[Edge]:
+        return sorted(self.edges, key=lambda e: e.cost)
+
+
+class MatrixBackend(DataBackend):
+    """This backend stores edge costs in a flat, row-major n×n `array('d')` instead of edge objects.
+    Node and edge objects are only created on demand as lightweight views,
+    which makes dense (fully connected) graphs such as TSP instances fit into memory easily.
+
+    A missing edge is encoded as NaN, adding an existing edge again replaces it.
+    Capacities get their own matrix as soon as the first capacity is set, all other edge attributes are stored sparsely.
+    Slots of removed nodes are reused, so existing node and edge views stay valid as long as their nodes exist.
+
+    If a `metric` is given, no cost matrix is allocated at all: The graph is complete
+    and the cost of (u, v) is computed on demand as `metric(u.pos, v.pos)` from the nodes' `pos` attributes.
+
+    Recommendation: Use it for dense graphs only. Iterating a node's edges takes O(n) regardless of its degree.
+    """
+
+    def __init__(self, metric: Callable[[Sequence[float], Sequence[float]], float] = None):
+        self._names = []
+        self._index = {}
+        self._attributes = []
+        self._free_slots = []
+        # Id per slot for edge ids, a reused slot gets a new one so that ids of removed edges are never reused:
+        self._slot_ids = array('q')
+        self._issued_slot_ids = 0
+        self._stride = 0
+        self._edge_count = 0
+        self._metric = metric
+        self._positions = [] if metric else None
+        self._costs = None if metric else array('d')
+        self._capacities = None
+        self._extra = {}
+
+    @classmethod
+    def from_positions(cls, positions: Dict[Hashable, Sequence[float]],
+                       metric: Callable[[Sequence[float], Sequence[float]], float] = euclidean) -> 'MatrixBackend':
+        """Build a complete graph whose costs are computed on demand from the given positions.
+
+        Args:
+            positions: Mapping of node name to its position, e.g. the city's coordinates.
+            metric: Distance function between two positions, euclidean per default.
+
+        Returns:
+            The initialized backend.
+        """
+        backend = cls(metric)
+        for name, pos in positions.items():
+            backend.add_node(name, pos=pos)
+        return backend
+
+    def _grow(self, min_stride: int):
+        old_stride, stride = self._stride, max(4, self._stride * 2, min_stride)
+
+        def regrid(old: array, fill: float) -> array:
+            new = array('d', [fill]) * (stride * stride)
+            for row in range(old_stride):
+                new[row * stride:row * stride + old_stride] = old[row * old_stride:(row + 1) * old_stride]
+            return new
+
+        if self._costs is not None:
+            self._costs = regrid(self._costs, math.nan)
+        if self._capacities is not None:
+            self._capacities = regrid(self._capacities, 0.0)
+        self._stride = stride
+
+    def _cost(self, u: int, v: int) -> float:
+        if self._costs is None:
+            return self._metric(self._positions[u], self._positions[v])
+        return self._costs[u * self._stride + v]
+
+    def _has_edge(self, u: int, v: int) -> bool:
+        if self._costs is None:
+            return u != v
+        return not math.isnan(self._costs[u * self._stride + v])
+
+    def _row(self, u: int) -> Iterable[int]:
+        """Slots of all nodes that are accessible from slot u."""
+        if self._costs is None:
+            return [v for v in self._index.values() if v != u]
+        start = u * self._stride
+        row = self._costs[start:start + len(self._names)]
+        # NaN is the only value that is not equal to itself:
+        return [v for v, c in enumerate(row) if c == c]
+
+    def _node_attributes(self, slot: int) -> Dict[str, Any]:
+        if self._attributes[slot] is None:
+            self._attributes[slot] = {}
+        return self._attributes[slot]
+
+    def __getitem__(self, node_name: Hashable) -> Node:
+        return MatrixNode(self, self._index[node_name])
+
+    def __contains__(self, node_name: Hashable) -> bool:
+        return node_name in self._index
+
+    def __iter__(self) -> Iterable[Node]:
+        return (MatrixNode(self, slot) for slot in self._index.values())
+
+    def __len__(self):
+        return len(self._index)
+
+    def add_node(self, node_name: Hashable, **attributes):
+        if node_name in self._index:
+            raise NodeAlreadyExistsError(node_name)
+        if self._metric and 'pos' not in attributes:
+            raise ValueError(f"Node '{node_name}' needs a 'pos' attribute since costs are computed from positions!")
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._names[slot] = node_name
+            self._attributes[slot] = attributes or None
+            self._slot_ids[slot] = self._issued_slot_ids
+        else:
+            slot = len(self._names)
+            if slot >= self._stride:
+                self._grow(slot + 1)
+            self._names.append(node_name)
+            self._attributes.append(attributes or None)
+            self._slot_ids.append(self._issued_slot_ids)
+            if self._positions is not None:
+                self._positions.append(None)
+        if self._positions is not None:
+            self._positions[slot] = attributes['pos']
+        self._issued_slot_ids += 1
+        self._index[node_name] = slot
+        self._modified()
+
+    def add_edge(self, from_node_name: Hashable, to_node_name: Hashable, symmetric: bool = False, **attributes):
+        u, v = self._index[from_node_name], self._index[to_node_name]
+        if self._costs is None:
+            raise TypeError("Edges of a metric MatrixBackend are implicit and cannot be added!")
+        extra = {k: val for k, val in attributes.items() if k not in ('cost', 'capacity')} or None
+        for a, b in ((u, v), (v, u)) if symmetric else ((u, v),):
+            # Like NetworkX, adding an existing edge again replaces its attributes (there is one cell per edge):
+            if self._has_edge(a, b):
+                self._clear(a, b)
+            self._costs[a * self._stride + b] = attributes.get('cost') or 0.0
+            self._edge_count += 1
+            if attributes.get('capacity'):
+                MatrixEdge(self, a, b).capacity = attributes['capacity']
+            if extra:
+                # Both directions share the same dict, just like symmetric edges that are stored once:
+                self._extra[(a, b)] = extra
+        self._edge_changed(from_node_name, to_node_name)
+        if symmetric:
+            self._edge_changed(to_node_name, from_node_name)
+
+    def remove_edge(self, from_node_name: Hashable, to_node_name: Hashable):
+        u, v = self._index[from_node_name], self._index[to_node_name]
+        if self._costs is None:
+            raise TypeError("Edges of a metric MatrixBackend are implicit and cannot be removed!")
+        if not self._has_edge(u, v):
+            raise KeyError(f"Edge ({from_node_name}, {to_node_name}) does not exist!")
+        self._clear(u, v)
+        self._edge_changed(from_node_name, to_node_name)
+
+    def _clear(self, u: int, v: int):
+        cell = u * self._stride + v
+        self._costs[cell] = math.nan
+        if self._capacities is not None:
+            self._capacities[cell] = 0.0
+        self._extra.pop((u, v), None)
+        self._edge_count -= 1
+
+    def remove_node(self, node_name: Hashable):
+        slot = self._index.pop(node_name)
+        removed = []
+        if self._costs is not None:
+            for other in range(len(self._names)):
+                if self._has_edge(slot, other):
+                    self._clear(slot, other)
+                    removed.append((node_name, self._names[other]))
+                if other != slot and self._has_edge(other, slot):
+                    self._clear(other, slot)
+                    removed.append((self._names[other], node_name))
+        self._names[slot] = _FREE
+        self._attributes[slot] = None
+        if self._positions is not None:
+            self._positions[slot] = None
+        self._free_slots.append(slot)
+        for from_node_name, to_node_name in removed:
+            self._edge_changed(from_node_name, to_node_name)
+        self._node_removed(node_name)
+
+    def predecessors(self, node_name: Hashable) -> Iterable[Hashable]:
+        # Scans the node's matrix column:
+        v = self._index[node_name]
+        return [name for name, u in self._index.items() if self._has_edge(u, v)]
+
+    def node_names(self) -> Iterable[Hashable]:
+        return self._index.keys()
+
+    def edges(self) -> Iterable[Edge]:
+        return (MatrixEdge(self, u, v) for u in list(self._index.values()) for v in self._row(u))
+
+    def cost_matrix(self, node_names: Sequence[Hashable]) -> array:
+        slots = [self._index[name] for name in node_names]
+        if self._costs is None:
+            positions, metric = self._positions, self._metric
+            return array('d', (metric(positions[u], positions[v]) if u != v else math.inf
+                               for u in slots for v in slots))
+        n, stride, costs = len(slots), self._stride, self._costs
+        matrix = array('d')
+        if slots == list(range(n)):
+            for u in slots:
+                matrix.extend(costs[u * stride:u * stride + n])
+        else:
+            for u in slots:
+                row = costs[u * stride:(u + 1) * stride]
+                matrix.extend(row[v] for v in slots)
+        return array('d', (math.inf if c != c else c for c in matrix))
+
+    def memory_objects(self, node_names: Iterable[Hashable]) -> Iterator[Tuple[str, Any]]:
+        # Nodes and edges are views, a node is its name and its attributes, an edge is a matrix cell:
+        for name in node_names:
+            slot = self._index[name]
+            yield 'nodes', name
+            yield 'attributes', self._attributes[slot]
+            if self._extra:
+                for v in self._row(slot):
+                    yield 'attributes', self._extra.get((slot, v))
+
+    def memory_containers(self) -> Iterator[Tuple[str, Any]]:
+        yield 'nodes', self._names
+        yield 'nodes', self._attributes
+        yield 'indexes', self._index
+        yield 'indexes', self._free_slots
+        yield 'indexes', self._slot_ids
+        yield 'edges', self._costs
+        if self._positions is not None:
+            yield 'attributes', self._positions
+        yield 'attributes', self._capacities
+        yield 'indexes', self._extra
+
+    @property
+    def mst_alg_hint(self) -> str:
+        # The cost matrix is exported without creating edge objects:
+        return 'dense-prim'
+
+    @property
+    def costminflow_alg_hint(self) -> str:
+        return 'successive-shortest-path'
+
+    @property
+    def data(self) -> Any:
+        return self._costs
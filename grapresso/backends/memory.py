@@ -1,6 +1,6 @@
 import itertools
 from enum import Enum, unique
-from typing import Iterable, Any, Hashable, Dict
+from typing import Iterable, Iterator, Any, Hashable, Dict, Tuple
 
 from .api import DataBackend, NodeAlreadyExistsError, EdgeAlreadyExistsError
 from grapresso.components.node import Node, IndexedNode
@@ -8,10 +8,20 @@ from ..components.edge import Edge
 
 
 class InMemoryEdge(Edge):
+    # Backend that stores the edge, it is notified when attributes change (inverse views have none):
+    _backend = None
+    # Whether the edge is stored once for both directions, see `Trait.OPTIMIZE_MEMORY`:
+    _symmetric = False
+    # Positions in the edge lists of both nodes, so that the edge can be removed in O(1).
+    # Only symmetric edges that are stored once are in the edge list of their head:
+    _tail_slot = None
+    _head_slot = None
+
     def __init__(self, from_node: 'Node', to_node: 'Node', cost: float = None, capacity: float = None,
                  **kwargs: Dict[str, Any]):
         self._from_node = from_node
         self._to_node = to_node
+        self._hash = None
         self._data = {}
         if cost:
             self._data['cost'] = cost
@@ -35,6 +45,7 @@ class InMemoryEdge(Edge):
     @cost.setter
     def cost(self, cost):
         self._data['cost'] = cost
+        self._changed()
 
     @property
     def capacity(self) -> float:
@@ -43,9 +54,38 @@ class InMemoryEdge(Edge):
     @capacity.setter
     def capacity(self, cap):
         self._data['capacity'] = cap
+        self._changed()
+
+    def _changed(self):
+        if self._backend is not None:
+            self._backend._edge_changed(self._from_node.name, self._to_node.name)
+            if self._symmetric:
+                self._backend._edge_changed(self._to_node.name, self._from_node.name)
+
+    def _slot(self, node: Node) -> int:
+        return self._tail_slot if node is self._from_node else self._head_slot
+
+    def _set_slot(self, node: Node, slot: int):
+        if node is self._from_node:
+            self._tail_slot = slot
+        else:
+            self._head_slot = slot
+
+    @property
+    def key(self) -> Hashable:
+        return self._from_node, self._to_node
+
+    def __hash__(self):
+        # Both nodes are fixed, so the hash is computed once on first use:
+        if self._hash is None:
+            self._hash = hash((self._from_node, self._to_node))
+        return self._hash
 
     def inverse(self) -> 'Edge':
-        return InMemoryEdge(self._to_node, self._from_node, **self._data)
+        inverse = InMemoryEdge(self._to_node, self._from_node, **self._data)
+        if self.eid is not None:
+            inverse.eid = self.eid ^ 1
+        return inverse
 
     @property
     def data(self) -> Dict[str, Any]:
@@ -132,7 +172,10 @@ class InMemoryBackend(DataBackend):
 
     def __init__(self, dna: Trait = Trait.OPTIMIZE_PERFORMANCE):
         self._id_to_node = {}
+        # Reverse adjacency: node name -> {eid: edge} of the stored edges that lead to the node:
+        self._predecessors = {}
         self._dna = dna
+        self._created_edges = 0
 
     def __iter__(self):
         return self._id_to_node.values().__iter__()
@@ -153,9 +196,8 @@ class InMemoryBackend(DataBackend):
             self._id_to_node[node_name] = IndexedNode(node_name, **attributes)
         else:
             self._id_to_node[node_name] = Node(node_name, **attributes)
-
-    # def remove_node(self, node_id):
-    #     self._id_to_node.pop(node_id)
+        self._predecessors[node_name] = {}
+        self._modified()
 
     def node_names(self):
         return self._id_to_node.keys()
@@ -164,26 +206,120 @@ class InMemoryBackend(DataBackend):
         if to_node_name in self._id_to_node[from_node_name].edges:
             raise EdgeAlreadyExistsError(from_node_name, to_node_name)
         edge = InMemoryEdge(self[from_node_name], self[to_node_name], **attributes)
-        self._id_to_node[from_node_name].connect(edge)
+        edge._backend = self
+        # Even ids for stored edges, the odd id eid ^ 1 is reserved for the edge's inverse:
+        edge.eid = 2 * self._created_edges
+        self._created_edges += 1
+        self._connect(edge.from_node, edge)
+        self._predecessors[to_node_name][edge.eid] = edge
+        if symmetric and self._dna != Trait.OPTIMIZE_PERFORMANCE:
+            edge._symmetric = True
+            if edge.to_node is not edge.from_node:
+                self._connect(edge.to_node, edge)
+                self._predecessors[from_node_name][edge.eid] = edge
+        self._edge_changed(from_node_name, to_node_name)
         if symmetric:
             if self._dna == Trait.OPTIMIZE_PERFORMANCE:
                 self.add_edge(to_node_name, from_node_name, **attributes)
             else:
-                self._id_to_node[to_node_name].connect(edge)
+                self._edge_changed(to_node_name, from_node_name)
+
+    @staticmethod
+    def _connect(node: Node, edge: InMemoryEdge):
+        edge._set_slot(node, len(node._edges))
+        node.connect(edge)
+
+    @staticmethod
+    def _disconnect(node: Node, edge: InMemoryEdge):
+        edges, slot = node._edges, edge._slot(node)
+        if slot is None or slot >= len(edges) or edges[slot] is not edge:
+            # The edge list has been reordered in the meantime (see `Node.sorted_edges`), so renumber it:
+            for i, other in enumerate(edges):
+                other._set_slot(node, i)
+            slot = edge._slot(node)
+        moved = node.disconnect(edge, slot)
+        if moved is not None:
+            moved._set_slot(node, slot)
+
+    def _unlink(self, edge: InMemoryEdge) -> Iterable[Tuple[Hashable, Hashable]]:
+        """Remove a stored edge from all indexes.
+
+        Returns:
+            The (from_node_name, to_node_name) pairs that have been removed.
+        """
+        tail, head = edge.from_node, edge.to_node
+        self._disconnect(tail, edge)
+        del self._predecessors[head.name][edge.eid]
+        if not edge._symmetric:
+            return (tail.name, head.name),
+        if head is not tail:
+            self._disconnect(head, edge)
+            del self._predecessors[tail.name][edge.eid]
+        return (tail.name, head.name), (head.name, tail.name)
+
+    def remove_edge(self, from_node_name: Hashable, to_node_name: Hashable):
+        """Remove the edge in O(degree of from_node_name) (O(1) for `Trait.OPTIMIZE_PERFORMANCE`).
+        A symmetric edge that is stored once (see `Trait.OPTIMIZE_MEMORY`) is removed in both directions.
+
+        Raises:
+            KeyError: If there is no such edge.
+        """
+        from_node, to_node = self._id_to_node[from_node_name], self._id_to_node[to_node_name]
+        if self._dna is Trait.OPTIMIZE_PERFORMANCE:
+            edge = from_node._indexed_edges.get(to_node)
+        else:
+            edge = next((e for e in from_node._edges if e.opposite(from_node) is to_node), None)
+        if edge is None:
+            raise KeyError(f"Edge ({from_node_name}, {to_node_name}) does not exist!")
+        for changed in self._unlink(edge):
+            self._edge_changed(*changed)
+
+    def remove_node(self, node_name: Hashable):
+        """Remove the node and all of its edges in O(degree), i.e. incoming and outgoing edges."""
+        node = self._id_to_node[node_name]
+        edges = {id(edge): edge for edge in node._edges}
+        edges.update((id(edge), edge) for edge in self._predecessors[node_name].values())
+        changed = [pair for edge in edges.values() for pair in self._unlink(edge)]
+        del self._id_to_node[node_name]
+        del self._predecessors[node_name]
+        for from_node_name, to_node_name in changed:
+            self._edge_changed(from_node_name, to_node_name)
+        self._node_removed(node_name)
+
+    def predecessors(self, node_name: Hashable) -> Iterable[Hashable]:
+        node = self._id_to_node[node_name]
+        return list(dict.fromkeys(edge.opposite(node).name for edge in self._predecessors[node_name].values()))
 
     def edges(self) -> Iterable:
         return itertools.chain(*[n.edges for n in self])
 
+    @property
+    def canonical(self) -> bool:
+        # Symmetric edges that are stored once are turned around by creating inverse edges on access:
+        return self._dna is Trait.OPTIMIZE_PERFORMANCE
+
+    def memory_objects(self, node_names: Iterable[Hashable]) -> Iterator[Tuple[str, Any]]:
+        for name in node_names:
+            node = self._id_to_node[name]
+            yield 'indexes', node._edges
+            if self._dna is Trait.OPTIMIZE_PERFORMANCE:
+                yield 'indexes', node._indexed_edges
+            yield 'indexes', self._predecessors[name]
+            for edge in node._edges:
+                # Symmetric edges that are stored once are connected to both nodes, their tail owns them:
+                if edge.from_node is node:
+                    yield 'attributes', edge.data
+                    yield 'edges', edge
+            yield 'nodes', node
+
+    def memory_containers(self) -> Iterator[Tuple[str, Any]]:
+        yield 'indexes', self._id_to_node
+        yield 'indexes', self._predecessors
+
     @property
     def mst_alg_hint(self) -> str:
         return 'prim'
 
-    def remove_edge(self, from_node_name: Hashable, to_node_name: Hashable):
-        raise NotImplementedError(f"Remove is not yet implemented for {__name__}")
-
-    def remove_node(self, node_name: Hashable):
-        raise NotImplementedError(f"Remove is not yet implemented for {__name__}")
-
     @property
     def costminflow_alg_hint(self) -> str:
         return 'successive-shortest-path'
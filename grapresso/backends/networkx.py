@@ -1,4 +1,4 @@
-from typing import Iterable, Hashable, Any, Dict
+from typing import Iterable, Iterator, Hashable, Any, Dict, Tuple
 
 import networkx as nx
 
@@ -26,6 +26,7 @@ class NxEdge(Edge):
     @cost.setter
     def cost(self, cost):
         self._edge_data['cost'] = cost
+        self._from_node._backend._edges_changed(self._from_node.name, self._to_node.name)
 
     @property
     def capacity(self) -> float:
@@ -34,6 +35,7 @@ class NxEdge(Edge):
     @capacity.setter
     def capacity(self, cap):
         self._edge_data['capacity'] = cap
+        self._from_node._backend._edges_changed(self._from_node.name, self._to_node.name)
 
     @property
     def to_node(self) -> 'Node':
@@ -57,20 +59,23 @@ class NxEdge(Edge):
 
 
 class NxNode(Node):
-    def __init__(self, nx_graph: nx.DiGraph, name, balance=None, **kwargs):
-        self._nxg = nx_graph
+    def __init__(self, backend: 'NetworkXBackend', name):
+        self._backend = backend
+        self._nxg = backend.nx_graph
         self._name = name
+        self._hash = hash(name)
 
     @property
     def balance(self) -> float:
-        return self._nxg.nodes[self]['balance']
+        return self._nxg.nodes[self].get('balance', 0.0)
 
     @balance.setter
     def balance(self, balance):
         self._nxg.nodes[self]['balance'] = balance
+        self._backend._modified()
 
     def _build(self, name):
-        return NxNode(self._nxg, name, **self._nxg.nodes[name])
+        return NxNode(self._backend, name)
 
     @property
     def neighbours(self) -> Iterable[Node]:
@@ -119,8 +124,16 @@ class NetworkXBackend(DataBackend):
     def nx_graph(self) -> nx.DiGraph:
         return self._nx
 
+    def _edges_changed(self, from_node_name: Hashable, to_node_name: Hashable):
+        # Undirected NetworkX graphs share an edge (and its data) between both directions:
+        self._edge_changed(from_node_name, to_node_name)
+        if not self._nx.is_directed():
+            self._edge_changed(to_node_name, from_node_name)
+
     def __getitem__(self, node_name: Hashable) -> Node:
-        return NxNode(self._nx, node_name, self._nx.nodes[node_name])
+        if node_name not in self._nx:
+            raise KeyError(node_name)
+        return NxNode(self, node_name)
 
     def __contains__(self, node_name: Hashable) -> bool:
         return node_name in self._nx.nodes.keys()
@@ -133,17 +146,38 @@ class NetworkXBackend(DataBackend):
 
     def add_node(self, node_name: Hashable, **attributes) -> None:
         self._nx.add_node(node_name, **attributes)
+        self._modified()
 
     def add_edge(self, from_node_name: Hashable, to_node_name: Hashable, symmetric: bool = False, **attributes) -> None:
         self._nx.add_edge(from_node_name, to_node_name, **attributes)
+        self._edges_changed(from_node_name, to_node_name)
         if symmetric:
             self._nx.add_edge(to_node_name, from_node_name, **attributes)
+            self._edges_changed(to_node_name, from_node_name)
 
     def remove_edge(self, from_node_name: Hashable, to_node_name: Hashable):
-        self._nx.remove_edge(from_node_name, to_node_name)
+        try:
+            self._nx.remove_edge(from_node_name, to_node_name)
+        except nx.NetworkXError:
+            raise KeyError(f"Edge ({from_node_name}, {to_node_name}) does not exist!")
+        self._edges_changed(from_node_name, to_node_name)
 
     def remove_node(self, node_name: Hashable):
+        if node_name not in self._nx:
+            raise KeyError(node_name)
+        if self._nx.is_directed():
+            incident = list(self._nx.in_edges(node_name)) + list(self._nx.out_edges(node_name))
+        else:
+            incident = [(node_name, neighbour) for neighbour in self._nx[node_name]]
         self._nx.remove_node(node_name)
+        for from_node_name, to_node_name in incident:
+            self._edges_changed(from_node_name, to_node_name)
+        self._node_removed(node_name)
+
+    def predecessors(self, node_name: Hashable) -> Iterable[Hashable]:
+        if self._nx.is_directed():
+            return list(self._nx.predecessors(node_name))
+        return list(self._nx.neighbors(node_name))
 
     def node_names(self) -> Iterable[Hashable]:
         return {k for k in self._nx.nodes.keys()}
@@ -152,6 +186,26 @@ class NetworkXBackend(DataBackend):
         edges = self._nx.edges.data(default={})
         return [NxEdge(self[e[0]], self[e[1]], e[2]) for e in edges]
 
+    def memory_objects(self, node_names: Iterable[Hashable]) -> Iterator[Tuple[str, Any]]:
+        # Nodes and edges are views, NetworkX stores dicts only (predecessors of directed graphs in a second index):
+        directed = self._nx.is_directed()
+        for name in node_names:
+            yield 'nodes', name
+            yield 'attributes', self._nx._node[name]
+            for neighbour, data in self._nx._adj[name].items():
+                # Undirected graphs share the data dict of an edge between both nodes, one of them owns it:
+                if directed or hash(name) <= hash(neighbour):
+                    yield 'attributes', data
+            yield 'indexes', self._nx._adj[name]
+            if directed:
+                yield 'indexes', self._nx._pred[name]
+
+    def memory_containers(self) -> Iterator[Tuple[str, Any]]:
+        yield 'indexes', self._nx._node
+        yield 'indexes', self._nx._adj
+        if self._nx.is_directed():
+            yield 'indexes', self._nx._pred
+
     @property
     def mst_alg_hint(self) -> str:
         return 'prim'
@@ -1,10 +1,14 @@
-from typing import NamedTuple, Dict, Optional
+import math
+from array import array
+from typing import NamedTuple, Dict, Optional, Sequence, Hashable, Tuple, List
 
-from .path import Cycle
+from .path import Cycle, Path
+from ..datastruct.compact import CompactGraph, csr_dijkstra
 from grapresso.components.node import Node
 
 DistanceEntry = NamedTuple('DistanceEntry', [('parent', Optional[Node]), ('dist', float)])
 DistanceTable = Dict[Node, DistanceEntry]
+TraversalStep = NamedTuple('TraversalStep', [('node', Node), ('depth', int), ('parent', Optional[Node])])
 
 
 class BellmanFordResult:
@@ -22,3 +26,167 @@ class BellmanFordResult:
 
 
 MstResult = NamedTuple('MstResult', [('costs', float), ('tree', 'DiGraph')])
+
+
+class SccResult:
+    """Strongly connected components of a directed graph.
+
+    labels[i] is the component of the i-th node of `node_names`. Components are numbered 0..count-1
+    in topological order, i.e. there is no edge from a component to one with a smaller label.
+    condensation is the DAG with one node per component label and the cheapest edge between two components.
+    """
+
+    def __init__(self, node_names: Sequence[Hashable], labels: Sequence[int], count: int,
+                 condensation: Optional['DiGraph']):
+        self.node_names = node_names
+        self.index = {name: i for i, name in enumerate(node_names)}
+        self.labels = labels
+        self.count = count
+        self.condensation = condensation
+
+    def label(self, node_name: Hashable) -> int:
+        return self.labels[self.index[node_name]]
+
+    def components(self) -> Sequence[Sequence[Hashable]]:
+        """Node names per component, in topological order."""
+        components = [[] for _ in range(self.count)]
+        for name, label in zip(self.node_names, self.labels):
+            components[label].append(name)
+        return components
+
+
+class AllPairsResult:
+    """Shortest paths from many (per default all) source nodes, stored as flat row-major matrices instead of dicts.
+
+    dist[i * n + j] is the distance from the i-th source to the j-th node of `node_names` (inf if unreachable),
+    pred[i * n + j] is the index of the j-th node's parent on that path (-1 if there is none).
+    Both are `array`s or, if NumPy did the work, flat `numpy.ndarray`s. pred is None if it has not been computed.
+    """
+
+    def __init__(self, graph: 'DiGraph', node_names: Sequence[Hashable], dist: Sequence[float],
+                 pred: Optional[Sequence[int]], source_names: Sequence[Hashable] = None):
+        self._graph = graph
+        self.node_names = node_names
+        self.source_names = node_names if source_names is None else source_names
+        self.index = {name: i for i, name in enumerate(node_names)}
+        self.source_index = self.index if source_names is None else {n: i for i, n in enumerate(source_names)}
+        self.dist = dist
+        self.pred = pred
+
+    def __len__(self):
+        return len(self.node_names)
+
+    def _source_row(self, source_node_name: Hashable) -> Tuple[Sequence[float], Optional[Sequence[int]], int]:
+        """Distance and predecessor sequences holding the source's row and the index where the row starts."""
+        return self.dist, self.pred, self.source_index[source_node_name] * len(self)
+
+    def distance(self, source_node_name: Hashable, target_node_name: Hashable) -> float:
+        dist, _, row = self._source_row(source_node_name)
+        return float(dist[row + self.index[target_node_name]])
+
+    def path(self, source_node_name: Hashable, target_node_name: Hashable) -> Optional[Path]:
+        dist, pred, row = self._source_row(source_node_name)
+        if pred is None:
+            raise ValueError("Predecessors have not been computed, paths cannot be reconstructed!")
+        if dist[row + self.index[target_node_name]] == math.inf:
+            return None
+        return Path.from_tree(lambda v: self._graph[self.node_names[pred[row + self.index[v.name]]]],
+                              self._graph[source_node_name], self._graph[target_node_name])
+
+    def distance_table(self, source_node_name: Hashable) -> DistanceTable:
+        """Convert a row to the DistanceTable format that the single-source algorithms return."""
+        dist, pred, row = self._source_row(source_node_name)
+        nodes = [self._graph[name] for name in self.node_names]
+
+        def parent(v):
+            return nodes[pred[row + v]] if pred is not None and pred[row + v] >= 0 else None
+
+        return {nodes[v]: DistanceEntry(parent(v), float(dist[row + v]))
+                for v in range(len(self)) if dist[row + v] != math.inf}
+
+
+class MultiSourceBfsResult(AllPairsResult):
+    """Reachability and hop distances from a batch of sources, computed by bit-parallel BFS.
+
+    reach[b][j] is the bitmask of the sources in the b-th batch that reach the j-th node of `node_names`,
+    where bit i stands for the source b * batch_size + i. dist holds the hop distances like in AllPairsResult,
+    or is None if they have not been computed. Predecessors are never computed.
+    """
+
+    def __init__(self, graph: 'DiGraph', node_names: Sequence[Hashable], dist: Optional[Sequence[float]],
+                 source_names: Sequence[Hashable], reach: List[array], batch_size: int):
+        super().__init__(graph, node_names, dist, None, source_names)
+        self.reach = reach
+        self.batch_size = batch_size
+
+    def _source_row(self, source_node_name: Hashable) -> Tuple[Sequence[float], Optional[Sequence[int]], int]:
+        if self.dist is None:
+            raise ValueError("Hop distances have not been computed, only reachability is available!")
+        return super()._source_row(source_node_name)
+
+    def reaches(self, source_node_name: Hashable, target_node_name: Hashable) -> bool:
+        batch, bit = divmod(self.source_index[source_node_name], self.batch_size)
+        return bool(self.reach[batch][self.index[target_node_name]] >> bit & 1)
+
+    def reached(self, source_node_name: Hashable) -> List[Hashable]:
+        """Names of all nodes that the source reaches, including itself."""
+        batch, bit = divmod(self.source_index[source_node_name], self.batch_size)
+        return [name for name, mask in zip(self.node_names, self.reach[batch]) if mask >> bit & 1]
+
+    def sources_reaching(self, target_node_name: Hashable) -> List[Hashable]:
+        """Names of all sources that reach the target."""
+        j, sources = self.index[target_node_name], []
+        for batch, masks in enumerate(self.reach):
+            mask = masks[j]
+            while mask:
+                bit = mask & -mask
+                sources.append(self.source_names[batch * self.batch_size + bit.bit_length() - 1])
+                mask ^= bit
+        return sources
+
+
+class JohnsonResult(AllPairsResult):
+    """All-pairs result of Johnson's algorithm whose rows are computed lazily:
+    The first access to a source runs one Dijkstra on the reweighted (non-negative) costs and caches the row.
+    Use `to_matrix` to compute all rows at once, optionally in parallel.
+
+    dist and pred are None, rows are only accessible via the methods.
+    """
+
+    def __init__(self, graph: 'DiGraph', reweighted: CompactGraph, potentials: Sequence[float]):
+        super().__init__(graph, reweighted.names, None, None)
+        self._reweighted = reweighted
+        self._potentials = potentials
+        self._rows = {}
+
+    def _source_row(self, source_node_name: Hashable) -> Tuple[Sequence[float], Optional[Sequence[int]], int]:
+        s = self.source_index[source_node_name]
+        if s not in self._rows:
+            n, csr = len(self), self._reweighted
+            dist, pred = array('d', [math.inf]) * n, array('q', [-1]) * n
+            csr_dijkstra(csr.offsets, csr.targets, csr.costs, s, dist, pred)
+            self._unweight(s, dist, 0)
+            self._rows[s] = dist, pred
+        return (*self._rows[s], 0)
+
+    def _unweight(self, s: int, dist, base: int):
+        h = self._potentials
+        for v in range(len(self)):
+            if dist[base + v] != math.inf:
+                dist[base + v] += h[v] - h[s]
+
+    def to_matrix(self, processes: int = 1) -> AllPairsResult:
+        """Compute the rows of all sources into flat matrices.
+
+        Args:
+            processes: Number of worker processes for the Dijkstra runs, None for the number of CPUs.
+
+        Returns:
+            Distance and predecessor matrices.
+        """
+        from ..tools.parallel import MultiSourceExecutor
+        with MultiSourceExecutor(self._graph, processes, self._reweighted) as executor:
+            result = executor.run(self.node_names)
+        for s in range(len(self)):
+            self._unweight(s, result.dist, s * len(self))
+        return result
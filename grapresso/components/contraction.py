@@ -0,0 +1,244 @@
+import math
+import pickle
+from array import array
+from heapq import heappush, heappop, heapify
+from typing import Hashable, List, Optional, Dict, Tuple
+
+from .path import Path
+from ..datastruct.compact import CompactGraph
+
+# Nodes a witness search settles at most when only estimating the number of shortcuts for the contraction order:
+_ESTIMATE_WITNESS_LIMIT = 50
+
+
+class ContractionHierarchy:
+    """Contraction hierarchies (Geisberger et al.) for fast point-to-point shortest path queries on static graphs.
+
+    Preprocessing contracts the nodes one by one, cheapest first by edge difference (shortcuts added minus edges
+    removed), plus the number of contracted neighbours and the node's depth in the hierarchy so far, both of which
+    spread the contraction evenly over the graph. Contracting v adds a shortcut
+    (u, w) for each pair of neighbours whose only shortest path runs through v, which is checked by a local Dijkstra
+    (witness search). A query then runs a bidirectional Dijkstra that only follows edges towards nodes contracted later,
+    so both searches settle a few hundred nodes instead of a large part of the graph.
+
+    The hierarchy is a snapshot of the graph's costs, which must be non-negative. It can be stored with `save`
+    and restored with `load`, paths are unpacked into the original edges of the graph it is attached to.
+    """
+
+    def __init__(self, graph: 'DiGraph', witness_limit: int = 500):
+        """
+        Args:
+            graph: Graph to preprocess.
+            witness_limit: Number of nodes a witness search settles at most. Lower limits speed up the
+                preprocessing but may add superfluous shortcuts, the query results stay exact.
+
+        Raises:
+            ValueError: If there are edges with negative costs.
+        """
+        self._graph = graph
+        csr = CompactGraph.from_backend(graph.backend)
+        if any(c < 0 for c in csr.costs):
+            raise ValueError("Contraction hierarchies do not support negative costs!")
+        self._names = csr.names
+        self._index = csr.index
+        self._witness_limit = witness_limit
+        n = len(csr)
+        # Remaining graph during the contraction, the cheapest edge per node pair only:
+        self._out: List[Dict[int, float]] = [{} for _ in range(n)]
+        self._in: List[Dict[int, float]] = [{} for _ in range(n)]
+        for u in range(n):
+            for e in range(csr.offsets[u], csr.offsets[u + 1]):
+                w, cost = csr.targets[e], csr.costs[e]
+                if w != u and cost < self._out[u].get(w, math.inf):
+                    self._out[u][w] = self._in[w][u] = cost
+        # Contracted node of each shortcut, which unpacks into (u, middle) and (middle, w):
+        self._middle: Dict[Tuple[int, int], int] = {}
+        self._contract_all(n)
+
+    def _contract_all(self, n: int):
+        deleted_neighbours, levels = array('q', [0]) * n, array('q', [0]) * n
+        upward, downward = [None] * n, [None] * n
+
+        def priority(v: int) -> int:
+            return 2 * (self._contract(v, False) - len(self._in[v]) - len(self._out[v])) + deleted_neighbours[v] \
+                + levels[v]
+
+        queue = [(priority(v), v) for v in range(n)]
+        heapify(queue)
+        while queue:
+            _, v = heappop(queue)
+            # Priorities change while neighbours are contracted, so they are updated lazily:
+            updated = priority(v)
+            if queue and updated > queue[0][0]:
+                heappush(queue, (updated, v))
+                continue
+            self._contract(v, True)
+            # All remaining neighbours are contracted later, i.e. these edges lead upwards:
+            upward[v], downward[v] = self._out[v], self._in[v]
+            for w in upward[v]:
+                del self._in[w][v]
+                deleted_neighbours[w] += 1
+                levels[w] = max(levels[w], levels[v] + 1)
+            for u in downward[v]:
+                del self._out[u][v]
+                deleted_neighbours[u] += 1
+                levels[u] = max(levels[u], levels[v] + 1)
+        del self._out, self._in
+        # Forward searches follow upward edges, backward searches follow downward edges in reverse:
+        self._up = self._flatten(upward)
+        self._down = self._flatten(downward)
+
+    @staticmethod
+    def _flatten(adjacency: List[Dict[int, float]]) -> Tuple[array, array, array]:
+        offsets, targets, costs = array('q', [0]), array('q'), array('d')
+        for neighbours in adjacency:
+            targets.extend(neighbours.keys())
+            costs.extend(neighbours.values())
+            offsets.append(len(targets))
+        return offsets, targets, costs
+
+    def _contract(self, v: int, add_shortcuts: bool) -> int:
+        """Number of shortcuts that contracting v needs, they are added if add_shortcuts is set.
+        Otherwise, the witness searches are cut short since only the priority is estimated."""
+        outgoing = list(self._out[v].items())
+        if not outgoing:
+            return 0
+        max_out, shortcuts = max(cost for _, cost in outgoing), 0
+        for u, in_cost in list(self._in[v].items()):
+            dist = self._witness_search(u, v, in_cost + max_out, {w for w, _ in outgoing if w != u},
+                                        self._witness_limit if add_shortcuts else _ESTIMATE_WITNESS_LIMIT)
+            for w, out_cost in outgoing:
+                cost = in_cost + out_cost
+                if w != u and dist.get(w, math.inf) > cost:
+                    shortcuts += 1
+                    if add_shortcuts and cost < self._out[u].get(w, math.inf):
+                        self._out[u][w] = self._in[w][u] = cost
+                        self._middle[(u, w)] = v
+        return shortcuts
+
+    def _witness_search(self, source: int, skipped: int, limit: float, targets: set,
+                        max_settled: int) -> Dict[int, float]:
+        """Dijkstra from source in the remaining graph without the skipped node until all targets are settled,
+        up to the limit of costs or nodes."""
+        out, dist, heap, settled = self._out, {source: 0.0}, [(0.0, source)], 0
+        while heap and targets and settled < max_settled:
+            d, u = heappop(heap)
+            if d > limit:
+                break
+            if d > dist[u]:
+                continue
+            settled += 1
+            targets.discard(u)
+            for w, cost in out[u].items():
+                if w != skipped and d + cost < dist.get(w, math.inf):
+                    dist[w] = d + cost
+                    heappush(heap, (d + cost, w))
+        return dist
+
+    @property
+    def shortcut_count(self) -> int:
+        return len(self._middle)
+
+    def __len__(self):
+        return len(self._names)
+
+    def _query(self, source: int, target: int) -> Tuple[float, int, Dict[int, int], Dict[int, int]]:
+        """Bidirectional upward Dijkstra, returns the distance, the meeting node and the parents of both searches."""
+        searches = [({source: 0.0}, {source: -1}, [(0.0, source)], self._up),
+                    ({target: 0.0}, {target: -1}, [(0.0, target)], self._down)]
+        best, meeting = math.inf, -1
+        while searches[0][2] or searches[1][2]:
+            forward, backward = searches[0][2], searches[1][2]
+            side = 0 if forward and (not backward or forward[0][0] <= backward[0][0]) else 1
+            dist, parents, heap, (offsets, targets, costs) = searches[side]
+            d, u = heappop(heap)
+            if d >= best:
+                # Nodes settled from now on cannot improve the best path anymore:
+                heap.clear()
+                continue
+            if d > dist[u]:
+                continue
+            other_dist = searches[1 - side][0]
+            if u in other_dist and d + other_dist[u] < best:
+                best, meeting = d + other_dist[u], u
+            for e in range(offsets[u], offsets[u + 1]):
+                w, new_dist = targets[e], d + costs[e]
+                if new_dist < dist.get(w, math.inf):
+                    dist[w] = new_dist
+                    parents[w] = u
+                    heappush(heap, (new_dist, w))
+        return best, meeting, searches[0][1], searches[1][1]
+
+    def distance(self, source_node_name: Hashable, target_node_name: Hashable) -> float:
+        """Costs of the cheapest path, inf if the target is not reachable."""
+        return self._query(self._index[source_node_name], self._index[target_node_name])[0]
+
+    def node_path(self, source_node_name: Hashable, target_node_name: Hashable) -> Optional[List[Hashable]]:
+        """Names of the nodes on the cheapest path with all shortcuts unpacked, None if the target is not reachable."""
+        best, meeting, forward, backward = self._query(self._index[source_node_name], self._index[target_node_name])
+        if best == math.inf:
+            return None
+        # Path in the hierarchy: source -> ... -> meeting -> ... -> target
+        hierarchy_path = []
+        node = meeting
+        while node >= 0:
+            hierarchy_path.append(node)
+            node = forward[node]
+        hierarchy_path.reverse()
+        node = backward[meeting]
+        while node >= 0:
+            hierarchy_path.append(node)
+            node = backward[node]
+
+        nodes = hierarchy_path[:1]
+        for u, w in zip(hierarchy_path, hierarchy_path[1:]):
+            stack = [(u, w)]
+            while stack:
+                u, w = stack.pop()
+                middle = self._middle.get((u, w))
+                if middle is None:
+                    nodes.append(w)
+                else:
+                    stack.append((middle, w))
+                    stack.append((u, middle))
+        return [self._names[v] for v in nodes]
+
+    def path(self, source_node_name: Hashable, target_node_name: Hashable) -> Optional[Path]:
+        """Cheapest path over the original edges of the attached graph, None if the target is not reachable.
+
+        Raises:
+            ValueError: If no graph is attached, see `load`.
+        """
+        if self._graph is None:
+            raise ValueError("Paths need the graph, pass it to load!")
+        names = self.node_path(source_node_name, target_node_name)
+        if names is None:
+            return None
+        nodes = [self._graph[name] for name in names]
+        return Path(nodes[0], nodes[-1]).run(u.edge(w) for u, w in zip(nodes, nodes[1:]))
+
+    def __getstate__(self):
+        # The graph is not part of the index, it is attached again by `load`:
+        state = self.__dict__.copy()
+        state['_graph'] = None
+        return state
+
+    def save(self, file_path: str):
+        """Store the hierarchy (without the graph) in a file."""
+        with open(file_path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(file_path: str, graph: 'DiGraph' = None) -> 'ContractionHierarchy':
+        """Restore a hierarchy stored by `save`.
+
+        Args:
+            file_path: File to read, it must come from a trusted source since it is unpickled.
+            graph: Graph the hierarchy has been built from, only needed to unpack paths into its edges.
+        """
+        with open(file_path, 'rb') as f:
+            hierarchy = pickle.load(f)
+        if not isinstance(hierarchy, ContractionHierarchy):
+            raise ValueError(f"'{file_path}' does not contain a contraction hierarchy!")
+        hierarchy._graph = graph
+        return hierarchy
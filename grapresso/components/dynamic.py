@@ -0,0 +1,199 @@
+import itertools
+import math
+from heapq import heappush, heappop
+from typing import Dict, Hashable, Optional, List, Tuple
+
+from .api import DistanceEntry, DistanceTable
+from .path import Path
+from ..backends.api import BackendListener
+
+
+class DynamicShortestPaths(BackendListener):
+    """Shortest paths from a fixed source that are kept up to date while the graph is modified,
+    in the style of Ramalingam and Reps:
+    Only the part of the shortest path tree that is affected by a change is updated.
+
+    - A new or cheaper edge (u, v) is propagated from v by Dijkstra, which stops where distances do not decrease.
+    - A removed or more expensive tree edge (u, v) detaches the subtree of v. Its nodes are re-attached via their
+      cheapest edges from the rest of the tree, then Dijkstra runs within the subtree only.
+    - All other changes (e.g. a non-tree edge getting more expensive) take O(1).
+
+    Costs must be non-negative. A modification that introduces negative costs is not rejected (the backend has
+    applied it already and other listeners still need to be notified), instead the structure stops following the graph
+    and all further queries raise ValueError.
+    The structure stays registered at the graph's backend until `close` is called,
+    which happens automatically when used as a context manager:
+
+        with graph.dynamic_dijkstra('a') as paths:
+            graph.edge('b', 'c').cost = 1
+            print(paths.distance('c'))
+    """
+
+    def __init__(self, graph: 'DiGraph', source_node_name: Hashable):
+        """
+        Args:
+            graph: Graph to follow, its backend notifies the structure about modifications.
+            source_node_name: Source of all paths.
+
+        Raises:
+            ValueError: If a reachable edge has negative costs.
+        """
+        self._graph = graph
+        self._backend = graph.backend
+        self.source_node_name = source_node_name
+        # Shortest path tree by node names, which stay valid regardless of whether the backend's nodes are views:
+        self._dist: Dict[Hashable, float] = {source_node_name: 0.0}
+        self._parent: Dict[Hashable, Optional[Hashable]] = {source_node_name: None}
+        self._children: Dict[Hashable, set] = {}
+        # Tails of the edges into a node, to re-attach it. May contain tails of edges that have been removed since:
+        self._tails: Dict[Hashable, set] = {}
+        self._order = itertools.count()
+        # Why the distances are not valid anymore, see `_invalidate`:
+        self._error: Optional[str] = None
+        for node in self._backend:
+            for edge in node.edges:
+                self._tails.setdefault(edge.to_node.name, set()).add(node.name)
+        self._propagate([(0.0, next(self._order), source_node_name)])
+        self._backend.add_listener(self)
+
+    def close(self):
+        """Stop following the graph's modifications, the current distances stay accessible."""
+        self._backend.remove_listener(self)
+
+    def __enter__(self) -> 'DynamicShortestPaths':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def is_valid(self) -> bool:
+        """Whether the distances are still correct, i.e. no negative costs have been introduced."""
+        return self._error is None
+
+    def _valid_state(self):
+        if self._error is not None:
+            raise ValueError(self._error)
+
+    def distance(self, node_name: Hashable) -> float:
+        """Distance from the source, inf if the node is not reachable.
+
+        Raises:
+            ValueError: If negative costs have been introduced, the same holds for all other queries.
+        """
+        self._valid_state()
+        return self._dist.get(node_name, math.inf)
+
+    def parent(self, node_name: Hashable) -> Optional[Hashable]:
+        """Name of the node's parent in the shortest path tree, None for the source and unreachable nodes."""
+        self._valid_state()
+        return self._parent.get(node_name)
+
+    def path(self, target_node_name: Hashable) -> Optional[Path]:
+        """Current shortest path from the source to the target, None if the target is not reachable."""
+        self._valid_state()
+        if target_node_name not in self._dist:
+            return None
+        graph = self._graph
+        return Path.from_tree(lambda v: graph[self._parent[v.name]],
+                              graph[self.source_node_name], graph[target_node_name])
+
+    def distance_table(self) -> DistanceTable:
+        """Snapshot of the current distances in the format that `DiGraph.perform_dijkstra` returns."""
+        self._valid_state()
+        graph = self._graph
+        return {graph[v]: DistanceEntry(None if self._parent[v] is None else graph[self._parent[v]], d)
+                for v, d in self._dist.items()}
+
+    def __len__(self):
+        """Number of reachable nodes (including the source)."""
+        self._valid_state()
+        return len(self._dist)
+
+    def edge_changed(self, from_node_name: Hashable, to_node_name: Hashable):
+        try:
+            self._update(from_node_name, to_node_name)
+        except ValueError as error:
+            self._invalidate(str(error))
+
+    def _update(self, u: Hashable, v: Hashable):
+        edge = self._graph.edge(u, v)
+        candidate = math.inf
+        if edge is not None:
+            self._check(edge.cost)
+            self._tails.setdefault(v, set()).add(u)
+            candidate = self._dist.get(u, math.inf) + edge.cost
+        current = self._dist.get(v, math.inf)
+        if candidate < current:
+            self._attach(v, u, candidate)
+            self._propagate([(candidate, next(self._order), v)])
+        elif candidate > current and self._parent.get(v) == u:
+            self._repair(v)
+
+    def node_removed(self, node_name: Hashable):
+        # Its edges have been notified before, so it is unreachable already unless it is the source:
+        self._tails.pop(node_name, None)
+        if node_name == self.source_node_name:
+            self._dist.clear()
+            self._parent.clear()
+            self._children.clear()
+
+    def _check(self, cost: float):
+        if cost < 0:
+            raise ValueError(f"Dynamic shortest paths need non-negative costs, got {cost}!")
+
+    def _invalidate(self, reason: str):
+        # Raising during a notification would keep the listeners after this one from being notified:
+        self._error = f"{reason} The paths from '{self.source_node_name}' are not updated anymore."
+        self.close()
+
+    def _attach(self, v: Hashable, u: Hashable, dist: float):
+        old = self._parent.get(v)
+        if old is not None:
+            self._children[old].discard(v)
+        self._dist[v] = dist
+        self._parent[v] = u
+        self._children.setdefault(u, set()).add(v)
+
+    def _propagate(self, heap: List[Tuple[float, int, Hashable]]):
+        """Dijkstra from the nodes on the heap, it only continues where distances decrease."""
+        dist, backend = self._dist, self._backend
+        while heap:
+            d, _, u = heappop(heap)
+            if d > dist.get(u, math.inf):
+                # Outdated entry, u has been reached cheaper in the meantime:
+                continue
+            for edge in backend[u].edges:
+                self._check(edge.cost)
+                v, new_dist = edge.to_node.name, d + edge.cost
+                if new_dist < dist.get(v, math.inf):
+                    self._attach(v, u, new_dist)
+                    heappush(heap, (new_dist, next(self._order), v))
+
+    def _repair(self, root: Hashable):
+        """Re-attach the subtree of root, whose path from the source got more expensive or has been removed."""
+        self._children[self._parent[root]].discard(root)
+        affected = [root]
+        for v in affected:
+            affected.extend(self._children.pop(v, ()))
+        for v in affected:
+            del self._dist[v]
+            del self._parent[v]
+
+        # The rest of the tree is unaffected, so the cheapest edge from it is an upper bound for each affected node:
+        graph, dist, heap = self._graph, self._dist, []
+        for v in affected:
+            if v not in self._backend:
+                continue
+            best, best_tail, stale = math.inf, None, []
+            for u in self._tails.get(v, ()):
+                edge = graph.edge(u, v)
+                if edge is None:
+                    stale.append(u)
+                elif dist.get(u, math.inf) + edge.cost < best:
+                    best, best_tail = dist[u] + edge.cost, u
+            self._tails.get(v, set()).difference_update(stale)
+            if best_tail is not None:
+                self._attach(v, best_tail, best)
+                heappush(heap, (best, next(self._order), v))
+        self._propagate(heap)
@@ -57,7 +57,7 @@ class Connection(ABC):
 
     def __eq__(self, other):
         # TODO(kdevo): Evaluate if this exact type check is faster than using isinstance (which is often recommended)
-        return self.__class__ is other.__class__ and other.key == self.key
+        return self is other or self.__class__ is other.__class__ and other.key == self.key
 
     def __str__(self):
         return f"➔ {self.to_node}"
@@ -76,6 +76,10 @@ class Connection(ABC):
 
 
 class Edge(Connection):
+    # Stable id of the edge within its backend, None if the backend does not provide edge ids.
+    # Ids are small non-negative ints, so algorithms can use them to index arrays instead of hashing edges.
+    eid = None
+
     @abstractmethod
     def __init__(self, from_node: 'Node', to_node: 'Node', cost: float = None, capacity: float = None,
                  **kwargs: Dict[str, Any]):
@@ -1,24 +1,118 @@
+import itertools
 import math
+from array import array
 from collections import deque
-from heapq import heappush, heappop
-from typing import Optional, Set, Union, Callable, Iterable, Hashable, Tuple
+from contextlib import contextmanager
+from heapq import heappush, heappop, heapreplace
+from typing import Optional, Set, Union, Callable, Iterable, Hashable, Tuple, Dict, Iterator
 
 from grapresso.components.edge import Edge
 from grapresso.components.node import Node
-from .api import BellmanFordResult, DistanceTable, DistanceEntry, MstResult
+from .api import BellmanFordResult, DistanceTable, DistanceEntry, MstResult, AllPairsResult, JohnsonResult, \
+    SccResult, TraversalStep, MultiSourceBfsResult
 from ..backends.api import DataBackend
 from ..backends.memory import InMemoryBackend
-from ..components.path import CircularTour, TourTracker, Path, Cycle, Flow
+from ..components.contraction import ContractionHierarchy
+from ..components.dynamic import DynamicShortestPaths
+from ..components.path import CircularTour, TourTracker, Path, Cycle, Flow, PersistentTour
+from ..components.reachability import ReachabilityIndex
+from ..components.stats import AlgorithmStats, phase
+from ..datastruct.compact import CompactGraph, csr_dijkstra, csr_ms_bfs, csr_potentials, csr_strongly_connected, \
+    floyd_warshall, dense_prim, rank_edges, reorder, kruskal, HAS_NUMPY
 from ..datastruct.disjointset import DefaultDisjointSet
+from ..datastruct.heap import IndexedHeap
+from ..datastruct.lru import LruCache
+from ..tools.memory import getsize, is_shared
 
 
 class DiGraph:
+    # Collects counters and timings of the algorithms while the graph is instrumented, see `instrumented`:
+    stats: Optional[AlgorithmStats] = None
+    # Results of repeated queries, see `enable_result_cache`:
+    _result_cache: Optional[LruCache] = None
+    _result_cache_version = None
+    # Transitive closure for `reaches`, rebuilt on the first query after a modification:
+    _reachability: Optional[ReachabilityIndex] = None
+
     def __init__(self, data_backend: DataBackend = None):
         if data_backend is None:
             self._nodes_data = InMemoryBackend()
         else:
             self._nodes_data = data_backend
 
+    @contextmanager
+    def instrumented(self, stats: AlgorithmStats = None) -> Iterator[AlgorithmStats]:
+        """Collect counters (e.g. relaxed edges, heap operations, augmentations) and per-phase timings
+        of all algorithms performed on this graph within the context:
+
+            with graph.instrumented() as stats:
+                graph.perform_dijkstra('a')
+            print(stats.heap_pops, stats.phase_ns)
+
+        Args:
+            stats: Stats to add to, e.g. to accumulate several contexts, new ones per default.
+
+        Returns:
+            The stats, which keep their values after the context is left.
+        """
+        previous = self.stats
+        self.stats = stats if stats is not None else AlgorithmStats()
+        try:
+            yield self.stats
+        finally:
+            self.stats = previous
+
+    def enable_result_cache(self, max_entries: int = 128, max_bytes: int = None) -> LruCache:
+        """Cache the results of `perform_dijkstra`, `perform_bfs`, `perform_dfs` and `build_mst`,
+        so that repeated queries between modifications of the graph are answered from memory.
+        Every modification (see `DataBackend.version`) invalidates all cached results.
+
+        Cached results are shared between the callers, so they must not be modified.
+
+        Args:
+            max_entries: Number of results to keep, the least recently used ones are evicted.
+            max_bytes: Bound for the (estimated) total size of the results, unbounded per default.
+
+        Returns:
+            The cache, e.g. to inspect its hits and misses.
+        """
+        self._result_cache = LruCache(max_entries, max_bytes, lambda result: getsize(result, skip=is_shared))
+        self._result_cache_version = self._nodes_data.version
+        return self._result_cache
+
+    def disable_result_cache(self):
+        self._result_cache = None
+
+    @property
+    def result_cache(self) -> Optional[LruCache]:
+        return self._result_cache
+
+    def _cached(self, key: Tuple, compute: Callable, *args):
+        """Result of compute(*args), taken from the result cache if it is enabled and has it."""
+        cache = self._result_cache
+        if cache is None:
+            return compute(*args)
+        version = self._nodes_data.version
+        if version != self._result_cache_version:
+            # Results of older versions are never requested again:
+            cache.clear()
+            self._result_cache_version = version
+        return cache.get_or_compute(key + (version,), lambda: compute(*args))
+
+    def _cached_traversal(self, algorithm: str, traverse: Callable, start_node_name, on_visited_cb):
+        def compute():
+            order = []
+            return traverse(start_node_name, order.append), order
+
+        if self._result_cache is None:
+            return traverse(start_node_name, on_visited_cb)
+        # The visiting order is cached as well to replay it to the callback:
+        seen, order = self._cached((algorithm, start_node_name), compute)
+        if on_visited_cb:
+            for node in order:
+                on_visited_cb(node)
+        return seen
+
     @property
     def backend(self) -> DataBackend:
         """This property offers direct backend access. Use with care.
@@ -115,6 +209,10 @@ class DiGraph:
     def remove_node(self, node_name):
         self._nodes_data.remove_node(node_name)
 
+    def remove_edge(self, from_node_name, to_node_name):
+        self._nodes_data.remove_edge(from_node_name, to_node_name)
+        return self
+
     def edge(self, from_node_name, to_node_name) -> Optional[Edge]:
         try:
             node = self[from_node_name]
@@ -124,85 +222,247 @@ class DiGraph:
             return None
 
     def perform_dfs(self, start_node_name=None, on_visited_cb: callable = None):
-        start_node_name = self[start_node_name]
+        return self._cached_traversal('dfs', self._dfs, start_node_name, on_visited_cb)
+
+    def _dfs(self, start_node_name, on_visited_cb: callable):
         seen = set()
-        to_visit = [start_node_name]
-        seen.add(start_node_name)
-
-        while len(to_visit) > 0:
-            current_node = to_visit.pop()
-            for neighbour in current_node.neighbours:
-                if neighbour not in seen:
-                    to_visit.append(neighbour)
-                    seen.add(neighbour)
+        for node in self._traverse(start_node_name, True, seen):
             if on_visited_cb:
-                on_visited_cb(current_node)
+                on_visited_cb(node)
         return seen
 
     def perform_bfs(self, start_node_name=None, on_visited_cb: callable = None):
-        start_node_name = self[start_node_name]
+        return self._cached_traversal('bfs', self._bfs, start_node_name, on_visited_cb)
+
+    def _bfs(self, start_node_name, on_visited_cb: callable):
         seen = set()
-        to_visit = deque(maxlen=len(self._nodes_data))
-        to_visit.append(start_node_name)
-        seen.add(start_node_name)
-
-        while len(to_visit) > 0:
-            current_node = to_visit.popleft()
-            for neighbour in current_node.neighbours:
-                if neighbour not in seen:
-                    to_visit.append(neighbour)
-                    seen.add(neighbour)
+        for node in self._traverse(start_node_name, False, seen):
             if on_visited_cb:
-                on_visited_cb(current_node)
+                on_visited_cb(node)
         return seen
 
+    def iter_dfs(self, start_node_name=None, max_depth: int = None, edge_filter: Callable[[Edge], bool] = None,
+                 steps: bool = False) -> Iterator[Union[Node, TraversalStep]]:
+        """Lazy version of `perform_dfs` that visits the nodes in the same order.
+        Nothing beyond the yielded nodes is traversed, so the traversal stops when the consumer breaks out of the loop.
+
+        Args:
+            start_node_name: Node to start from, a random one if None.
+            max_depth: Nodes at this depth (number of edges from the start) are yielded but not expanded.
+            edge_filter: Only edges for which it returns True are followed.
+            steps: Whether to yield TraversalStep (node, depth, parent) instead of nodes.
+
+        Returns:
+            Iterator over the reachable nodes, each one is yielded once.
+        """
+        return self._traverse(start_node_name, True, set(), max_depth, edge_filter, steps)
+
+    def iter_bfs(self, start_node_name=None, max_depth: int = None, edge_filter: Callable[[Edge], bool] = None,
+                 steps: bool = False) -> Iterator[Union[Node, TraversalStep]]:
+        """Lazy version of `perform_bfs`, see `iter_dfs` for the arguments.
+        The nodes are yielded by increasing depth as soon as they are discovered, e.g. to get the 2-hop neighbourhood:
+
+            around = [step.node for step in graph.iter_bfs('a', max_depth=2, steps=True) if step.depth > 0]
+        """
+        return self._traverse(start_node_name, False, set(), max_depth, edge_filter, steps)
+
+    def _traverse(self, start_node_name, depth_first: bool, seen: set, max_depth: int = None,
+                  edge_filter: Callable[[Edge], bool] = None, steps: bool = False):
+        # Nodes are marked as seen when they are discovered, so each one is queued once.
+        # Breadth-first, the discovery order equals the visiting order, which allows to yield them right away.
+        # Depth and parent are only queued along if needed, a plain traversal queues the nodes only:
+        start_node = self[start_node_name]
+        tracked = steps or max_depth is not None
+        seen.add(start_node)
+        to_visit = deque([TraversalStep(start_node, 0, None) if tracked else start_node])
+        scanned = 0
+        try:
+            if not depth_first:
+                yield to_visit[0] if steps or not tracked else start_node
+            while to_visit:
+                current = to_visit.pop() if depth_first else to_visit.popleft()
+                if depth_first:
+                    yield current if steps or not tracked else current.node
+                if tracked:
+                    node, depth = current.node, current.depth + 1
+                    if max_depth is not None and depth > max_depth:
+                        continue
+                else:
+                    node = current
+                if edge_filter is None:
+                    neighbours = node.neighbours
+                else:
+                    neighbours = [edge.to_node for edge in node.edges if edge_filter(edge)]
+                scanned += len(neighbours)
+                for neighbour in neighbours:
+                    if neighbour not in seen:
+                        seen.add(neighbour)
+                        discovered = TraversalStep(neighbour, depth, node) if tracked else neighbour
+                        to_visit.append(discovered)
+                        if not depth_first:
+                            yield discovered if steps or not tracked else neighbour
+        finally:
+            if self.stats is not None:
+                self.stats.count(edges_relaxed=scanned, nodes_settled=len(seen))
+
     def perform_kruskal(self, on_new_edge_cb: Callable[[Edge], None] = None) -> float:
-        dj_set = DefaultDisjointSet(self._nodes_data)
+        """Kruskal's algorithm on a CSR snapshot of the graph: The edges are sorted as (cost, id) columns and
+        merged by an int-only union-find, so neither Edge objects are sorted nor nodes are hashed per edge.
+        Edges are treated as undirected and a disconnected graph yields a minimum spanning forest.
 
-        cost = 0
-        sorted_edges = sorted(self._nodes_data.edges(), key=lambda e: e.cost)
+        Args:
+            on_new_edge_cb: Called with each tree edge by increasing costs, only these are created as Edge objects.
 
-        for edge in sorted_edges:
-            if dj_set.find(edge.from_node) != dj_set.find(edge.to_node):
-                dj_set.union(edge.from_node, edge.to_node)
-                cost += edge.cost
-                if on_new_edge_cb:
-                    on_new_edge_cb(edge)
+        Returns:
+            Total costs of the tree edges.
+        """
+        with phase(self.stats, 'export'):
+            csr = CompactGraph.from_backend(self._nodes_data)
+            tails = csr.tails()
+        with phase(self.stats, 'sort'):
+            ranks = rank_edges(csr.costs)
+        with phase(self.stats, 'union-find'):
+            tree = kruskal(len(csr), tails, csr.targets, ranks)
+
+        mst_costs = 0
+        for e in tree:
+            mst_costs += csr.costs[e]
+            if on_new_edge_cb:
+                tail = self._nodes_data[csr.names[tails[e]]]
+                on_new_edge_cb(tail.edge(self._nodes_data[csr.names[csr.targets[e]]]))
+        if self.stats is not None:
+            self.stats.count(edges_relaxed=csr.edge_count)
+        return mst_costs
 
-        return cost
+    def perform_boruvka(self, on_new_edge_cb: Callable[[Edge], None] = None, processes: int = 1) -> float:
+        """Borůvka's algorithm on a CSR snapshot of the graph: Every round, each component picks its cheapest edge
+        to another component, which is data-parallel, so the edges can be scanned in shards by a process pool.
+        Like Kruskal, edges are treated as undirected and a disconnected graph yields a minimum spanning forest.
+
+        Args:
+            on_new_edge_cb: Called with each tree edge, only these are created as Edge objects.
+            processes: Number of worker processes, the number of CPUs if None. Sequential per default,
+                since starting the pool only pays off for millions of edges.
+
+        Returns:
+            Total costs of the tree edges.
+        """
+        from ..tools.parallel import parallel_boruvka
+        with phase(self.stats, 'export'):
+            csr = CompactGraph.from_backend(self._nodes_data)
+            tails = csr.tails()
+        with phase(self.stats, 'sort'):
+            # Renumber the edges by cost, then the cheapest edge of a component is the one with the lowest id:
+            ranks = rank_edges(csr.costs)
+            ranked_tails, ranked_heads = reorder(tails, ranks), reorder(csr.targets, ranks)
+        with phase(self.stats, 'boruvka'):
+            tree = [ranks[r] for r in parallel_boruvka(len(csr), ranked_tails, ranked_heads, processes)]
+
+        mst_costs = 0
+        for e in tree:
+            mst_costs += csr.costs[e]
+            if on_new_edge_cb:
+                tail = self._nodes_data[csr.names[tails[e]]]
+                on_new_edge_cb(tail.edge(self._nodes_data[csr.names[csr.targets[e]]]))
+        if self.stats is not None:
+            self.stats.count(edges_relaxed=csr.edge_count, nodes_settled=len(csr))
+        return mst_costs
 
     def build_mst(self, initialized_graph, preferred_algorithm=None) -> MstResult:
-        costs = {'kruskal': self.perform_kruskal, 'prim': self.perform_prim}[
-            preferred_algorithm if preferred_algorithm else self._nodes_data.mst_alg_hint](
-            on_new_edge_cb=lambda e: initialized_graph.add_edge(e.from_node.name, e.to_node.name, cost=e.cost)
-        )
+        algorithm = preferred_algorithm if preferred_algorithm else self._nodes_data.mst_alg_hint
+
+        def compute():
+            tree_edges = []
+            costs = {'kruskal': self.perform_kruskal, 'prim': self.perform_prim,
+                     'dense-prim': self.perform_dense_prim, 'boruvka': self.perform_boruvka}[algorithm](
+                on_new_edge_cb=lambda e: tree_edges.append((e.from_node.name, e.to_node.name, e.cost))
+            )
+            return costs, tree_edges
+
+        # Cached trees are replayed into the initialized graph:
+        costs, tree_edges = self._cached(('mst', algorithm), compute)
+        for from_node_name, to_node_name, cost in tree_edges:
+            initialized_graph.add_edge(from_node_name, to_node_name, cost=cost)
         return MstResult(costs, initialized_graph)
 
-    def perform_prim(self, start_node_name=None, on_new_edge_cb: callable = None) -> int:
-        to_visit = set(self._nodes_data)
-        current_node = self[start_node_name]
+    def perform_prim(self, start_node_name=None, on_new_edge_cb: callable = None) -> float:
+        """Grow a minimum spanning tree from the start node, always along the cheapest edge to a node outside of it.
+        The candidates are kept in an indexed heap with decrease-key, so each node is in it at most once: O(E log V).
+        A disconnected graph yields a minimum spanning forest, each further tree grows from a node not covered yet.
 
-        sorted_connections = []
-        mst_costs = 0
+        Args:
+            start_node_name: Root of the (first) tree, a random node per default.
+            on_new_edge_cb: Called with each tree edge, in the order they are added.
 
-        while len(to_visit) - 1 > 0:
-            to_visit.remove(current_node)
+        Returns:
+            Total costs of the tree edges.
+        """
+        nodes = list(self._nodes_data)
+        if not nodes:
+            return 0
+        index = {node: i for i, node in enumerate(nodes)}
+        heap = IndexedHeap(len(nodes))
+        # Cheapest edge from the tree to each node in the heap:
+        connecting = [None] * len(nodes)
+        outside = bytearray(b'\x01') * len(nodes)
 
-            for edge in current_node.edges:
-                if edge.to_node in to_visit:
-                    heappush(sorted_connections, (edge.cost, edge))
+        mst_costs = 0
+        scanned, pushes, pops = 0, 0, 0
+        for root in itertools.chain((index[self[start_node_name]],), range(len(nodes))):
+            if not outside[root]:
+                continue
+            heap.push(root, 0.0)
+            pushes += 1
+            while heap:
+                u, _ = heap.pop()
+                pops += 1
+                outside[u] = 0
+                if connecting[u] is not None:
+                    mst_costs += connecting[u].cost
+                    if on_new_edge_cb:
+                        on_new_edge_cb(connecting[u])
+                edges = nodes[u].edges
+                scanned += len(edges)
+                for edge in edges:
+                    v = index[edge.to_node]
+                    if outside[v] and heap.push(v, edge.cost):
+                        connecting[v] = edge
+                        pushes += 1
+
+        if self.stats is not None:
+            self.stats.count(edges_relaxed=scanned, heap_pushes=pushes, heap_pops=pops, nodes_settled=len(nodes))
+        return mst_costs
 
-            next_candidate = heappop(sorted_connections)
+    def perform_dense_prim(self, start_node_name=None, on_new_edge_cb: callable = None) -> float:
+        """Prim's algorithm on the dense cost matrix exported by the backend in O(V²) without a heap,
+        which is faster than `perform_prim` for complete graphs. Parallel edges are reduced to the cheapest one.
+        Like `perform_prim`, a disconnected graph yields a minimum spanning forest.
 
-            # check if the next_candidate is already visited and if sorted_neighbours is not empty
-            while next_candidate[1].to_node not in to_visit and len(sorted_connections) > 0:
-                next_candidate = heappop(sorted_connections)
+        Args:
+            start_node_name: Root of the (first) tree, a random node per default.
+            on_new_edge_cb: Called with each tree edge, in the order they are added.
 
-            if on_new_edge_cb:
-                on_new_edge_cb(next_candidate[1])
-            current_node = next_candidate[1].to_node  # to_node
-            mst_costs += next_candidate[0]  # cost
+        Returns:
+            Total costs of the tree edges.
+        """
+        names = list(self._nodes_data.node_names())
+        if not names:
+            return 0
+        n = len(names)
+        with phase(self.stats, 'export'):
+            matrix = self._nodes_data.cost_matrix(names)
+        with phase(self.stats, 'dense-prim'):
+            order, pred = dense_prim(matrix, n, names.index(self[start_node_name].name))
 
+        mst_costs = 0
+        for v in order:
+            u = int(pred[v])
+            if u >= 0:
+                mst_costs += matrix[u * n + v]
+                if on_new_edge_cb:
+                    on_new_edge_cb(self._nodes_data[names[u]].edge(self._nodes_data[names[v]]))
+        if self.stats is not None:
+            self.stats.count(edges_relaxed=n * n, nodes_settled=n)
         return mst_costs
 
     def perform_bellman_ford(self, start_node_name=None) -> BellmanFordResult:
@@ -215,7 +475,9 @@ class DiGraph:
         def dist(node):
             return dist_table[node].dist if node in dist_table else math.inf
 
+        passes = 0
         for _ in range(len(self._nodes_data) - 1):
+            passes += 1
             updated_dist = False
             for edge in self._nodes_data.edges():
                 if dist(edge.from_node) + edge.cost < dist(edge.to_node):
@@ -224,6 +486,11 @@ class DiGraph:
             if not updated_dist:
                 break
 
+        if self.stats is not None:
+            # Every pass (and the final check for negative cycles) scans all edges:
+            self.stats.count(edges_relaxed=(passes + 1) * sum(1 for _ in self._nodes_data.edges()),
+                             nodes_settled=len(dist_table))
+
         for edge in self._nodes_data.edges():
             if dist(edge.from_node) + edge.cost < dist(edge.to_node):
                 # Construct negative cycle:
@@ -248,6 +515,9 @@ class DiGraph:
         return BellmanFordResult(dist_table, None)
 
     def perform_dijkstra(self, start_node_name=None) -> DistanceTable:
+        return self._cached(('dijkstra', start_node_name), self._dijkstra, start_node_name)
+
+    def _dijkstra(self, start_node_name) -> DistanceTable:
         start_node = self[start_node_name]
         dist_table = {start_node: DistanceEntry(None, 0.0)}
         visited = set()
@@ -256,9 +526,13 @@ class DiGraph:
         def dist(node):
             return dist_table[node].dist if node in dist_table else math.inf
 
+        scanned, pops = 0, 0
         while len(sorted_nodes) > 0:
             cheapest_node = heappop(sorted_nodes)
-            for edge in cheapest_node[1].edges:
+            pops += 1
+            edges = cheapest_node[1].edges
+            scanned += len(edges)
+            for edge in edges:
                 new_distance = dist(edge.from_node) + edge.cost
                 if new_distance < dist(edge.to_node):
                     dist_table[edge.to_node] = DistanceEntry(edge.from_node, new_distance)
@@ -266,8 +540,202 @@ class DiGraph:
                         heappush(sorted_nodes, (new_distance, edge.to_node))
             visited.add(cheapest_node)
 
+        if self.stats is not None:
+            # The heap is empty now, so every push has been popped:
+            self.stats.count(edges_relaxed=scanned, heap_pushes=pops, heap_pops=pops, nodes_settled=len(dist_table))
         return dist_table
 
+    def dynamic_dijkstra(self, start_node_name) -> DynamicShortestPaths:
+        """Like `perform_dijkstra`, but the distances are kept up to date while edges are added, removed or change
+        their costs: Each modification only updates the affected part of the shortest path tree.
+
+        Args:
+            start_node_name: Source of the paths.
+
+        Returns:
+            The paths, which follow the graph until they are closed.
+        """
+        return DynamicShortestPaths(self, start_node_name)
+
+    def perform_floyd_warshall(self) -> AllPairsResult:
+        """All-pairs shortest paths on the dense cost matrix exported by the backend.
+        The n iterations are vectorised with NumPy if it is installed. Negative costs are allowed.
+
+        Raises:
+            ValueError: If there is a cycle with negative costs.
+
+        Returns:
+            Distance and predecessor matrices in O(n³) time and O(n²) memory.
+        """
+        names = list(self._nodes_data.node_names())
+        with phase(self.stats, 'export'):
+            matrix = self._nodes_data.cost_matrix(names)
+        with phase(self.stats, 'floyd-warshall'):
+            dist, pred = floyd_warshall(matrix, len(names))
+        return AllPairsResult(self, names, dist, pred)
+
+    def perform_all_pairs_dijkstra(self) -> AllPairsResult:
+        """All-pairs shortest paths by running Dijkstra from every node on a CSR export of the graph.
+        Each run writes directly into its row of preallocated distance and predecessor matrices.
+
+        Raises:
+            ValueError: If there are edges with negative costs.
+
+        Returns:
+            Distance and predecessor matrices in O(n · m log n) time and O(n²) memory.
+        """
+        with phase(self.stats, 'export'):
+            csr = CompactGraph.from_backend(self._nodes_data)
+        if any(c < 0 for c in csr.costs):
+            raise ValueError("Dijkstra does not support negative costs, use Floyd-Warshall instead!")
+        n = len(csr)
+        dist, pred = array('d', [math.inf]) * (n * n), array('q', [-1]) * (n * n)
+        with phase(self.stats, 'dijkstra'):
+            for source in range(n):
+                csr_dijkstra(csr.offsets, csr.targets, csr.costs, source, dist, pred, source * n)
+        return AllPairsResult(self, csr.names, dist, pred)
+
+    def perform_johnson(self) -> JohnsonResult:
+        """All-pairs shortest paths on sparse graphs with negative costs (but without negative cycles).
+        One Bellman-Ford (SPFA) run from a virtual root yields potentials h that make all costs non-negative
+        via c'(u, v) = c(u, v) + h(u) - h(v). Dijkstra then runs on c' per source.
+
+        Raises:
+            ValueError: If there is a cycle with negative costs.
+
+        Returns:
+            Result whose rows are computed lazily, use its `to_matrix` to compute all of them (in parallel).
+        """
+        with phase(self.stats, 'export'):
+            csr = CompactGraph.from_backend(self._nodes_data)
+        with phase(self.stats, 'potentials'):
+            h = csr_potentials(csr.offsets, csr.targets, csr.costs)
+        reweighted = array('d', csr.costs)
+        for u in range(len(csr)):
+            for e in range(csr.offsets[u], csr.offsets[u + 1]):
+                # Rounding errors must not lead to (tiny) negative costs that Dijkstra cannot handle:
+                reweighted[e] = max(0.0, csr.costs[e] + h[u] - h[csr.targets[e]])
+        return JohnsonResult(self, csr.with_costs(reweighted), h)
+
+    def all_pairs_shortest_paths(self, preferred_algorithm=None) -> AllPairsResult:
+        """Shortest paths between all pairs of nodes.
+
+        Args:
+            preferred_algorithm: Either "floyd-warshall" (dense, small and medium graphs) or "dijkstra" (sparse).
+                Per default, Floyd-Warshall is used if NumPy is installed and the graph has at most 1000 nodes.
+
+        Returns:
+            Distance and predecessor matrices.
+        """
+        if preferred_algorithm is None:
+            preferred_algorithm = 'floyd-warshall' if HAS_NUMPY and len(self) <= 1000 else 'dijkstra'
+        return {'floyd-warshall': self.perform_floyd_warshall,
+                'dijkstra': self.perform_all_pairs_dijkstra}[preferred_algorithm]()
+
+    def perform_ms_bfs(self, source_node_names: Iterable[Hashable], hops: bool = True,
+                       batch_size: int = 64) -> MultiSourceBfsResult:
+        """Breadth-first searches from many sources at once, batch_size of them share one traversal (MS-BFS):
+        Every node holds a bitmask of the sources that have reached it, so a node or edge reached by several
+        searches of a batch in the same level is scanned once for all of them.
+
+        Args:
+            source_node_names: Sources to search from.
+            hops: Whether to compute hop distances as well, otherwise only the reachability masks.
+            batch_size: Number of sources searched together, at most 64 so that the masks fit into 64 bit words.
+
+        Returns:
+            Per-node reachability masks per batch and (optionally) hop distances with one row per source.
+        """
+        if not 0 < batch_size <= 64:
+            raise ValueError(f"Batch size must be between 1 and 64, got {batch_size}!")
+        with phase(self.stats, 'export'):
+            csr = CompactGraph.from_backend(self._nodes_data)
+        source_names = list(source_node_names)
+        sources = [csr.index[name] for name in source_names]
+        n, rows = len(csr), len(sources)
+        dist = array('d', [math.inf]) * (rows * n) if hops else None
+        reach = []
+        with phase(self.stats, 'ms-bfs'):
+            for first in range(0, rows, batch_size):
+                seen = array('Q', [0]) * n
+                csr_ms_bfs(csr.offsets, csr.targets, sources[first:first + batch_size], seen, dist, first)
+                reach.append(seen)
+        return MultiSourceBfsResult(self, csr.names, dist, source_names, reach, batch_size)
+
+    def perform_multi_source(self, source_node_names: Iterable[Hashable], algorithm: str = 'dijkstra',
+                             processes: int = None) -> AllPairsResult:
+        """Batch of single-source searches fanned out to a process pool working on a shared memory graph export.
+
+        Args:
+            source_node_names: Sources to search from.
+            algorithm: Either "dijkstra" (costs) or "bfs" (hop counts).
+            processes: Number of worker processes, the number of CPUs per default.
+
+        Returns:
+            Distance and predecessor matrices with one row per source.
+
+        See Also:
+            `MultiSourceExecutor` to reuse the export and the shared memory for several batches.
+        """
+        from ..tools.parallel import MultiSourceExecutor
+        with MultiSourceExecutor(self, processes) as executor:
+            return executor.run(source_node_names, algorithm)
+
+    def strongly_connected_components(self, initialized_condensation: Optional['DiGraph'] = None,
+                                      condense: bool = True) -> SccResult:
+        """Strongly connected components using an iterative version of Tarjan's algorithm on a CSR export,
+        so it neither hits the recursion limit nor needs Node objects during the search.
+
+        Args:
+            initialized_condensation: Graph to build the condensation DAG in, a new in-memory DiGraph per default.
+            condense: Whether to build the condensation at all.
+
+        Returns:
+            Component label per node, the number of components and the condensation.
+        """
+        with phase(self.stats, 'export'):
+            csr = CompactGraph.from_backend(self._nodes_data)
+        with phase(self.stats, 'tarjan'):
+            labels, count = csr_strongly_connected(csr.offsets, csr.targets)
+        condensation = None
+        if condense:
+            condensation = initialized_condensation if initialized_condensation is not None \
+                else DiGraph(InMemoryBackend())
+            for label in range(count):
+                condensation.add_node(label)
+            cheapest = {}
+            for u in range(len(csr)):
+                for e in range(csr.offsets[u], csr.offsets[u + 1]):
+                    key = (labels[u], labels[csr.targets[e]])
+                    if key[0] != key[1] and csr.costs[e] < cheapest.get(key, math.inf):
+                        cheapest[key] = csr.costs[e]
+            for (a, b), cost in cheapest.items():
+                condensation.add_edge(a, b, cost=cost)
+        return SccResult(csr.names, labels, count, condensation)
+
+    def contraction_hierarchy(self, witness_limit: int = 500) -> ContractionHierarchy:
+        """Preprocess the graph for point-to-point shortest path queries, see `ContractionHierarchy`.
+
+        Raises:
+            ValueError: If there are edges with negative costs.
+        """
+        with phase(self.stats, 'contraction'):
+            return ContractionHierarchy(self, witness_limit)
+
+    def reaches(self, from_node_name: Hashable, to_node_name: Hashable) -> bool:
+        """Whether there is a path from one node to the other, every node reaches itself.
+        Answered in (close to) O(1) by a `ReachabilityIndex`, which is built on the first query and after every
+        modification.
+
+        Raises:
+            KeyError: If one of the nodes is not in the graph.
+        """
+        index = self._reachability
+        if index is None or not index.is_current:
+            with phase(self.stats, 'reachability-index'):
+                index = self._reachability = ReachabilityIndex(self)
+        return index.reaches(from_node_name, to_node_name)
+
     def cheapest_path(self, start_node_name, end_node_name):
         bmr = self.perform_bellman_ford(start_node_name)
         return Path.from_tree(lambda v: bmr.dist_table[v].parent, self[start_node_name], self[end_node_name])
@@ -286,7 +754,16 @@ class DiGraph:
 
     def build_residual_graph(self, initialized_residual_graph: 'DiGraph', flow: Flow):
         edge_info = {}
+        if self.stats is not None:
+            self.stats.count(residual_rebuilds=1)
+            # Searches on the residual graph are part of the algorithm that needs it:
+            initialized_residual_graph.stats = self.stats
+
+        with phase(self.stats, 'residual-graph'):
+            self._fill_residual_graph(initialized_residual_graph, flow, edge_info)
+        return initialized_residual_graph, edge_info
 
+    def _fill_residual_graph(self, initialized_residual_graph: 'DiGraph', flow: Flow, edge_info: Dict):
         for edge in self._nodes_data.edges():
             fw_capacity = edge.capacity - flow[edge]
             bw_capacity = flow[edge]
@@ -302,31 +779,62 @@ class DiGraph:
                 bw_edge = initialized_residual_graph.edge(edge.to_node.name, edge.from_node.name)
                 edge_info[bw_edge] = (edge, False)
 
-        return initialized_residual_graph, edge_info
-
     def shortest_path(self, source_node_name, target_node_name) -> Optional[Path]:
-        # TODO(kdevo): Refactor real bfs instead for the first part of this algorithm:
+        """Path with the fewest edges by bidirectional breadth-first search: Forward from the source and backward
+        (via the backend's predecessors) from the target, always expanding the smaller frontier by a whole level.
+        Both searches stop at the level where they meet, so for branching factor b and distance d,
+        about 2 * b^(d/2) instead of b^d nodes are explored.
+
+        Returns:
+            Path from source to target, None if the target is not reachable (or equals the source).
+        """
+        backend = self._nodes_data
         source_node, target_node = self[source_node_name], self[target_node_name]
-        node_to_parent = {source_node: None}
-
-        to_visit = deque(maxlen=len(self._nodes_data))
-        to_visit.append(source_node)
-        found_path = False
-
-        while not found_path and len(to_visit) > 0:
-            current_node = to_visit.popleft()
-            for edge in current_node.edges:
-                neighbour = edge.to_node
-                if neighbour not in node_to_parent:
-                    to_visit.append(neighbour)
-                    node_to_parent[neighbour] = current_node
-                    if neighbour == target_node:
-                        found_path = True
-
-        if found_path:
-            return Path.from_tree(lambda v: node_to_parent[v], source_node, target_node)
-        else:
+        source, target = source_node.name, target_node.name
+        if source == target:
+            return None
+        # Parent of each node reached from the source, child of each node that reaches the target (by name):
+        parents, children = {source: None}, {target: None}
+        forward, backward = [source], [target]
+        scanned, meeting = 0, None
+
+        def expand(frontier: list, neighbours_of: Callable[[Hashable], list], tree: dict, other_tree: dict) -> list:
+            nonlocal scanned, meeting
+            level = []
+            for u in frontier:
+                neighbours = neighbours_of(u)
+                scanned += len(neighbours)
+                for v in neighbours:
+                    if v not in tree:
+                        tree[v] = u
+                        if v in other_tree:
+                            meeting = v
+                            return level
+                        level.append(v)
+            return level
+
+        while meeting is None and forward and backward:
+            if len(forward) <= len(backward):
+                forward = expand(forward, lambda u: [v.name for v in backend[u].neighbours], parents, children)
+            else:
+                backward = expand(backward, lambda u: list(backend.predecessors(u)), children, parents)
+
+        if self.stats is not None:
+            self.stats.count(edges_relaxed=scanned, nodes_settled=len(parents) + len(children))
+        if meeting is None:
             return None
+        names = []
+        node = meeting
+        while node is not None:
+            names.append(node)
+            node = parents[node]
+        names.reverse()
+        node = children[meeting]
+        while node is not None:
+            names.append(node)
+            node = children[node]
+        nodes = [backend[name] for name in names]
+        return Path(source_node, target_node).run(u.edge(v) for u, v in zip(nodes, nodes[1:]))
 
     def perform_edmonds_karp(self, source_node_name, target_node_name) -> Flow:
         # Initialize flow. Set ∀ e ∈ E: f(e) = 0:
@@ -337,12 +845,15 @@ class DiGraph:
             # Calculate G' and u':
             res_graph, res_edge_to_orig = self.build_residual_graph(DiGraph(InMemoryBackend()), flow)
             # Find (s,t)-path p ∈ G' and also therewith determine γ = min(u'(e)) with e ∈ p:
-            augmenting_path = res_graph.shortest_path(source_node_name, target_node_name)
+            with phase(self.stats, 'augmenting-path'):
+                augmenting_path = res_graph.shortest_path(source_node_name, target_node_name)
             if augmenting_path is None:
                 path_in_resgraph_exists = False
             else:
                 # Augment f around γ using (s,t)-path p
                 flow.augment_along_path(augmenting_path, res_edge_to_orig)
+                if self.stats is not None:
+                    self.stats.count(augmentations=1)
         return flow
 
     def perform_cycle_cancelling(self) -> Flow:
@@ -379,16 +890,19 @@ class DiGraph:
             # That is why we need to test if there is a negative cycle from all start nodes:
             start_nodes = set(self._nodes_data)
             result = None
-            while len(start_nodes) > 0:
-                start_node = start_nodes.pop()
-                result = res_graph.perform_bellman_ford(start_node.name)
-                if result.is_cycle_detected:
-                    break
-                start_nodes -= result.visited
+            with phase(self.stats, 'negative-cycle'):
+                while len(start_nodes) > 0:
+                    start_node = start_nodes.pop()
+                    result = res_graph.perform_bellman_ford(start_node.name)
+                    if result.is_cycle_detected:
+                        break
+                    start_nodes -= result.visited
 
             if result.is_cycle_detected:
                 # Augment f around γ using negative cycle
                 flow.modify_along_path(result.cycle, res_edge_to_orig, result.cycle.min_capacity)
+                if self.stats is not None:
+                    self.stats.count(augmentations=1)
             else:
                 # If we cannot find a negative cycle anymore, we found an optimal solution:
                 return flow
@@ -435,13 +949,16 @@ class DiGraph:
                 raise ValueError("No balanced flow possible: Could not find a valid pair source and target!")
 
             # Cost-cheapest path is constructed using Bellman-Ford algorithm and iterating through the resulting tree:
-            path = res_graph.cheapest_path(pseudo_s.name, pseudo_t.name)
+            with phase(self.stats, 'cheapest-path'):
+                path = res_graph.cheapest_path(pseudo_s.name, pseudo_t.name)
 
             t_balance_diff = pseudo_balances[pseudo_t] - pseudo_t.balance
             s_balance_diff = pseudo_s.balance - pseudo_balances[pseudo_s]
             gamma = min(path.min_capacity, t_balance_diff, s_balance_diff)
 
             flow.modify_along_path(path, res_edge_to_orig, gamma)
+            if self.stats is not None:
+                self.stats.count(augmentations=1)
             pseudo_balances[pseudo_s] += gamma
             pseudo_balances[pseudo_t] -= gamma
         flow.max_flow = sum([n.balance for n in self._nodes_data if n.balance > 0])
@@ -449,12 +966,36 @@ class DiGraph:
 
 
 class UnDiGraph(DiGraph):
+    # Connected components as union-find over node names, built on first use and then maintained incrementally:
+    _components = None
+
     def add_edge(self, a, b, **kwargs):
         if a not in self._nodes_data:
             self.add_node(a)
         if b not in self._nodes_data:
             self.add_node(b)
         self._nodes_data.add_edge(a, b, True, **kwargs)
+        if self._components is not None:
+            self._components.union(a, b)
+        return self
+
+    def add_node(self, node_name, **attributes):
+        super().add_node(node_name, **attributes)
+        if self._components is not None:
+            self._components.add(node_name)
+        return self
+
+    def remove_node(self, node_name):
+        super().remove_node(node_name)
+        # Union-find cannot split sets, so the components are rebuilt on next use:
+        self._components = None
+
+    def remove_edge(self, a, b):
+        self._nodes_data.remove_edge(a, b)
+        # Backends that store both directions separately still have the other one:
+        if self.edge(b, a) is not None:
+            self._nodes_data.remove_edge(b, a)
+        self._components = None
         return self
 
     def perform_nearest_neighbour_tour(self, start_node_name=None):
@@ -489,29 +1030,97 @@ class UnDiGraph(DiGraph):
         return dt_tour
 
     def enumerate(self, start_node_name=None, track_all=False) -> TourTracker:
-        def go_recursive_step(current_edge: Edge, current_tour: CircularTour, all_tours):
-            current_tour.go(current_edge)
-            current_node = current_edge.to_node
-            non_visited = [e for e in current_node.edges if e.to_node not in current_tour.visited]
-            # Node with "degree" >= 1 means we have a branch node:
-            if len(non_visited) >= 1:
-                # Create a new branch for each unvisited neighbour:
-                for edge in non_visited:
-                    go_recursive_step(edge, current_tour.branch(), all_tours)
-            # Node with degree 0 means we have a leaf - the end of the tour:
-            else:
-                all_tours.add(current_tour.finish())
-
-        start_node = self[start_node_name]
         tours = TourTracker(only_store_cheapest=not track_all)
-        # Initial step is done here so that there is more clarity in the recursive function.
-        # (n-1) nodes and edges to start with (neighbours) because we have a fully connected graph:
-        for start_edge in start_node.edges:
-            go_recursive_step(start_edge, CircularTour(start_node), tours)
+        for tour in self.iter_tours(start_node_name):
+            tours.add(tour)
         return tours
 
+    def _search_tours(self, start_node: Node, bound: Callable[[], float]) -> Iterator[PersistentTour]:
+        """Depth-first search for tours that yields each (undirected) tour once, in only one of its directions.
+        Partial tours that are at least as expensive as bound() are pruned, which assumes non-negative costs.
+        """
+        # All branches share the node ids of their visited bitsets:
+        node_ids = {}
+
+        def node_id(node):
+            return node_ids.setdefault(node, len(node_ids))
+
+        to_visit = [(PersistentTour(start_node, node_ids), start_node, None)]
+        while to_visit:
+            tour, node, first_node = to_visit.pop()
+            if tour.cost >= bound():
+                continue
+            non_visited = [e for e in node.edges if e.to_node not in tour.visited]
+            if non_visited:
+                # Reversed, so that the branches are explored in the order of the node's edges:
+                for edge in reversed(non_visited):
+                    to_visit.append((tour.branch().go(edge), edge.to_node, first_node or edge.to_node))
+            # A leaf of the search tree, i.e. the end of the tour. Its reverse is skipped via the node ids:
+            elif first_node is not None and node_id(first_node) <= node_id(node):
+                try:
+                    tour.finish()
+                except KeyError:
+                    # There is no edge back to the start node:
+                    continue
+                if tour.cost < bound():
+                    yield tour
+
+    def iter_tours(self, start_node_name=None, as_names=False,
+                   predicate: Callable[[PersistentTour], bool] = None) -> Iterator[Union[CircularTour, Tuple]]:
+        """Lazily enumerate all tours, only the current branch of the search is held in memory.
+        Each tour is yielded once, although it could be travelled in two directions.
+
+        Args:
+            start_node_name: Name of the start node.
+            as_names: Yield compact tuples of the node names in visiting order (without returning to the start)
+                instead of materialised tours.
+            predicate: Only yield tours for which predicate(tour) is true.
+
+        Returns:
+            Generator of tours.
+        """
+        start_node = self[start_node_name]
+        for tour in self._search_tours(start_node, lambda: math.inf):
+            if predicate is None or predicate(tour):
+                yield self._report_tour(tour, as_names)
+
+    def cheapest_tours(self, k: int, start_node_name=None, as_names=False,
+                       predicate: Callable[[PersistentTour], bool] = None) -> Iterable[Union[CircularTour, Tuple]]:
+        """The k cheapest tours, retained in a bounded heap.
+        Partial tours that cannot beat the k-th cheapest tour found so far are pruned (branch and bound).
+
+        Args:
+            k: Number of tours to keep.
+            start_node_name: Name of the start node.
+            as_names: Return compact tuples of node names instead of tours, see `iter_tours`.
+            predicate: Only consider tours for which predicate(tour) is true.
+
+        Returns:
+            Up to k tours, cheapest first.
+        """
+        start_node = self[start_node_name]
+        # Max-heap of (-cost, tie breaker, tour) so that the most expensive retained tour is at the top:
+        cheapest = []
+
+        def bound():
+            return -cheapest[0][0] if len(cheapest) >= k else math.inf
+
+        for count, tour in enumerate(self._search_tours(start_node, bound)):
+            if predicate is None or predicate(tour):
+                if len(cheapest) < k:
+                    heappush(cheapest, (-tour.cost, count, tour))
+                else:
+                    heapreplace(cheapest, (-tour.cost, count, tour))
+        return [self._report_tour(tour, as_names) for _, _, tour in sorted(cheapest, reverse=True)]
+
+    @staticmethod
+    def _report_tour(tour: PersistentTour, as_names: bool) -> Union[CircularTour, Tuple]:
+        if as_names:
+            return (tour.start_node.name,) + tuple(e.to_node.name for e in tour.edges[:-1])
+        return tour.materialize()
+
     def enumerate_bnb(self, start_node_name=None) -> CircularTour:
-        def go_recursive_step(current_edge: Edge, current_tour: CircularTour, all_tours):
+        def go_recursive_step(current_edge: Edge, current_tour: PersistentTour, all_tours):
             current_tour.go(current_edge)
             if current_tour.cost < all_tours.cheapest_tour.cost:
                 current_node = current_edge.to_node
@@ -523,7 +1132,10 @@ class UnDiGraph(DiGraph):
                         go_recursive_step(edge, current_tour.branch(), all_tours)
                 # Node with "degree" >= 1 means we have a leaf - the end of the tour:
                 else:
-                    all_tours.add(current_tour.finish())
+                    current_tour.finish()
+                    # Only tours that beat the cheapest one are materialised:
+                    if current_tour.cost < all_tours.cheapest_tour.cost:
+                        all_tours.add(current_tour.materialize())
 
         nn_tour = self.perform_nearest_neighbour_tour(start_node_name)
         start_node = self[start_node_name]
@@ -531,50 +1143,136 @@ class UnDiGraph(DiGraph):
         tours = TourTracker()
         tours.add(nn_tour)
 
+        node_ids = {}
         # Initial step is done here so that there is more clarity in the recursive function.
         # (n-1) nodes and edges to start with (neighbours) because we have a fully connected graph:
         for start_edge in start_node.edges:
-            go_recursive_step(start_edge, CircularTour(start_node), tours)
+            go_recursive_step(start_edge, PersistentTour(start_node, node_ids), tours)
         return tours.cheapest_tour
 
     def cheapest_tour(self, start_node_name=None) -> CircularTour:
         return self.enumerate_bnb(start_node_name)
 
-    def count_connected_components(self):
-        remaining_nodes = set(self._nodes_data)
-        start_node = next(iter(remaining_nodes))
-        total_connected_count = 0
-        while start_node:
-            remaining_nodes -= self.perform_dfs(start_node.name)
-            total_connected_count += 1
-            start_node = next(iter(remaining_nodes), None)
+    def connected_components(self) -> DefaultDisjointSet:
+        """Connected components as disjoint set of node names.
+        They are labelled in one pass over all edges on first use. Afterwards, `add_edge` and `add_node` keep them
+        up to date in O(α(n)), removing a node causes a relabelling on next use.
+        Modifications that bypass the graph (e.g. directly via its backend) are not tracked.
+
+        Returns:
+            Disjoint set, do not modify it.
+        """
+        if self._components is None:
+            components = DefaultDisjointSet(self._nodes_data.node_names())
+            for edge in self._nodes_data.edges():
+                components.union(edge.from_node.name, edge.to_node.name)
+            self._components = components
+        return self._components
+
+    def component_of(self, node_name) -> int:
+        """Label of the connected component a node belongs to.
+        Two nodes are connected if and only if their labels are equal. Labels can change when components merge.
+        """
+        return self.connected_components().find(node_name)
+
+    def component_labels(self) -> Dict[Hashable, int]:
+        """Mapping of every node name to the number 0..k-1 of its connected component."""
+        components, labels = self.connected_components(), {}
+        return {name: labels.setdefault(components.find(name), len(labels))
+                for name in self._nodes_data.node_names()}
 
-        return total_connected_count
+    def count_connected_components(self):
+        return self.connected_components().count
 
     def is_connected(self):
         return self.count_connected_components() == 1
 
     def max_matchings(self, node_names_a: Set, node_names_b: Set):
-        # Create a directed graph
-        directed_graph = DiGraph(InMemoryBackend())
-        for edge in self._nodes_data.edges():
-            if edge.from_node.name in node_names_a and edge.to_node.name in node_names_b:
-                directed_graph.add_edge(edge.from_node.name, edge.to_node.name, capacity=1)
-
-        # Create super source and super target because we use Edmonds Karp later to get a max. flow:
-        s_name, t_name = directed_graph.free_node_name("SUPER-SOURCE"), directed_graph.free_node_name("SUPER-TARGET")
-        for node_name in list(directed_graph._nodes_data.node_names()):
-            if node_name in node_names_a:
-                directed_graph.add_edge(s_name, node_name, capacity=1)
-            elif node_name in node_names_b:
-                directed_graph.add_edge(node_name, t_name, capacity=1)
-
-        flow = directed_graph.perform_edmonds_karp(s_name, t_name)
-        matched_edges = []
-        for e in flow.edges():
-            if e.from_node.name in node_names_a and e.to_node.name in node_names_b:
-                matched_edges.append(self.edge(e.from_node.name, e.to_node.name))
-        return matched_edges
+        return self.perform_hopcroft_karp(node_names_a, node_names_b)
+
+    def perform_hopcroft_karp(self, node_names_a: Set, node_names_b: Set) -> Iterable[Edge]:
+        """Maximum matching of a bipartite graph in O(E √V).
+        Each phase layers the graph with a BFS from all free nodes of A and then augments along
+        a maximal set of vertex-disjoint shortest augmenting paths using an iterative DFS.
+
+        Args:
+            node_names_a: Names of the nodes of one side.
+            node_names_b: Names of the nodes of the other side, only edges between A and B are considered.
+
+        Returns:
+            Matched edges, each one from a node of A to a node of B.
+        """
+        names_a = [name for name in self._nodes_data.node_names() if name in node_names_a]
+        names_b, index_b = [], {}
+        adjacency = []
+        for name in names_a:
+            neighbours = []
+            for edge in self._nodes_data[name].edges:
+                b = edge.to_node.name
+                if b in node_names_b:
+                    if b not in index_b:
+                        index_b[b] = len(names_b)
+                        names_b.append(b)
+                    neighbours.append(index_b[b])
+            adjacency.append(neighbours)
+
+        match_a, match_b = [-1] * len(names_a), [-1] * len(names_b)
+        augmentations = 0
+        while True:
+            # BFS: Layer A by the length of the alternating path from a free node,
+            # up to the layer that reaches the first free node of B (the shortest augmenting path length):
+            with phase(self.stats, 'layering'):
+                layer = [0 if b == -1 else math.inf for b in match_a]
+                to_visit = deque(a for a, b in enumerate(match_a) if b == -1)
+                dist_nil = math.inf
+                while to_visit:
+                    a = to_visit.popleft()
+                    if layer[a] >= dist_nil:
+                        break
+                    for b in adjacency[a]:
+                        next_a = match_b[b]
+                        if next_a == -1:
+                            dist_nil = min(dist_nil, layer[a] + 1)
+                        elif layer[next_a] == math.inf:
+                            layer[next_a] = layer[a] + 1
+                            to_visit.append(next_a)
+            if dist_nil == math.inf:
+                break
+
+            # DFS: Augment along vertex-disjoint shortest paths that follow the layers:
+            next_edge = [0] * len(names_a)
+            for free_a in range(len(names_a)):
+                if match_a[free_a] != -1:
+                    continue
+                path_a, path_b = [free_a], []
+                while path_a:
+                    a = path_a[-1]
+                    if next_edge[a] == len(adjacency[a]):
+                        # Dead end, no other path may go through a in this phase:
+                        layer[a] = math.inf
+                        path_a.pop()
+                        if path_b:
+                            path_b.pop()
+                        continue
+                    b = adjacency[a][next_edge[a]]
+                    next_edge[a] += 1
+                    next_a = match_b[b]
+                    if next_a == -1:
+                        if layer[a] + 1 != dist_nil:
+                            # Augmenting path longer than the shortest one, left to a later phase:
+                            continue
+                        path_b.append(b)
+                        for a_on_path, b_on_path in zip(path_a, path_b):
+                            match_a[a_on_path], match_b[b_on_path] = b_on_path, a_on_path
+                        augmentations += 1
+                        break
+                    if layer[next_a] == layer[a] + 1 < dist_nil:
+                        path_a.append(next_a)
+                        path_b.append(b)
+
+        if self.stats is not None:
+            self.stats.count(augmentations=augmentations)
+        return [self.edge(names_a[a], names_b[b]) for a, b in enumerate(match_a) if b != -1]
 
     def __repr__(self):
         return "Undirected graph with {} nodes".format(len(self._nodes_data))
@@ -1,4 +1,4 @@
-from typing import Iterable, Hashable
+from typing import Iterable, Hashable, Optional
 
 from .edge import Edge
 
@@ -9,6 +9,8 @@ class Node:
         """Constructs a node with a name."""
         self._edges = []
         self._name = name
+        # Names are immutable, so the hash is computed only once:
+        self._hash = hash(name)
         self._balance = balance
         for field_name, value in kwargs.items():
             self.__setattr__(field_name, value)
@@ -31,6 +33,25 @@ class Node:
         # if edge.from_node != self and edge.to_node != self:
         #     raise ValueError()
 
+    def disconnect(self, edge, index: int = None) -> Optional[Edge]:
+        """Remove a connected edge by moving the last edge into its place, so the order of the edges changes.
+
+        Args:
+            edge: Edge to remove.
+            index: Position of the edge in the edge list if known, otherwise it is searched for.
+
+        Returns:
+            The edge that has been moved to index, None if the removed edge was the last one.
+        """
+        edges = self._edges
+        if index is None:
+            index = next(i for i, other in enumerate(edges) if other is edge)
+        last = edges.pop()
+        if index == len(edges):
+            return None
+        edges[index] = last
+        return last
+
     @property
     def edges(self) -> Iterable[Edge]:
         edges = []
@@ -54,9 +75,14 @@ class Node:
         return f"{repr(self._name)}"
 
     def __hash__(self):
-        return hash(self._name)
+        return self._hash
 
     def __eq__(self, other):
+        # Backends usually hand out one object per node, so identity decides most comparisons:
+        if self is other:
+            return True
+        if isinstance(other, Node):
+            return self._name == other._name
         return self._name == other
 
     def __lt__(self, other):
@@ -96,6 +122,13 @@ class IndexedNode(Node):
         super().connect(edge)
         self._indexed_edges[edge.opposite(self)] = edge
 
+    def disconnect(self, edge: Edge, index: int = None) -> Optional[Edge]:
+        neighbour = edge.opposite(self)
+        # Parallel edges share the index entry (it refers to the last connected one), others do not touch it:
+        if self._indexed_edges.get(neighbour) is edge:
+            del self._indexed_edges[neighbour]
+        return super().disconnect(edge, index)
+
     def edge(self, neighbour_node: Node) -> Edge:
         try:
             return self._indexed_edges[neighbour_node]
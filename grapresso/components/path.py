@@ -1,11 +1,15 @@
+from array import array
 from collections import defaultdict, deque, Hashable
 
 import math
-from typing import Dict, Iterable
+from typing import Dict, Iterable, Optional
 
 from grapresso.components.node import Node
 from grapresso.components.edge import Edge
 
+# Marks a flow whose edges come from several backends, so that edge ids are not used anymore:
+_MIXED_BACKENDS = object()
+
 
 class Path:
     def __init__(self, source_node: Hashable, target_node: Hashable):
@@ -126,6 +130,131 @@ class Cycle(CircularTour):
     #     super(CircularTour, self).go(edge)
 
 
+class _VisitedBits:
+    """Set-like view on the visited bitset of a PersistentPath."""
+
+    def __init__(self, node_ids: Dict[Node, int], bits: int):
+        self._node_ids = node_ids
+        self._bits = bits
+
+    def __contains__(self, node):
+        node_id = self._node_ids.get(node)
+        return node_id is not None and (self._bits >> node_id) & 1 == 1
+
+    def __iter__(self):
+        return (node for node, node_id in self._node_ids.items() if (self._bits >> node_id) & 1)
+
+    def __len__(self):
+        return bin(self._bits).count('1')
+
+
+class PersistentPath:
+    """Path for branching searches that shares its prefix with all paths it has been branched from.
+
+    The edges form a parent-linked (cons) list and the visited nodes are a bitset over node ids,
+    so `branch` and membership checks in `visited` take O(1) instead of copying the path.
+    `go` takes O(n/64) for n registered nodes, since setting a bit creates a new int (one machine word per 64 nodes).
+    All branches share one node -> id registry that assigns ids on first use.
+    Use `materialize` to convert it into a regular Path once it is reported.
+    """
+
+    __slots__ = ('_source_node', '_target_node', '_node_ids', '_last', '_length', '_cost', '_min_capacity',
+                 '_visited_bits')
+
+    def __init__(self, source_node: Node, target_node: Node, node_ids: Dict[Node, int] = None):
+        self._source_node = source_node
+        self._target_node = target_node
+        self._node_ids = node_ids if node_ids is not None else {}
+        # The last step is (edge, previous step), None for an empty path:
+        self._last = None
+        self._length = 0
+        self._cost = 0
+        self._min_capacity = math.inf
+        self._visited_bits = self._bit(source_node)
+
+    def _bit(self, node: Node) -> int:
+        node_id = self._node_ids.get(node)
+        if node_id is None:
+            node_id = self._node_ids[node] = len(self._node_ids)
+        return 1 << node_id
+
+    def go(self, edge: Edge):
+        if self._last is not None and self._last[0].to_node != edge.from_node:
+            raise ValueError("Broken chain: Cannot go an edge that is not accessible from '{}'!".format(edge.from_node))
+        self._last = (edge, self._last)
+        self._length += 1
+        self._cost += edge.cost
+        self._min_capacity = min(self._min_capacity, edge.capacity)
+        self._visited_bits |= self._bit(edge.from_node)
+        return self
+
+    def finish(self):
+        last_node = self._last[0].to_node
+        if last_node != self._target_node:
+            self.go(last_node.edge(self._target_node))
+        return self
+
+    def branch(self) -> 'PersistentPath':
+        branched = self.__class__.__new__(self.__class__)
+        branched._source_node, branched._target_node = self._source_node, self._target_node
+        branched._node_ids = self._node_ids
+        branched._last, branched._length = self._last, self._length
+        branched._cost, branched._min_capacity = self._cost, self._min_capacity
+        branched._visited_bits = self._visited_bits
+        return branched
+
+    def __copy__(self):
+        return self.branch()
+
+    @property
+    def cost(self):
+        return self._cost
+
+    @property
+    def min_capacity(self):
+        return self._min_capacity
+
+    @property
+    def visited(self) -> _VisitedBits:
+        return _VisitedBits(self._node_ids, self._visited_bits)
+
+    @property
+    def start_node(self):
+        return self._source_node
+
+    @property
+    def end_node(self):
+        return self._target_node
+
+    @property
+    def edges(self):
+        """Materialise the edges, this takes O(length)."""
+        edges = [None] * self._length
+        step = self._last
+        for i in range(self._length - 1, -1, -1):
+            edges[i], step = step
+        return edges
+
+    def __iter__(self):
+        return iter(self.edges)
+
+    def __len__(self):
+        return self._length
+
+    def materialize(self) -> Path:
+        return Path(self._source_node, self._target_node).run(self.edges)
+
+
+class PersistentTour(PersistentPath):
+    __slots__ = ()
+
+    def __init__(self, start_node: Node, node_ids: Dict[Node, int] = None):
+        super().__init__(start_node, start_node, node_ids)
+
+    def materialize(self) -> CircularTour:
+        return CircularTour(self._source_node).run(self.edges)
+
+
 class TourTracker:
     def __init__(self, only_store_cheapest: bool = True):
         self._cheapest_tour = None
@@ -148,27 +277,78 @@ class TourTracker:
 
 
 class Flow:
+    """Flow value f(e) per edge.
+
+    Flows of edges with a stable id (see `Edge.eid`) are stored in a float array indexed by that id,
+    so the inner loops of flow algorithms do not hash edges. Other edges are kept in a dict.
+    Ids are only unique within one backend, so the array is reserved for the edges of the first backend with ids.
+    As soon as edges of another backend are used, all flows are moved to the dict, where equal edges share a flow.
+    """
+
     def __init__(self, initialize_dict: Dict[Edge, float] = None):
         self._edge_to_flow = defaultdict(float)
+        self._id_backend = None
+        self._id_to_flow = array('d')
+        self._id_to_edge = []
         self._cost = 0
         self._max_flow = None
         if initialize_dict:
             for (e, f) in initialize_dict.items():
                 self.set(e, f)
 
+    def _eid(self, edge: Edge) -> Optional[int]:
+        """Index of the edge in the array, None if its flow is kept in the dict."""
+        eid = edge.eid
+        if eid is None:
+            return None
+        backend = edge._backend
+        if backend is None:
+            return None
+        if self._id_backend is None:
+            self._id_backend = backend
+        if backend is self._id_backend:
+            return eid
+        if self._id_backend is not _MIXED_BACKENDS:
+            self._release_ids()
+        return None
+
+    def _release_ids(self):
+        """Move all flows from the array into the dict, since edges of several backends are mixed."""
+        for edge, flow in zip(self._id_to_edge, self._id_to_flow):
+            if edge is not None:
+                self._edge_to_flow[edge] = flow
+        self._id_to_flow, self._id_to_edge = array('d'), []
+        self._id_backend = _MIXED_BACKENDS
+
+    def _get(self, edge: Edge) -> float:
+        eid = self._eid(edge)
+        if eid is None:
+            return self._edge_to_flow[edge]
+        return self._id_to_flow[eid] if eid < len(self._id_to_flow) else 0.0
+
     def set(self, edge: Edge, flow: float):
         if 0 <= flow <= edge.capacity:
-            flow_diff = flow - self._edge_to_flow[edge]
+            eid = self._eid(edge)
+            if eid is None:
+                flow_diff = flow - self._edge_to_flow[edge]
+                self._edge_to_flow[edge] = flow
+            else:
+                if eid >= len(self._id_to_flow):
+                    missing = max(eid + 1 - len(self._id_to_flow), len(self._id_to_flow))
+                    self._id_to_flow.extend(array('d', [0.0]) * missing)
+                    self._id_to_edge.extend([None] * missing)
+                flow_diff = flow - self._id_to_flow[eid]
+                self._id_to_flow[eid] = flow
+                self._id_to_edge[eid] = edge
             self._cost += flow_diff * edge.cost
-            self._edge_to_flow[edge] = flow
         else:
             raise ValueError("Flow must be between 0 and capacity {}!".format(edge.capacity))
 
     def increase(self, edge: Edge, flow: float):
-        self.set(edge, self._edge_to_flow[edge] + flow)
+        self.set(edge, self._get(edge) + flow)
 
     def decrease(self, edge: Edge, flow: float):
-        self.set(edge, self._edge_to_flow[edge] - flow)
+        self.set(edge, self._get(edge) - flow)
 
     @property
     def cost(self) -> float:
@@ -182,14 +362,19 @@ class Flow:
     def max_flow(self, value: float):
         self._max_flow = value
 
-    def __getitem__(self, item: Hashable):
-        return self._edge_to_flow[item]
+    def __getitem__(self, item: Edge):
+        return self._get(item)
 
     def __setitem__(self, key: Edge, value: float):
         self.set(key, value)
 
     def edges(self) -> Iterable[Edge]:
-        return [e for e in self._edge_to_flow if self._edge_to_flow[e] > 0]
+        return [e for e in self._edge_to_flow if self._edge_to_flow[e] > 0] \
+               + [e for e, f in zip(self._id_to_edge, self._id_to_flow) if f > 0]
+
+    def to_dict(self) -> Dict[Edge, float]:
+        """Dict view of all edges with a positive flow."""
+        return {e: self._get(e) for e in self.edges()}
 
     def augment_along_path(self, full_st_path: Path, res_edge_info: {}):
         if self._max_flow is None:
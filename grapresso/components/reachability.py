@@ -0,0 +1,153 @@
+from array import array
+from typing import Hashable
+
+from ..datastruct.compact import CompactGraph, csr_strongly_connected, csr_condensation
+
+
+class ReachabilityIndex:
+    """Reachability index of a graph that answers whether a node reaches another one in (close to) O(1).
+
+    All nodes of a strongly connected component reach the same nodes, so the index is built on the condensation.
+    Components are labelled in topological order, so a component only reaches components with a label >= its own.
+
+    Large graphs get interval labels from a DFS over a spanning forest of the condensation (in the style of
+    Agrawal et al. and GRAIL by Yildirim et al.), which take O(k) memory for k components:
+
+    - Each component c gets its DFS post-order rank post(c) and the lowest rank first(c) in its DFS subtree.
+      c reaches d via tree edges iff first(c) <= post(d) <= post(c), which answers most positive queries.
+    - low(c) is the lowest rank of all components reachable from c, so c can only reach d if
+      [low(d), post(d)] is contained in [low(c), post(c)], which answers most negative queries.
+    - All others are answered by a DFS on the condensation that is pruned by both rules.
+
+    Small graphs (see `bitset_limit`) store the full closure instead, one bitset row per component:
+    Bit d - c of row c is set if component c reaches component d, the row is cut after the last reachable component.
+    This takes k²/16 bytes in the worst case (a chain) and answers every query in O(1).
+
+    The index is a snapshot, `is_current` tells whether the graph has been modified since (see `DataBackend.version`).
+    `DiGraph.reaches` rebuilds it lazily after modifications.
+    """
+
+    def __init__(self, graph: 'DiGraph', bitset_limit: int = 2048):
+        """
+        Args:
+            graph: Graph to index, built in O(n + m) time with interval labels.
+            bitset_limit: Largest number of components for which the closure is stored as bitset rows,
+                which takes O(n + m · k / 64) time.
+        """
+        self._backend = graph.backend
+        self._version = self._backend.version
+        csr = CompactGraph.from_backend(self._backend)
+        labels, count = csr_strongly_connected(csr.offsets, csr.targets)
+        self._component = {name: labels[i] for i, name in enumerate(csr.names)}
+        self._count = count
+        self._offsets, self._targets = csr_condensation(csr.offsets, csr.targets, labels, count)
+        self._rows = None
+        if count <= bitset_limit:
+            self._build_rows()
+        else:
+            self._label_intervals()
+
+    def _build_rows(self):
+        offsets, targets = self._offsets, self._targets
+        # Successors have higher labels, so their rows are complete before the ones of their predecessors:
+        closure = [0] * self._count
+        for c in range(self._count - 1, -1, -1):
+            row = 1 << c
+            # A successor that is reached via an earlier (lower) one is covered by that one's row already:
+            for e in range(offsets[c], offsets[c + 1]):
+                d = targets[e]
+                if not row >> d & 1:
+                    row |= closure[d]
+            closure[c] = row
+        self._rows = []
+        for c, row in enumerate(closure):
+            row >>= c
+            self._rows.append(row.to_bytes((row.bit_length() + 7) // 8, 'little'))
+        # The condensation is not needed for queries anymore:
+        self._offsets = self._targets = None
+
+    def _label_intervals(self):
+        offsets, targets, k = self._offsets, self._targets, self._count
+        post, first, low = array('q', [0]) * k, array('q', [0]) * k, array('q', [0]) * k
+        next_edge = array('q', offsets[:k])
+        visited = bytearray(k)
+        calls = array('q')
+        rank = 0
+        for root in range(k):
+            if visited[root]:
+                continue
+            visited[root] = 1
+            first[root] = rank
+            calls.append(root)
+            while calls:
+                c = calls[-1]
+                e = next_edge[c]
+                if e < offsets[c + 1]:
+                    next_edge[c] = e + 1
+                    d = targets[e]
+                    if not visited[d]:
+                        visited[d] = 1
+                        first[d] = rank
+                        calls.append(d)
+                    continue
+                calls.pop()
+                post[c] = rank
+                rank += 1
+                # The condensation is acyclic, so all successors have been labelled already:
+                lowest = first[c]
+                for e in range(offsets[c], offsets[c + 1]):
+                    if low[targets[e]] < lowest:
+                        lowest = low[targets[e]]
+                low[c] = lowest
+        self._post, self._first, self._low = post, first, low
+
+    @property
+    def is_current(self) -> bool:
+        """Whether the graph has not been modified since the index has been built."""
+        return self._backend.version == self._version
+
+    @property
+    def component_count(self) -> int:
+        """Number of strongly connected components, i.e. nodes of the condensation."""
+        return self._count
+
+    def reaches(self, from_node_name: Hashable, to_node_name: Hashable) -> bool:
+        """Whether there is a path from one node to the other, every node reaches itself.
+
+        Raises:
+            KeyError: If one of the nodes has not been in the graph when the index has been built.
+        """
+        c, d = self._component[from_node_name], self._component[to_node_name]
+        if d < c:
+            return False
+        if self._rows is not None:
+            offset, row = d - c, self._rows[c]
+            return (offset >> 3) < len(row) and bool(row[offset >> 3] >> (offset & 7) & 1)
+        post, first, low = self._post, self._first, self._low
+        target_post, target_low = post[d], low[d]
+        if first[c] <= target_post <= post[c]:
+            return True
+        if target_low < low[c] or target_post > post[c]:
+            return False
+        return self._search(c, d)
+
+    def _search(self, c: int, d: int) -> bool:
+        """DFS from component c to d on the condensation that skips components which cannot reach d."""
+        offsets, targets, post, first, low = self._offsets, self._targets, self._post, self._first, self._low
+        target_post, target_low = post[d], low[d]
+        stack, seen = [c], {c}
+        while stack:
+            x = stack.pop()
+            for e in range(offsets[x], offsets[x + 1]):
+                y = targets[e]
+                if y > d:
+                    # Successors are sorted and only components up to d (in topological order) can reach it:
+                    break
+                if y in seen:
+                    continue
+                if first[y] <= target_post <= post[y]:
+                    return True
+                if low[y] <= target_low and target_post <= post[y]:
+                    seen.add(y)
+                    stack.append(y)
+        return False
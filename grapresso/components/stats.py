@@ -0,0 +1,99 @@
+from typing import Dict, Optional
+
+try:
+    from time import perf_counter_ns
+except ImportError:  # Python < 3.7
+    from time import perf_counter
+
+    def perf_counter_ns() -> int:
+        return int(perf_counter() * 1e9)
+
+
+class _Phase:
+    """Context manager that adds the time spent in it to a phase of AlgorithmStats."""
+
+    __slots__ = ('_stats', '_name', '_start')
+
+    def __init__(self, stats: 'AlgorithmStats', name: str):
+        self._stats = stats
+        self._name = name
+
+    def __enter__(self):
+        self._start = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stats.add_time(self._name, perf_counter_ns() - self._start)
+
+
+class _NoPhase:
+    """Shared no-op stand-in for _Phase while instrumentation is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+_NO_PHASE = _NoPhase()
+
+
+class AlgorithmStats:
+    """Counters and per-phase timings collected by the algorithms of a graph while it is instrumented.
+
+    Counters:
+        edges_relaxed: Edges that have been scanned, i.e. tried to improve the distance of their head.
+        heap_pushes, heap_pops: Operations on priority queues.
+        nodes_settled: Nodes whose final distance (or visit) has been determined.
+        augmentations: Flow (or matching) augmentations along a path or cycle.
+        residual_rebuilds: Residual graphs that have been built.
+
+    Algorithms count in local variables and report once at the end, phases are only timed while instrumented.
+    So a graph that is not instrumented has (close to) zero overhead.
+
+    See Also:
+        `DiGraph.instrumented` to enable instrumentation.
+    """
+
+    COUNTERS = ('edges_relaxed', 'heap_pushes', 'heap_pops', 'nodes_settled', 'augmentations', 'residual_rebuilds')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        for counter in self.COUNTERS:
+            setattr(self, counter, 0)
+        self.phase_ns = {}
+        self.phase_calls = {}
+
+    def count(self, **counters: int):
+        """Add to the given counters, e.g. count(heap_pops=3, nodes_settled=2)."""
+        for counter, value in counters.items():
+            setattr(self, counter, getattr(self, counter) + value)
+
+    def add_time(self, phase: str, ns: int):
+        self.phase_ns[phase] = self.phase_ns.get(phase, 0) + ns
+        self.phase_calls[phase] = self.phase_calls.get(phase, 0) + 1
+
+    def phase(self, name: str) -> _Phase:
+        """Context manager that times a phase, e.g. the residual graph construction.
+        Phases with the same name are summed up.
+        """
+        return _Phase(self, name)
+
+    def to_dict(self) -> Dict:
+        counters = {counter: getattr(self, counter) for counter in self.COUNTERS}
+        return dict(counters, phase_ns=dict(self.phase_ns), phase_calls=dict(self.phase_calls))
+
+    def __repr__(self):
+        counters = ", ".join(f"{c}={getattr(self, c)}" for c in self.COUNTERS if getattr(self, c))
+        phases = ", ".join(f"{p}={ns / 1e6:.3f}ms" for p, ns in self.phase_ns.items())
+        return f"AlgorithmStats({counters}; {phases})"
+
+
+def phase(stats: Optional[AlgorithmStats], name: str):
+    """Phase of `stats` if instrumentation is enabled (stats is not None), a shared no-op context manager otherwise."""
+    return _NO_PHASE if stats is None else _Phase(stats, name)
@@ -0,0 +1,505 @@
+import math
+from array import array
+from collections import deque
+from heapq import heappush, heappop
+from typing import Hashable, Sequence, Dict, Tuple, Callable, List, Iterable
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, pure Python fallbacks are used without it
+    np = None
+
+from .disjointset import ArrayDisjointSet
+
+HAS_NUMPY = np is not None
+
+
+class CompactGraph:
+    """Immutable snapshot of a graph in compressed sparse row (CSR) format.
+
+    Nodes are numbered 0..n-1 in the order of `names`.
+    The outgoing edges of node u are the edge ids offsets[u]..offsets[u + 1] - 1,
+    targets[e] and costs[e] hold the head node and the cost of edge e.
+
+    All columns are flat `array`s, so algorithms working on them never touch Node or Edge objects.
+    """
+
+    def __init__(self, names: Sequence[Hashable], offsets: array, targets: array, costs: array):
+        self.names = names
+        self.offsets = offsets
+        self.targets = targets
+        self.costs = costs
+        self._index = None
+
+    @classmethod
+    def from_backend(cls, backend, names: Sequence[Hashable] = None) -> 'CompactGraph':
+        """Export a backend into CSR format.
+
+        Args:
+            backend: Any DataBackend.
+            names: Node names in the order that defines their ids, all node names of the backend per default.
+
+        Returns:
+            The snapshot, it is not updated when the backend changes.
+        """
+        names = list(backend.node_names()) if names is None else list(names)
+        index = {name: i for i, name in enumerate(names)}
+        offsets, targets, costs = array('q', [0]), array('q'), array('d')
+        for name in names:
+            for edge in backend[name].edges:
+                targets.append(index[edge.to_node.name])
+                costs.append(edge.cost)
+            offsets.append(len(targets))
+        graph = cls(names, offsets, targets, costs)
+        graph._index = index
+        return graph
+
+    def with_costs(self, costs: array) -> 'CompactGraph':
+        """Snapshot of the same structure with other edge costs, e.g. reweighted ones."""
+        graph = CompactGraph(self.names, self.offsets, self.targets, costs)
+        graph._index = self._index
+        return graph
+
+    @property
+    def index(self) -> Dict[Hashable, int]:
+        """Mapping of node name to node id."""
+        if self._index is None:
+            self._index = {name: i for i, name in enumerate(self.names)}
+        return self._index
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def tails(self) -> array:
+        """Tail node of each edge id, i.e. the column that CSR encodes in the offsets."""
+        tails = array('q')
+        for u in range(len(self.names)):
+            tails.extend(array('q', [u]) * (self.offsets[u + 1] - self.offsets[u]))
+        return tails
+
+    def __len__(self):
+        return len(self.names)
+
+
+def csr_dijkstra(offsets: Sequence[int], targets: Sequence[int], costs: Sequence[float],
+                 source: int, dist, pred, base: int = 0):
+    """Dijkstra from `source` that writes into a row of preallocated distance and predecessor matrices.
+    The row starts at `base` and must be initialised with inf (dist) and -1 (pred).
+    Costs must not be negative.
+    """
+    dist[base + source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heappop(heap)
+        if d > dist[base + u]:
+            continue
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            new_distance = d + costs[e]
+            if new_distance < dist[base + v]:
+                dist[base + v] = new_distance
+                pred[base + v] = u
+                heappush(heap, (new_distance, v))
+
+
+def csr_potentials(offsets: Sequence[int], targets: Sequence[int], costs: Sequence[float]) -> array:
+    """Shortest distances from a virtual root that is connected to every node with cost 0,
+    computed with the queue-based Bellman-Ford variant (SPFA).
+    These are feasible potentials h: c(u, v) + h(u) - h(v) >= 0 holds for every edge (u, v).
+
+    Raises:
+        ValueError: If there is a cycle with negative costs.
+    """
+    n = len(offsets) - 1
+    h = array('d', [0.0]) * n
+    queued = bytearray(b'\x01') * n
+    # Number of edges on the current shortest path to each node, not counting the virtual root's edge:
+    lengths = array('q', [0]) * n
+    to_visit = deque(range(n))
+    while to_visit:
+        u = to_visit.popleft()
+        queued[u] = 0
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            new_distance = h[u] + costs[e]
+            if new_distance < h[v]:
+                h[v] = new_distance
+                lengths[v] = lengths[u] + 1
+                # Without negative cycles, a shortest path visits every node at most once, i.e. has < n edges:
+                if lengths[v] >= n:
+                    raise ValueError("Negative cycle detected, shortest paths are not defined!")
+                if not queued[v]:
+                    queued[v] = 1
+                    to_visit.append(v)
+    return h
+
+
+def csr_bfs(offsets: Sequence[int], targets: Sequence[int], source: int, dist, pred, base: int = 0):
+    """Breadth-first search from `source` that writes hop distances into a row of preallocated matrices.
+    The row starts at `base` and must be initialised with inf (dist) and -1 (pred).
+    """
+    dist[base + source] = 0.0
+    to_visit = deque([source])
+    while to_visit:
+        u = to_visit.popleft()
+        hops = dist[base + u] + 1.0
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            if dist[base + v] == math.inf:
+                dist[base + v] = hops
+                pred[base + v] = u
+                to_visit.append(v)
+
+
+def csr_ms_bfs(offsets: Sequence[int], targets: Sequence[int], sources: Sequence[int], seen: array,
+               dist=None, first_row: int = 0):
+    """Multi-source breadth-first search (MS-BFS by Then et al.) from up to 64 sources at once:
+    Each node holds the bitmask of the sources that have reached it, bit i stands for sources[i].
+    A level expands every frontier node once for all sources that reached it in the previous level,
+    so nodes and edges shared by the searches are scanned once instead of once per source.
+
+    Args:
+        seen: Bitmask per node (array('Q')) initialised with 0, holds the sources that reach each node afterwards.
+        dist: Optional row-major matrix that gets the hop distances, the row of sources[i] is first_row + i.
+            Its rows must be initialised with inf.
+    """
+    n = len(offsets) - 1
+    # Sources that reached a node in the last level by node:
+    visit = {}
+    for i, source in enumerate(sources):
+        bit = 1 << i
+        seen[source] |= bit
+        visit[source] = visit.get(source, 0) | bit
+        if dist is not None:
+            dist[(first_row + i) * n + source] = 0.0
+    hops = 0.0
+    while visit:
+        hops += 1.0
+        visit_next = {}
+        for u, mask in visit.items():
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                new = mask & ~seen[v]
+                if new:
+                    visit_next[v] = visit_next.get(v, 0) | new
+        # seen is only updated after the level, so the new bits of a node are distinct from the ones it had:
+        for v, new in visit_next.items():
+            seen[v] |= new
+            if dist is not None:
+                while new:
+                    bit = new & -new
+                    dist[(first_row + bit.bit_length() - 1) * n + v] = hops
+                    new ^= bit
+        visit = visit_next
+
+
+def csr_strongly_connected(offsets: Sequence[int], targets: Sequence[int]) -> Tuple[array, int]:
+    """Tarjan's strongly connected components algorithm without recursion.
+    The call stack is kept in arrays, together with one edge pointer per node, so it also works for huge graphs.
+
+    Returns:
+        Component label of each node and the number of components.
+        Labels are in topological order: Every edge (u, v) satisfies label[u] <= label[v].
+    """
+    n = len(offsets) - 1
+    order, low, label = array('q', [-1]) * n, array('q', [0]) * n, array('q', [-1]) * n
+    next_edge = array('q', offsets[:n])
+    on_stack = bytearray(n)
+    stack, calls = array('q'), array('q')
+    counter, count = 0, 0
+    for root in range(n):
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        calls.append(root)
+        while calls:
+            u = calls[-1]
+            e = next_edge[u]
+            if e < offsets[u + 1]:
+                next_edge[u] = e + 1
+                v = targets[e]
+                if order[v] == -1:
+                    order[v] = low[v] = counter
+                    counter += 1
+                    stack.append(v)
+                    on_stack[v] = 1
+                    calls.append(v)
+                elif on_stack[v] and order[v] < low[u]:
+                    low[u] = order[v]
+                continue
+            calls.pop()
+            if low[u] == order[u]:
+                # u is the root of a component, everything above it on the stack belongs to it:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = 0
+                    label[w] = count
+                    if w == u:
+                        break
+                count += 1
+            if calls and low[u] < low[calls[-1]]:
+                low[calls[-1]] = low[u]
+    # Tarjan finds the components in reverse topological order:
+    for u in range(n):
+        label[u] = count - 1 - label[u]
+    return label, count
+
+
+def csr_condensation(offsets: Sequence[int], targets: Sequence[int], labels: Sequence[int],
+                     count: int) -> Tuple[array, array]:
+    """Condensation of a graph in CSR form, i.e. one node per component and no parallel edges or loops.
+
+    Args:
+        labels: Component label of each node in topological order, see `csr_strongly_connected`.
+        count: Number of components.
+
+    Returns:
+        Offsets and targets of the condensation, the successors of each component are sorted ascending.
+    """
+    members: List[List[int]] = [[] for _ in range(count)]
+    for u, label in enumerate(labels):
+        members[label].append(u)
+    c_offsets, c_targets = array('q', [0]), array('q')
+    for c in range(count):
+        successors = {labels[targets[e]] for u in members[c] for e in range(offsets[u], offsets[u + 1])}
+        successors.discard(c)
+        c_targets.extend(sorted(successors))
+        c_offsets.append(len(c_targets))
+    return c_offsets, c_targets
+
+
+def floyd_warshall(matrix: array, n: int) -> Tuple[Sequence[float], Sequence[int]]:
+    """Floyd-Warshall on a flat row-major n×n cost matrix (inf for missing edges).
+    Vectorised with NumPy if available, the rows are relaxed in pure Python otherwise.
+
+    Raises:
+        ValueError: If there is a cycle with negative costs.
+
+    Returns:
+        Flat row-major distance and predecessor matrices.
+    """
+    if np is not None:
+        dist = np.frombuffer(matrix, dtype=np.float64).reshape(n, n).copy()
+        np.fill_diagonal(dist, np.minimum(np.diagonal(dist), 0.0))
+        pred = np.where(np.isfinite(dist), np.arange(n, dtype=np.int64)[:, None], -1)
+        np.fill_diagonal(pred, -1)
+        for k in range(n):
+            via_k = dist[:, k, None] + dist[None, k, :]
+            shorter = via_k < dist
+            np.copyto(dist, via_k, where=shorter)
+            np.copyto(pred, np.broadcast_to(pred[k], (n, n)), where=shorter)
+        if (np.diagonal(dist) < 0).any():
+            raise ValueError("Negative cycle detected, shortest paths are not defined!")
+        return dist.reshape(-1), pred.reshape(-1)
+
+    dist = [matrix[i * n:(i + 1) * n].tolist() for i in range(n)]
+    pred = [[i if c != math.inf else -1 for c in row] for i, row in enumerate(dist)]
+    for i in range(n):
+        dist[i][i] = min(dist[i][i], 0.0)
+        pred[i][i] = -1
+    for k in range(n):
+        dist_k, pred_k = dist[k], pred[k]
+        for i in range(n):
+            dist_i, dist_ik = dist[i], dist[i][k]
+            if dist_ik == math.inf:
+                continue
+            pred_i = pred[i]
+            for j in range(n):
+                via_k = dist_ik + dist_k[j]
+                if via_k < dist_i[j]:
+                    dist_i[j] = via_k
+                    pred_i[j] = pred_k[j]
+    if any(dist[i][i] < 0 for i in range(n)):
+        raise ValueError("Negative cycle detected, shortest paths are not defined!")
+    return array('d', (c for row in dist for c in row)), array('q', (p for row in pred for p in row))
+
+
+def dense_prim(matrix: array, n: int, start: int = 0) -> Tuple[Sequence[int], Sequence[int]]:
+    """Prim's algorithm on a flat row-major n×n cost matrix (inf for missing edges) in O(n²) without a heap,
+    which is optimal for complete graphs. Vectorised with NumPy if available.
+    A disconnected graph yields a spanning forest: Each further tree grows from the first node that is not covered.
+
+    Returns:
+        The nodes in the order they have been added and the parent of each node (-1 for the roots of the trees).
+    """
+    order = []
+    if np is not None:
+        costs = np.frombuffer(matrix, dtype=np.float64).reshape(n, n)
+        dist = np.full(n, np.inf)
+        pred = np.full(n, -1, dtype=np.int64)
+        outside = np.ones(n, dtype=bool)
+        if n:
+            dist[start] = 0.0
+        for _ in range(n):
+            candidates = np.where(outside, dist, np.inf)
+            u = int(candidates.argmin())
+            if candidates[u] == np.inf:
+                u = int(outside.argmax())
+            outside[u] = False
+            order.append(u)
+            closer = outside & (costs[u] < dist)
+            dist[closer] = costs[u][closer]
+            pred[closer] = u
+        return order, pred
+
+    dist = [math.inf] * n
+    pred = array('q', [-1]) * n
+    outside = list(range(n))
+    if n:
+        dist[start] = 0.0
+    while outside:
+        best = min(range(len(outside)), key=lambda i: dist[outside[i]])
+        if dist[outside[best]] == math.inf:
+            # The remaining nodes are not reachable from the current tree, start a new one:
+            best = min(range(len(outside)), key=outside.__getitem__)
+        u = outside[best]
+        outside[best] = outside[-1]
+        outside.pop()
+        order.append(u)
+        row = u * n
+        for v in outside:
+            cost = matrix[row + v]
+            if cost < dist[v]:
+                dist[v] = cost
+                pred[v] = u
+    return order, pred
+
+
+def rank_edges(costs: Sequence[float]) -> array:
+    """Edge ids ordered by cost, ties by id. Vectorised with NumPy if available,
+    which radix sorts integral costs with a range below 2^16 (e.g. hop counts or levels) instead of comparing floats.
+    """
+    if np is not None:
+        values = np.frombuffer(costs, dtype=np.float64)
+        if len(values):
+            low = values.min()
+            shifted = values - low
+            if shifted.max() < 1 << 16 and (shifted == np.floor(shifted)).all():
+                # NumPy's stable sort is a radix sort for integer types of at most 16 bits:
+                values = shifted.astype(np.uint16)
+        ranks = array('q')
+        ranks.frombytes(np.argsort(values, kind='stable').astype(np.int64).tobytes())
+        return ranks
+    return array('q', sorted(range(len(costs)), key=costs.__getitem__))
+
+
+def reorder(values: array, order: array) -> array:
+    """Copy of values in the given order of indices, gathered by NumPy if available."""
+    if np is not None:
+        result = array(values.typecode)
+        gathered = np.frombuffer(values, dtype=values.typecode).take(np.frombuffer(order, dtype=np.int64))
+        result.frombytes(gathered.tobytes())
+        return result
+    return array(values.typecode, (values[i] for i in order))
+
+
+def cheapest_edges(tails: Sequence[int], heads: Sequence[int], labels: Sequence[int],
+                   first: int, last: int) -> Dict[int, int]:
+    """Cheapest edge from each component to another one among the edges first..last-1, which is a Borůvka round.
+    Edges must be numbered by rank (see `rank_edges`), so the cheapest edge is the one with the lowest id.
+    That breaks ties consistently, so the picked edges never close a cycle. Vectorised with NumPy if available.
+
+    Args:
+        labels: Component of each node.
+
+    Returns:
+        Mapping of component label to edge id, only for components that have such an edge.
+    """
+    if np is not None:
+        component = np.frombuffer(labels, dtype=np.int64)
+        a = component[np.frombuffer(tails, dtype=np.int64)[first:last]]
+        b = component[np.frombuffer(heads, dtype=np.int64)[first:last]]
+        external = a != b
+        ids = np.arange(first, last)[external]
+        best = np.full(len(component), last, dtype=np.int64)
+        np.minimum.at(best, a[external], ids)
+        np.minimum.at(best, b[external], ids)
+        found = np.flatnonzero(best < last)
+        return dict(zip(found.tolist(), best[found].tolist()))
+
+    best = {}
+    for e in range(first, last):
+        a, b = labels[tails[e]], labels[heads[e]]
+        if a != b:
+            # Edges are scanned by increasing id, so the first one per component is the cheapest:
+            if a not in best:
+                best[a] = e
+            if b not in best:
+                best[b] = e
+    return best
+
+
+def merge_cheapest_edges(best: Dict[int, int], found: Dict[int, int]):
+    """Merge the result of `cheapest_edges` for another range of edges into best."""
+    for label, e in found.items():
+        if e < best.get(label, e + 1):
+            best[label] = e
+
+
+def kruskal(n: int, tails: Sequence[int], heads: Sequence[int], order: Iterable[int]) -> List[int]:
+    """Kruskal's minimum spanning tree algorithm on edge columns, edges are treated as undirected.
+    Stops as soon as the tree is complete. A disconnected graph yields a spanning forest.
+
+    Args:
+        n: Number of nodes.
+        tails, heads: Edge columns.
+        order: Edge ids by increasing cost (see `rank_edges`).
+
+    Returns:
+        Ids of the tree edges in the order they were picked.
+    """
+    # Union-find of ArrayDisjointSet, inlined since this loop runs for (almost) every edge:
+    parents, sizes, tree = array('q', range(n)), array('q', [1]) * n, []
+    for e in order:
+        u = tails[e]
+        while parents[u] != u:
+            parents[u] = parents[parents[u]]
+            u = parents[u]
+        v = heads[e]
+        while parents[v] != v:
+            parents[v] = parents[parents[v]]
+            v = parents[v]
+        if u != v:
+            if sizes[u] < sizes[v]:
+                u, v = v, u
+            parents[v] = u
+            sizes[u] += sizes[v]
+            tree.append(e)
+            if len(tree) == n - 1:
+                break
+    return tree
+
+
+def boruvka(n: int, tails: Sequence[int], heads: Sequence[int],
+            cheapest: Callable[[array], Dict[int, int]] = None) -> List[int]:
+    """Borůvka's minimum spanning tree algorithm on edge columns, edges are treated as undirected.
+    Every round, each component picks its cheapest edge to another component and all of them are merged,
+    so the number of components at least halves per round: O(m log n). A disconnected graph yields a spanning forest.
+
+    Args:
+        n: Number of nodes.
+        tails, heads: Edge columns, the edges must be numbered by rank (see `rank_edges`).
+        cheapest: Finds the cheapest edge per component given the component of each node (see `cheapest_edges`),
+            e.g. in parallel. All edges are scanned sequentially per default.
+
+    Returns:
+        Ids (i.e. ranks) of the tree edges.
+    """
+    if cheapest is None:
+        def cheapest(labels):
+            return cheapest_edges(tails, heads, labels, 0, len(tails))
+
+    components, tree = ArrayDisjointSet(n), []
+    while components.count > 1:
+        picked = cheapest(components.labels())
+        if not picked:
+            break
+        # Both components of an edge may have picked it:
+        for e in sorted(set(picked.values())):
+            if components.union(tails[e], heads[e]):
+                tree.append(e)
+    return tree
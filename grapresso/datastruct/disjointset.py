@@ -1,3 +1,4 @@
+from array import array
 from typing import Set
 
 
@@ -44,6 +45,23 @@ class DefaultDisjointSet(DisjointSet):
         self._data = {e: idx for idx, e in enumerate(iterable)}
         self._parents = list(range(len(self._data)))
         self._sizes = [1] * len(self._data)
+        self._count = len(self._data)
+
+    def add(self, x):
+        """Make a new singleton set {x}, nothing happens if x is already known."""
+        if x not in self._data:
+            self._data[x] = len(self._parents)
+            self._parents.append(len(self._parents))
+            self._sizes.append(1)
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        """Number of disjoint sets."""
+        return self._count
+
+    def __contains__(self, item):
+        return item in self._data
 
     def find(self, x):
         idx = self._parents[self._data[x]]
@@ -51,7 +69,7 @@ class DefaultDisjointSet(DisjointSet):
             idx, self._parents[idx] = self._parents[idx], self._parents[self._parents[idx]]
         return idx
 
-    def union(self, x, y):
+    def union(self, x, y) -> bool:
         x_root = self.find(x)
         y_root = self.find(y)
 
@@ -60,6 +78,56 @@ class DefaultDisjointSet(DisjointSet):
                 x_root, y_root = y_root, x_root
             self._parents[y_root] = x_root
             self._sizes[x_root] += self._sizes[y_root]
+            self._count -= 1
+            return True
+        return False
+
+    def __getitem__(self, item):
+        return self.find(item)
+
+
+class ArrayDisjointSet(DisjointSet):
+    """DefaultDisjointSet for the elements 0..n-1 (e.g. node ids) that needs no mapping from elements to indexes:
+    Parents and sizes are flat arrays, so neither elements are hashed nor Python objects are stored per element.
+    """
+
+    def __init__(self, n: int):
+        self._parents = array('q', range(n))
+        self._sizes = array('q', [1]) * n
+        self._count = n
+
+    @property
+    def count(self) -> int:
+        """Number of disjoint sets."""
+        return self._count
+
+    def __len__(self):
+        return len(self._parents)
+
+    def find(self, x: int) -> int:
+        parents = self._parents
+        while parents[x] != x:
+            # Path halving, the parent must be updated before x moves on to it:
+            parents[x] = parents[parents[x]]
+            x = parents[x]
+        return x
+
+    def union(self, x: int, y: int) -> bool:
+        x_root = self.find(x)
+        y_root = self.find(y)
+
+        if x_root != y_root:
+            if self._sizes[x_root] < self._sizes[y_root]:
+                x_root, y_root = y_root, x_root
+            self._parents[y_root] = x_root
+            self._sizes[x_root] += self._sizes[y_root]
+            self._count -= 1
+            return True
+        return False
+
+    def labels(self) -> array:
+        """Representative of every element's set, e.g. to share the current partition with other processes."""
+        return array('q', (self.find(x) for x in range(len(self._parents))))
 
     def __getitem__(self, item):
         return self.find(item)
@@ -0,0 +1,99 @@
+import math
+from array import array
+from typing import Tuple
+
+
+class IndexedHeap:
+    """Binary min-heap of the items 0..capacity-1 with a key each, every item is at most once in the heap.
+    In contrast to heapq with lazy deletion, the key of an item can be decreased in O(log n),
+    so the heap never holds more than capacity entries and no outdated ones.
+
+    Positions and keys live in flat arrays indexed by item, so items are usually node ids.
+    """
+
+    __slots__ = ('_heap', '_pos', '_keys')
+
+    def __init__(self, capacity: int):
+        # Items in heap order:
+        self._heap = []
+        # Position of each item in _heap, -1 if it is not in the heap:
+        self._pos = array('q', [-1]) * capacity
+        self._keys = array('d', [math.inf]) * capacity
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
+
+    def __contains__(self, item: int) -> bool:
+        return self._pos[item] >= 0
+
+    def key(self, item: int) -> float:
+        """Key of an item in the heap, inf if it is not in the heap."""
+        return self._keys[item] if self._pos[item] >= 0 else math.inf
+
+    def push(self, item: int, key: float) -> bool:
+        """Insert an item or decrease its key, nothing happens if it is in the heap with a key <= key.
+
+        Returns:
+            Whether the item has been inserted or its key has been decreased.
+        """
+        pos = self._pos[item]
+        if pos < 0:
+            pos = len(self._heap)
+            self._heap.append(item)
+        elif key >= self._keys[item]:
+            return False
+        self._keys[item] = key
+        self._sift_up(item, pos)
+        return True
+
+    def pop(self) -> Tuple[int, float]:
+        """Remove the item with the smallest key.
+
+        Raises:
+            IndexError: If the heap is empty.
+
+        Returns:
+            The item and its key.
+        """
+        heap = self._heap
+        item = heap[0]
+        last = heap.pop()
+        self._pos[item] = -1
+        if heap:
+            self._sift_down(last, 0)
+        return item, self._keys[item]
+
+    def _sift_up(self, item: int, pos: int):
+        heap, positions, keys = self._heap, self._pos, self._keys
+        key = keys[item]
+        while pos > 0:
+            parent_pos = (pos - 1) >> 1
+            parent = heap[parent_pos]
+            if keys[parent] <= key:
+                break
+            heap[pos] = parent
+            positions[parent] = pos
+            pos = parent_pos
+        heap[pos] = item
+        positions[item] = pos
+
+    def _sift_down(self, item: int, pos: int):
+        heap, positions, keys = self._heap, self._pos, self._keys
+        key, size = keys[item], len(heap)
+        child_pos = 2 * pos + 1
+        while child_pos < size:
+            right_pos = child_pos + 1
+            if right_pos < size and keys[heap[right_pos]] < keys[heap[child_pos]]:
+                child_pos = right_pos
+            child = heap[child_pos]
+            if key <= keys[child]:
+                break
+            heap[pos] = child
+            positions[child] = pos
+            pos = child_pos
+            child_pos = 2 * pos + 1
+        heap[pos] = item
+        positions[item] = pos
@@ -0,0 +1,74 @@
+import sys
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+
+class LruCache:
+    """Mapping that evicts the least recently used entries as soon as it has more than `max_entries` entries
+    or, if `max_bytes` is given, their sizes add up to more than `max_bytes`.
+    A single value that is larger than `max_bytes` is not stored at all.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = sys.getsizeof):
+        """
+        Args:
+            max_entries: Maximum number of entries.
+            max_bytes: Maximum total size of the values, unbounded per default.
+            sizeof: Determines the size of a value, only called if `max_bytes` is given.
+        """
+        if max_entries < 1:
+            raise ValueError("The cache needs room for at least one entry!")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        # key -> (value, size), ordered from least to most recently used:
+        self._entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default=None):
+        """Value of key (which is now the most recently used one) or default."""
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: Hashable, value):
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        if key in self._entries:
+            self.bytes -= self._entries.pop(key)[1]
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._entries[key] = (value, size)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or (self.max_bytes is not None and self.bytes > self.max_bytes):
+            self.bytes -= self._entries.popitem(last=False)[1][1]
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]):
+        """Cached value of key, it is computed and stored on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return "LruCache({}/{} entries, {} bytes, {} hits, {} misses)".format(
+            len(self), self.max_entries, self.bytes, self.hits, self.misses)
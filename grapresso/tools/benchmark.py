@@ -0,0 +1,289 @@
+"""Benchmark suite that runs the graph algorithms on synthetic graphs against every backend.
+
+Run it from the command line, optionally storing the results and comparing them with a previous run:
+
+    python -m grapresso.tools.benchmark --output current.json --baseline baseline.json
+
+The comparison exits with status 1 if a benchmark got slower than the tolerated threshold.
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .generators import random_gnm, grid, complete_euclidean, bipartite_flow_network
+from .memory import footprint
+from ..backends.memory import InMemoryBackend, Trait
+from ..backends.matrix import MatrixBackend
+from ..backends.networkx import NetworkXBackend
+from ..components.graph import DiGraph, UnDiGraph
+from ..components.stats import perf_counter_ns
+
+BACKENDS = {
+    'InMemory-OptimizeMemory': lambda: InMemoryBackend(Trait.OPTIMIZE_MEMORY),
+    'InMemory-OptimizePerformance': lambda: InMemoryBackend(Trait.OPTIMIZE_PERFORMANCE),
+    'NetworkXBackend': NetworkXBackend,
+    'Matrix': MatrixBackend,
+}
+
+
+class Timing:
+    """Samples of a benchmark in nanoseconds, together with the statistics derived from them."""
+
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self, samples: Sequence[int]):
+        self.samples = sorted(samples)
+
+    def percentile(self, p: float) -> float:
+        """Percentile with linear interpolation between the closest ranks."""
+        rank = (len(self.samples) - 1) * p / 100
+        lower, upper = math.floor(rank), math.ceil(rank)
+        return self.samples[lower] + (self.samples[upper] - self.samples[lower]) * (rank - lower)
+
+    @property
+    def median(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def fastest(self) -> int:
+        return self.samples[0]
+
+    def to_dict(self) -> Dict:
+        stats = {'p{}'.format(p): self.percentile(p) for p in self.PERCENTILES}
+        stats.update(min=self.fastest, max=self.samples[-1], mean=sum(self.samples) / len(self.samples),
+                     samples=self.samples)
+        return stats
+
+
+def measure(fn: Callable[..., object], repeat: int = 5, warmup: int = 1,
+            setup: Callable[[], Tuple] = None) -> Timing:
+    """Time `fn` with `perf_counter_ns`.
+
+    Args:
+        fn: Function to time.
+        repeat: Number of timed runs.
+        warmup: Number of untimed runs before, e.g. to let a JIT (PyPy) warm up.
+        setup: Creates the arguments of `fn` before every run, it is not timed.
+            Needed if `fn` modifies its input, the arguments are shared by all runs otherwise.
+
+    Returns:
+        The timing of the `repeat` runs.
+    """
+    args = setup() if setup else ()
+    samples = []
+    for i in range(warmup + repeat):
+        if setup and i > 0:
+            args = setup()
+        start = perf_counter_ns()
+        fn(*args)
+        elapsed = perf_counter_ns() - start
+        if i >= warmup:
+            samples.append(elapsed)
+    return Timing(samples)
+
+
+class Benchmark:
+    """One algorithm on one kind of synthetic graph.
+
+    Args:
+        name: Unique name of the benchmark.
+        build: Fills an empty graph with the given backend, gets the backend and the scale factor.
+        run: The timed algorithm call, gets the built graph.
+        mutates: If the algorithm modifies the graph, it is rebuilt (untimed) before every run.
+    """
+
+    def __init__(self, name: str, build: Callable[[object, float], DiGraph], run: Callable[[DiGraph], object],
+                 mutates: bool = False):
+        self.name = name
+        self.build = build
+        self.run = run
+        self.mutates = mutates
+
+
+def _scaled(size: int, scale: float) -> int:
+    return max(2, int(size * scale))
+
+
+def _gnm(directed: bool, n: int, degree: int):
+    def build(backend, scale):
+        nodes = _scaled(n, scale)
+        graph = DiGraph(backend) if directed else UnDiGraph(backend)
+        return random_gnm(graph, nodes, min(nodes * degree, nodes * (nodes - 1) // 2))
+
+    return build
+
+
+def _grid(size: int):
+    def build(backend, scale):
+        side = _scaled(size, math.sqrt(scale))
+        return grid(DiGraph(backend), side, side)
+
+    return build
+
+
+def _far_corner(graph: DiGraph) -> Tuple[int, int]:
+    # The side of a grid depends on the scale, its nodes are named (row, col):
+    return max(graph.backend.node_names())
+
+
+def _euclidean(n: int):
+    return lambda backend, scale: complete_euclidean(UnDiGraph(backend), _scaled(n, scale))
+
+
+def _transport(n: int):
+    return lambda backend, scale: bipartite_flow_network(DiGraph(backend), _scaled(n, scale), _scaled(n, scale))
+
+
+def _bipartite(n: int):
+    return lambda backend, scale: bipartite_flow_network(UnDiGraph(backend), _scaled(n, scale), _scaled(n, scale))
+
+
+def _matching(graph: UnDiGraph):
+    sides = {}
+    for name in graph.backend.node_names():
+        sides.setdefault(name[0], set()).add(name)
+    return graph.max_matchings(sides['s'], sides['t'])
+
+
+BENCHMARKS = {b.name: b for b in (
+    # Times the graph construction itself, the build step only binds the generator to a new backend:
+    Benchmark('build-gnm', lambda backend, scale: partial(_gnm(True, 1000, 5), backend, scale), lambda build: build(),
+              mutates=True),
+    Benchmark('dfs', _gnm(True, 2000, 5), lambda g: g.perform_dfs(0)),
+    Benchmark('bfs', _gnm(True, 2000, 5), lambda g: g.perform_bfs(0)),
+    Benchmark('shortest-path', _grid(30), lambda g: g.shortest_path((0, 0), _far_corner(g))),
+    Benchmark('dijkstra', _gnm(True, 2000, 5), lambda g: g.perform_dijkstra(0)),
+    Benchmark('bellman-ford', _gnm(True, 300, 5), lambda g: g.perform_bellman_ford(0)),
+    Benchmark('all-pairs', _gnm(True, 100, 5), lambda g: g.all_pairs_shortest_paths()),
+    Benchmark('johnson', _gnm(True, 100, 5), lambda g: g.perform_johnson().to_matrix()),
+    Benchmark('scc', _gnm(True, 2000, 2), lambda g: g.strongly_connected_components()),
+    Benchmark('connected-components', _gnm(False, 2000, 1), lambda g: g.count_connected_components(),
+              mutates=True),
+    Benchmark('kruskal', _gnm(False, 2000, 5), lambda g: g.build_mst(UnDiGraph(), 'kruskal')),
+    Benchmark('boruvka', _gnm(False, 2000, 5), lambda g: g.build_mst(UnDiGraph(), 'boruvka')),
+    Benchmark('prim', _euclidean(200), lambda g: g.build_mst(UnDiGraph(), 'prim')),
+    Benchmark('dense-prim', _euclidean(200), lambda g: g.build_mst(UnDiGraph(), 'dense-prim')),
+    Benchmark('edmonds-karp', _grid(10), lambda g: g.perform_edmonds_karp((0, 0), _far_corner(g))),
+    Benchmark('successive-shortest-path', _transport(6), lambda g: g.perform_successive_shortest_path()),
+    Benchmark('cycle-cancelling', _transport(6), lambda g: g.perform_cycle_cancelling(), mutates=True),
+    Benchmark('max-matchings', _bipartite(100), _matching),
+    Benchmark('nearest-neighbour', _euclidean(200), lambda g: g.perform_nearest_neighbour_tour(0)),
+    Benchmark('double-tree', _euclidean(200), lambda g: g.double_tree_tour(0)),
+    Benchmark('branch-and-bound', _euclidean(8), lambda g: g.enumerate_bnb(0)),
+)}
+
+
+def run(benchmark_names: Iterable[str] = None, backend_names: Iterable[str] = None, scale: float = 1.0,
+        repeat: int = 5, warmup: int = 1, on_result: Callable[[Dict], None] = None, memory: bool = False) -> Dict:
+    """Run benchmarks against backends.
+
+    Args:
+        benchmark_names: Benchmarks to run, all of `BENCHMARKS` per default.
+        backend_names: Backends to run them against, all of `BACKENDS` per default.
+        scale: Factor for the graph sizes, e.g. 0.1 for a quick smoke run.
+        repeat: Number of timed runs per benchmark and backend.
+        warmup: Number of untimed runs before.
+        on_result: Called with every result as soon as it is available.
+        memory: Also report the (sampled) memory footprint of each benchmark's graph.
+
+    Returns:
+        JSON serializable report with the environment and one result per benchmark and backend.
+    """
+    benchmarks = [BENCHMARKS[name] for name in (benchmark_names or BENCHMARKS)]
+    backends = list(backend_names or BACKENDS)
+    results = []
+    for benchmark in benchmarks:
+        for backend_name in backends:
+            def build():
+                return benchmark.build(BACKENDS[backend_name](), scale),
+
+            graph = None if benchmark.mutates else build()
+            timing = measure(benchmark.run, repeat, warmup, build if benchmark.mutates else lambda: graph)
+            result = {'benchmark': benchmark.name, 'backend': backend_name, 'timing_ns': timing.to_dict()}
+            if memory:
+                subject = (graph or build())[0]
+                if isinstance(subject, DiGraph):
+                    result['memory'] = footprint(subject).to_dict()
+            results.append(result)
+            if on_result:
+                on_result(result)
+    return {
+        'environment': {
+            'python': platform.python_implementation(),
+            'version': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'scale': scale,
+        'results': results,
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = 0.1,
+            statistic: str = 'p50') -> List[Dict]:
+    """Compare two reports of `run`, benchmarks that are only in one of them are ignored.
+
+    Args:
+        baseline: Report to compare against.
+        current: Report of the new run.
+        threshold: Tolerated relative slowdown, 0.1 means 10 % slower than the baseline.
+        statistic: Statistic of the timings to compare.
+
+    Returns:
+        Comparisons with the relative change ("ratio" is current / baseline) and whether it is a regression.
+    """
+    reference = {(r['benchmark'], r['backend']): r['timing_ns'][statistic] for r in baseline['results']}
+    comparisons = []
+    for result in current['results']:
+        key = (result['benchmark'], result['backend'])
+        if key in reference:
+            before, after = reference[key], result['timing_ns'][statistic]
+            ratio = after / before if before else math.inf
+            comparisons.append({'benchmark': key[0], 'backend': key[1], 'baseline': before, 'current': after,
+                                'ratio': ratio, 'regression': ratio > 1 + threshold})
+    return comparisons
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark grapresso's algorithms against all backends.")
+    parser.add_argument('-b', '--benchmark', action='append', choices=sorted(BENCHMARKS),
+                        help="Benchmark to run, can be repeated (default: all).")
+    parser.add_argument('-B', '--backend', action='append', choices=sorted(BACKENDS),
+                        help="Backend to run against, can be repeated (default: all).")
+    parser.add_argument('--scale', type=float, default=1.0, help="Factor for the graph sizes.")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of timed runs.")
+    parser.add_argument('--warmup', type=int, default=1, help="Number of untimed runs before.")
+    parser.add_argument('--memory', action='store_true', help="Also report the memory footprint of the graphs.")
+    parser.add_argument('-o', '--output', help="Write the results as JSON to this file.")
+    parser.add_argument('--baseline', help="Compare with the JSON results of a previous run.")
+    parser.add_argument('--threshold', type=float, default=0.1, help="Tolerated relative slowdown (default: 0.1).")
+    args = parser.parse_args(argv)
+
+    def report(result):
+        print("{benchmark:<26} {backend:<30} {p50:>14.3f} ms (p90 {p90:.3f} ms)".format(
+            p50=result['timing_ns']['p50'] / 1e6, p90=result['timing_ns']['p90'] / 1e6, **result),
+            "" if 'memory' not in result else "{:>10.1f} KiB".format(result['memory']['total'] / 1024), flush=True)
+
+    current = run(args.benchmark, args.backend, args.scale, args.repeat, args.warmup, report, args.memory)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            comparisons = compare(json.load(f), current, args.threshold)
+        regressions = [c for c in comparisons if c['regression']]
+        for c in comparisons:
+            print("{mark} {benchmark:<26} {backend:<30} {ratio:>6.2f}x".format(
+                mark='!' if c['regression'] else ' ', **c))
+        if regressions:
+            print("{} regression(s) above the threshold of {:.0%}.".format(len(regressions), args.threshold))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""Deterministic synthetic graphs for benchmarks and tests.
+
+Every generator fills an initialized (empty) graph and returns it, so the same graph can be built on any backend.
+The same seed always yields the same graph, independent of the backend and the Python implementation.
+"""
+
+import random
+from typing import Dict, List, Tuple
+
+from ..components.graph import DiGraph, UnDiGraph
+from ..backends.matrix import euclidean
+
+
+def _pairs(graph: DiGraph) -> int:
+    n = len(graph)
+    return n * (n - 1) // 2 if isinstance(graph, UnDiGraph) else n * (n - 1)
+
+
+def random_gnm(initialized_graph: DiGraph, n: int, m: int, seed: int = 0,
+               cost_range: Tuple[int, int] = (1, 100), capacity_range: Tuple[int, int] = (1, 20)) -> DiGraph:
+    """Erdős–Rényi graph G(n, m): m distinct edges chosen uniformly at random between n nodes named 0..n-1.
+
+    Args:
+        initialized_graph: Empty graph to fill, undirected graphs get m undirected edges.
+        n: Number of nodes.
+        m: Number of edges, at most the number of possible node pairs.
+        seed: Seed of the random number generator.
+        cost_range: Inclusive range of the integer edge costs.
+        capacity_range: Inclusive range of the integer edge capacities.
+
+    Returns:
+        The filled graph.
+    """
+    rng = random.Random(seed)
+    for name in range(n):
+        initialized_graph.add_node(name)
+    if m > _pairs(initialized_graph):
+        raise ValueError("Can not place {} distinct edges between {} nodes!".format(m, n))
+    directed = not isinstance(initialized_graph, UnDiGraph)
+    chosen = set()
+    while len(chosen) < m:
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u == v:
+            continue
+        pair = (u, v) if directed or u < v else (v, u)
+        if pair not in chosen:
+            chosen.add(pair)
+            initialized_graph.add_edge(pair[0], pair[1], cost=rng.randint(*cost_range),
+                                       capacity=rng.randint(*capacity_range))
+    return initialized_graph
+
+
+def grid(initialized_graph: DiGraph, rows: int, cols: int, seed: int = 0,
+         cost_range: Tuple[int, int] = (1, 100), capacity_range: Tuple[int, int] = (1, 20)) -> DiGraph:
+    """Grid graph (road-network like) whose nodes are named (row, col) and connected to their right and lower
+    neighbours. In directed graphs, both directions are added with independent costs.
+
+    Returns:
+        The filled graph.
+    """
+    rng = random.Random(seed)
+    directed = not isinstance(initialized_graph, UnDiGraph)
+    for r in range(rows):
+        for c in range(cols):
+            initialized_graph.add_node((r, c))
+    for r in range(rows):
+        for c in range(cols):
+            for neighbour in ((r, c + 1), (r + 1, c)):
+                if neighbour[0] < rows and neighbour[1] < cols:
+                    initialized_graph.add_edge((r, c), neighbour, cost=rng.randint(*cost_range),
+                                               capacity=rng.randint(*capacity_range))
+                    if directed:
+                        initialized_graph.add_edge(neighbour, (r, c), cost=rng.randint(*cost_range),
+                                                   capacity=rng.randint(*capacity_range))
+    return initialized_graph
+
+
+def euclidean_positions(n: int, seed: int = 0, dimension: int = 2, scale: float = 1000.0) -> Dict[int, Tuple]:
+    """Uniformly distributed positions of n points named 0..n-1 in a hypercube with the given edge length.
+    Can be passed to `MatrixBackend.from_positions` directly.
+    """
+    rng = random.Random(seed)
+    return {name: tuple(rng.uniform(0, scale) for _ in range(dimension)) for name in range(n)}
+
+
+def complete_euclidean(initialized_graph: DiGraph, n: int, seed: int = 0,
+                       dimension: int = 2, scale: float = 1000.0) -> DiGraph:
+    """Complete graph between random points, the edge costs are their euclidean distances (metric TSP instance).
+    The positions are those of `euclidean_positions` with the same arguments.
+
+    Returns:
+        The filled graph.
+    """
+    positions = euclidean_positions(n, seed, dimension, scale)
+    directed = not isinstance(initialized_graph, UnDiGraph)
+    for name in positions:
+        initialized_graph.add_node(name)
+    for u in range(n):
+        for v in range(n) if directed else range(u + 1, n):
+            if u != v:
+                initialized_graph.add_edge(u, v, cost=euclidean(positions[u], positions[v]))
+    return initialized_graph
+
+
+def bipartite_flow_network(initialized_graph: DiGraph, sources: int, sinks: int, seed: int = 0,
+                           supply_range: Tuple[int, int] = (1, 20),
+                           cost_range: Tuple[int, int] = (1, 100)) -> DiGraph:
+    """Transportation problem: Source nodes ('s', i) with positive balances are completely connected to sink nodes
+    ('t', j) with negative balances. Supply and demand are equal in total, and every edge can carry at least the
+    balance of its end points, so a balanced flow always exists.
+
+    Args:
+        initialized_graph: Empty directed graph to fill.
+        sources: Number of source nodes.
+        sinks: Number of sink nodes.
+        seed: Seed of the random number generator.
+        supply_range: Inclusive range of the integer supply of each source.
+        cost_range: Inclusive range of the integer costs per unit of flow.
+
+    Returns:
+        The filled graph.
+    """
+    rng = random.Random(seed)
+    supplies = [rng.randint(*supply_range) for _ in range(sources)]
+    demands = _split(sum(supplies), sinks, rng)
+    for i, supply in enumerate(supplies):
+        initialized_graph.add_node(('s', i), balance=supply)
+    for j, demand in enumerate(demands):
+        initialized_graph.add_node(('t', j), balance=-demand)
+    for i, supply in enumerate(supplies):
+        for j, demand in enumerate(demands):
+            initialized_graph.add_edge(('s', i), ('t', j), cost=rng.randint(*cost_range),
+                                       capacity=max(supply, demand) + rng.randint(0, supply_range[1]))
+    return initialized_graph
+
+
+def _split(total: int, parts: int, rng: random.Random) -> List[int]:
+    """Split total into parts random non-negative integers summing up to total."""
+    cuts = sorted(rng.randint(0, total) for _ in range(parts - 1))
+    return [b - a for a, b in zip([0] + cuts, cuts + [total])]
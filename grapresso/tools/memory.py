@@ -1,28 +1,136 @@
-# Copied from https://stackoverflow.com/a/30316760
+# getsize is copied from https://stackoverflow.com/a/30316760
 
+import random
 import sys
 from types import ModuleType, FunctionType
 from gc import get_referents
+from typing import Any, Callable, Dict, Set, Union
+
+from ..backends.api import DataBackend
+from ..components.edge import Edge
+from ..components.node import Node
 
 # Custom objects know their class.
 # Function objects seem to know way too much, including modules.
 # Exclude modules as well.
 BLACKLIST = type, ModuleType, FunctionType
 
+COMPONENTS = ('nodes', 'edges', 'attributes', 'indexes')
+
+
+def getsize(obj, seen_ids: Set[int] = None, skip: Callable[[Any], bool] = None):
+    """sum size of object & members.
 
-def getsize(obj):
-    """sum size of object & members."""
+    Args:
+        obj: Object to measure.
+        seen_ids: Ids of objects that are already accounted for, they are skipped and the new ones are added.
+        skip: Referenced objects for which this returns True are neither counted nor followed, e.g. other nodes.
+    """
     if isinstance(obj, BLACKLIST):
         raise TypeError('getsize() does not take argument of type: ' + str(type(obj)))
-    seen_ids = set()
-    size = 0
-    objects = [obj]
+    seen_ids = set() if seen_ids is None else seen_ids
+    if id(obj) in seen_ids:
+        return 0
+    seen_ids.add(id(obj))
+    size = sys.getsizeof(obj)
+    objects = get_referents(obj)
     while objects:
         need_referents = []
         for obj in objects:
-            if not isinstance(obj, BLACKLIST) and id(obj) not in seen_ids:
+            if not isinstance(obj, BLACKLIST) and id(obj) not in seen_ids and not (skip and skip(obj)):
                 seen_ids.add(id(obj))
                 size += sys.getsizeof(obj)
                 need_referents.append(obj)
         objects = get_referents(*need_referents)
     return size
+
+
+def is_shared(obj) -> bool:
+    """Whether obj is a backend, node or edge object or a singleton that the interpreter shares globally,
+    i.e. None, booleans, small ints and interned identifiers such as attribute names.
+    """
+    if obj is None or isinstance(obj, (DataBackend, Node, Edge, bool)):
+        return True
+    if type(obj) is int:
+        return -5 <= obj <= 256
+    return type(obj) is str and obj.isidentifier() and sys.intern(obj) is obj
+
+
+class Footprint:
+    """Estimated memory usage of a graph, broken down by component:
+
+    - nodes: Node objects (or just the node names if the backend creates nodes on demand)
+    - edges: Edge objects or the matrix cells of the edges
+    - attributes: Attribute dicts of nodes and edges, e.g. costs and capacities
+    - indexes: Structures to look up nodes and edges, e.g. adjacency lists and dicts
+    """
+
+    def __init__(self, node_count: int, edge_count: int, sampled_nodes: int, components: Dict[str, int]):
+        self.node_count = node_count
+        self.edge_count = edge_count
+        self.sampled_nodes = sampled_nodes
+        self.components = components
+
+    @property
+    def total(self) -> int:
+        return sum(self.components.values())
+
+    @property
+    def is_exact(self) -> bool:
+        """Whether all nodes have been measured instead of a sample."""
+        return self.sampled_nodes == self.node_count
+
+    def per_node(self) -> Dict[str, float]:
+        """Bytes per node of each component."""
+        return {c: size / self.node_count if self.node_count else 0.0 for c, size in self.components.items()}
+
+    def per_edge(self) -> Dict[str, float]:
+        """Bytes per edge of each component."""
+        return {c: size / self.edge_count if self.edge_count else 0.0 for c, size in self.components.items()}
+
+    def to_dict(self) -> Dict:
+        return {'nodes': self.node_count, 'edges': self.edge_count, 'sampled_nodes': self.sampled_nodes,
+                'total': self.total, 'components': dict(self.components),
+                'per_node': self.per_node(), 'per_edge': self.per_edge()}
+
+    def __repr__(self):
+        return "Footprint({} bytes for {} nodes and {} edges: {})".format(
+            self.total, self.node_count, self.edge_count, self.components)
+
+
+def footprint(graph: Union['DiGraph', DataBackend], sample_size: int = 1000, seed: int = 0) -> Footprint:
+    """Estimate how much memory a graph takes, see `DataBackend.memory_objects` for how backends report it.
+    Only a random sample of the nodes (together with their outgoing edges) is measured,
+    the result is extrapolated to all nodes so that large graphs are measured quickly.
+    Objects that are shared by the whole interpreter (e.g. small ints, interned strings) are not accounted for.
+
+    Args:
+        graph: Graph or backend to measure.
+        sample_size: Maximum number of nodes to measure, the estimate is exact for graphs up to this size.
+        seed: Seed for choosing the sample.
+
+    Returns:
+        Estimated bytes per component and the (estimated) number of edges.
+    """
+    backend = graph if isinstance(graph, DataBackend) else graph.backend
+    names = list(backend.node_names())
+    sample = names if len(names) <= sample_size else random.Random(seed).sample(names, sample_size)
+    factor = len(names) / len(sample) if sample else 0.0
+
+    # Indexes refer to names of nodes that are not in the sample, those must not be extrapolated:
+    seen_ids = {id(name) for name in names} - {id(name) for name in sample}
+    components = dict.fromkeys(COMPONENTS, 0.0)
+    for component, obj in backend.memory_objects(sample):
+        if obj is None or id(obj) in seen_ids:
+            continue
+        if component == 'indexes':
+            seen_ids.add(id(obj))
+            components[component] += sys.getsizeof(obj) * factor
+        else:
+            components[component] += getsize(obj, seen_ids, is_shared) * factor
+    for component, container in backend.memory_containers():
+        if container is not None and id(container) not in seen_ids:
+            seen_ids.add(id(container))
+            components[component] += sys.getsizeof(container)
+    edge_count = sum(len(backend[name].edges) for name in sample) * factor
+    return Footprint(len(names), round(edge_count), len(sample), {c: round(s) for c, s in components.items()})
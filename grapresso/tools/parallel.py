@@ -0,0 +1,251 @@
+import math
+import multiprocessing
+import os
+from array import array
+from multiprocessing.pool import Pool
+from multiprocessing.util import Finalize
+from typing import Iterable, Hashable, List, Tuple, Dict, Sequence
+
+from ..components.api import AllPairsResult
+from ..datastruct.compact import CompactGraph, csr_dijkstra, csr_bfs, boruvka, cheapest_edges, merge_cheapest_edges
+
+try:
+    from multiprocessing import shared_memory, resource_tracker
+except ImportError:  # Python < 3.8, the executor runs sequentially then
+    shared_memory = None
+
+# Shared memory blocks a worker process is attached to and views on them, set up once per worker by an initializer:
+_worker = {}
+
+
+def _share(values: array) -> 'shared_memory.SharedMemory':
+    block = shared_memory.SharedMemory(create=True, size=max(1, len(values) * values.itemsize))
+    block.buf[:len(values) * values.itemsize] = values.tobytes()
+    return block
+
+
+def _view(block, typecode: str, length: int) -> memoryview:
+    return block.buf.cast('B')[:length * array(typecode).itemsize].cast(typecode)
+
+
+def _attach_blocks(blocks: Tuple[str, ...]) -> List['shared_memory.SharedMemory']:
+    # Only the creating process may unlink the blocks, so attaching must not track them (bpo-38119):
+    register, resource_tracker.register = resource_tracker.register, lambda name, rtype: None
+    try:
+        return [shared_memory.SharedMemory(name=name) for name in blocks]
+    finally:
+        resource_tracker.register = register
+
+
+def _close_blocks(blocks: List['shared_memory.SharedMemory'], views: Iterable[memoryview]):
+    # Blocks cannot be closed while views on their buffers exist:
+    for view in views:
+        view.release()
+    for block in blocks:
+        block.close()
+
+
+def _attach_worker(blocks: Tuple[str, ...], views: Tuple[Tuple[str, str, int], ...]):
+    """Pool initializer: Attach to the blocks and store a view per block, given as (name, typecode, length).
+    The handles are closed when the worker exits, which requires the pool to be closed and joined (not terminated).
+    """
+    attached = _attach_blocks(blocks)
+    _worker.update({name: _view(block, typecode, length) for block, (name, typecode, length) in zip(attached, views)})
+    _worker['blocks'] = attached
+    Finalize(None, _detach_worker, exitpriority=10)
+
+
+def _detach_worker():
+    blocks = _worker.pop('blocks')
+    views = list(_worker.values())
+    _worker.clear()
+    _close_blocks(blocks, views)
+
+
+def _start_pool(processes: int, blocks: List['shared_memory.SharedMemory'],
+                views: Tuple[Tuple[str, str, int], ...]) -> Pool:
+    """Process pool whose workers are attached to the blocks, see `_attach_worker`."""
+    return multiprocessing.Pool(processes, _attach_worker, (tuple(b.name for b in blocks), views))
+
+
+def _stop_pool(pool: Pool):
+    # In contrast to terminate, letting the workers exit runs their finalizers that close the blocks:
+    pool.close()
+    pool.join()
+
+
+def _run(task: Tuple[str, int, List[int], int, Tuple[str, str]]):
+    algorithm, first_row, sources, rows, output_blocks = task
+    # The output matrices change per run of the executor, so they are attached per task:
+    n = len(_worker['offsets']) - 1
+    outputs = _attach_blocks(output_blocks)
+    dist, pred = _view(outputs[0], 'd', rows * n), _view(outputs[1], 'q', rows * n)
+    try:
+        _fill_rows(algorithm, first_row, sources, n, _worker['offsets'], _worker['targets'], _worker['costs'],
+                   dist, pred)
+    finally:
+        _close_blocks(outputs, (dist, pred))
+
+
+def _fill_rows(algorithm: str, first_row: int, sources: List[int],
+               n: int, offsets, targets, costs, dist, pred):
+    unreached, no_parent = array('d', [math.inf]) * n, array('q', [-1]) * n
+    for row, source in enumerate(sources, first_row):
+        base = row * n
+        dist[base:base + n] = unreached
+        pred[base:base + n] = no_parent
+        if algorithm == 'dijkstra':
+            csr_dijkstra(offsets, targets, costs, source, dist, pred, base)
+        else:
+            csr_bfs(offsets, targets, source, dist, pred, base)
+
+
+class MultiSourceExecutor:
+    """Runs many single-source searches (Dijkstra or BFS) in a process pool.
+
+    The graph is exported once into a CSR snapshot that is placed in shared memory,
+    so workers attach to it instead of receiving pickled Node objects per task.
+    Every worker writes its result rows directly into a shared output matrix.
+    The pool is started by the first parallel run and reused by all following ones.
+
+    Use it as a context manager, the pool and the shared memory are released on exit:
+
+        with MultiSourceExecutor(graph) as executor:
+            result = executor.run(sources)
+
+    Without `multiprocessing.shared_memory` (Python < 3.8) or with processes=1, the searches run sequentially.
+    """
+
+    def __init__(self, graph: 'DiGraph', processes: int = None, compact: CompactGraph = None):
+        """
+        Args:
+            graph: Graph whose nodes the results refer to.
+            processes: Number of worker processes, the number of CPUs per default.
+            compact: Snapshot to search on instead of exporting `graph`, e.g. one with reweighted costs.
+        """
+        self._graph = graph
+        self._csr = compact if compact is not None else CompactGraph.from_backend(graph.backend)
+        self._processes = processes or os.cpu_count() or 1
+        self._blocks = []
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def is_parallel(self) -> bool:
+        return shared_memory is not None and self._processes > 1
+
+    def run(self, source_node_names: Iterable[Hashable], algorithm: str = 'dijkstra',
+            chunk_size: int = None) -> AllPairsResult:
+        """Search from every given source.
+
+        Args:
+            source_node_names: Sources, each one gets a row in the result matrices.
+            algorithm: Either "dijkstra" (costs) or "bfs" (hop counts).
+            chunk_size: Number of sources per task, chosen so that each worker gets about four tasks per default.
+
+        Returns:
+            Distance and predecessor matrices with one row per source.
+        """
+        if algorithm not in ('dijkstra', 'bfs'):
+            raise ValueError(f"Unknown algorithm '{algorithm}', use 'dijkstra' or 'bfs'!")
+        csr = self._csr
+        if algorithm == 'dijkstra' and any(c < 0 for c in csr.costs):
+            raise ValueError("Dijkstra does not support negative costs!")
+        source_names = list(source_node_names)
+        sources = [csr.index[name] for name in source_names]
+        n, rows = len(csr), len(sources)
+        chunk_size = chunk_size or max(1, math.ceil(rows / (self._processes * 4)))
+        chunks = [(first, sources[first:first + chunk_size]) for first in range(0, rows, chunk_size)]
+
+        if not self.is_parallel:
+            dist, pred = array('d', [math.inf]) * (rows * n), array('q', [-1]) * (rows * n)
+            for first, chunk in chunks:
+                _fill_rows(algorithm, first, chunk, n, csr.offsets, csr.targets, csr.costs, dist, pred)
+            return AllPairsResult(self._graph, csr.names, dist, pred, source_names)
+
+        pool = self._start_pool()
+        dist_block = shared_memory.SharedMemory(create=True, size=max(1, rows * n * 8))
+        pred_block = shared_memory.SharedMemory(create=True, size=max(1, rows * n * 8))
+        try:
+            outputs = (dist_block.name, pred_block.name)
+            pool.map(_run, [(algorithm, first, chunk, rows, outputs) for first, chunk in chunks])
+            dist, pred = array('d'), array('q')
+            dist.frombytes(dist_block.buf[:rows * n * 8])
+            pred.frombytes(pred_block.buf[:rows * n * 8])
+        finally:
+            for block in (dist_block, pred_block):
+                block.close()
+                block.unlink()
+        return AllPairsResult(self._graph, csr.names, dist, pred, source_names)
+
+    def _start_pool(self) -> Pool:
+        if self._pool is None:
+            csr = self._csr
+            self._blocks = [_share(csr.offsets), _share(csr.targets), _share(csr.costs)]
+            self._pool = _start_pool(self._processes, self._blocks, (
+                ('offsets', 'q', len(csr) + 1), ('targets', 'q', csr.edge_count), ('costs', 'd', csr.edge_count)))
+        return self._pool
+
+    def close(self):
+        """Stop the pool and release the shared memory, the executor can still run sequentially afterwards."""
+        if self._pool is not None:
+            _stop_pool(self._pool)
+            self._pool = None
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+def _cheapest_in_shard(shard: Tuple[int, int]) -> Dict[int, int]:
+    w = _worker
+    return cheapest_edges(w['tails'], w['heads'], w['labels'], *shard)
+
+
+def parallel_boruvka(n: int, tails: array, heads: array,
+                     processes: int = None, shard_size: int = None) -> List[int]:
+    """Borůvka's minimum spanning tree algorithm (see `boruvka`),
+    whose rounds scan shards of the edges in a process pool.
+    The edge columns are placed in shared memory once, each round only the component labels of the nodes are updated.
+    Workers return the cheapest edge per component of their shard, which are merged in the calling process.
+
+    Without `multiprocessing.shared_memory` (Python < 3.8) or with processes=1, it runs sequentially.
+
+    Args:
+        n: Number of nodes.
+        tails, heads: Edge columns, the edges must be numbered by rank (see `rank_edges`).
+        processes: Number of worker processes, the number of CPUs per default.
+        shard_size: Number of edges per task, chosen so that each worker gets about four shards per default.
+
+    Returns:
+        Ids (i.e. ranks) of the tree edges.
+    """
+    processes = processes or os.cpu_count() or 1
+    m = len(tails)
+    if shared_memory is None or processes <= 1 or not m:
+        return boruvka(n, tails, heads)
+    shard_size = shard_size or max(1, math.ceil(m / (processes * 4)))
+    shards = [(first, min(m, first + shard_size)) for first in range(0, m, shard_size)]
+    blocks = [_share(tails), _share(heads), _share(array('q', [0]) * n)]
+    labels = _view(blocks[-1], 'q', n)
+    pool = _start_pool(processes, blocks, (('tails', 'q', m), ('heads', 'q', m), ('labels', 'q', n)))
+    try:
+        def cheapest(current_labels: Sequence[int]) -> Dict[int, int]:
+            labels[:] = current_labels
+            best = {}
+            for found in pool.map(_cheapest_in_shard, shards):
+                merge_cheapest_edges(best, found)
+            return best
+
+        return boruvka(n, tails, heads, cheapest)
+    finally:
+        _stop_pool(pool)
+        labels.release()
+        for block in blocks:
+            block.close()
+            block.unlink()
@@ -44,6 +44,7 @@ setup(
     license='GPL-3.0',
     extras_require={
         'backend-networkx': ["networkx==2.4.0"],
+        'numpy': ["numpy>=1.16.0"],
         'test': ["pytest>=5.0.0,<6.0.0"]
     },
     zip_safe=True,
@@ -1,4 +1,6 @@
-from grapresso.datastruct.disjointset import DefaultDisjointSet
+from array import array
+
+from grapresso.datastruct.disjointset import DefaultDisjointSet, ArrayDisjointSet
 
 
 class TestDisjointSet:
@@ -16,3 +18,28 @@ class TestDisjointSet:
         djs.union(4, 6)
         djs.union(6, 3)
         assert djs[6] == djs[1]
+
+    def test_add_and_count(self):
+        djs = DefaultDisjointSet('ab')
+        assert djs.count == 2
+        djs.add('c')
+        djs.add('c')
+        assert 'c' in djs and djs.count == 3
+        assert djs.union('a', 'c') and not djs.union('c', 'a')
+        assert djs.count == 2 and djs['a'] == djs['c'] != djs['b']
+
+    def test_array_backed(self):
+        djs = ArrayDisjointSet(5)
+        assert djs.count == 5 and len(djs) == 5
+        assert djs.union(0, 1) and djs.union(3, 4) and djs.union(1, 4) and not djs.union(0, 3)
+        assert djs.count == 2 and djs[0] == djs[4] != djs[2]
+        labels = djs.labels()
+        assert len(set(labels)) == 2 and labels[1] == labels[3] == djs.find(0) and labels[2] == 2
+
+    def test_array_backed_compresses_paths(self):
+        djs = ArrayDisjointSet(6)
+        djs._parents[:] = array('q', [1, 2, 3, 4, 5, 5])  # Chain 0 -> 1 -> .. -> 5
+        assert djs.find(0) == 5
+        # Path halving links every other node on the path to its grandparent:
+        assert list(djs._parents) == [2, 2, 4, 4, 5, 5]
+        assert djs.find(0) == 5 and list(djs._parents) == [4, 2, 4, 4, 5, 5]
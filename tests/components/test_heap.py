@@ -0,0 +1,27 @@
+import random
+
+import pytest
+
+from grapresso.datastruct.heap import IndexedHeap
+
+
+class TestIndexedHeap:
+    def test_decrease_key(self):
+        heap = IndexedHeap(4)
+        assert heap.push(0, 5.0) and heap.push(1, 3.0) and heap.push(2, 4.0)
+        assert not heap.push(1, 3.5) and heap.key(1) == 3.0
+        assert heap.push(0, 1.0) and len(heap) == 3 and 3 not in heap
+        assert heap.pop() == (0, 1.0) and 0 not in heap and heap.key(0) == float('inf')
+        assert [heap.pop() for _ in range(len(heap))] == [(1, 3.0), (2, 4.0)]
+        assert not heap
+        with pytest.raises(IndexError):
+            heap.pop()
+
+    def test_sorts_like_sorted(self):
+        rnd = random.Random(0)
+        heap, best = IndexedHeap(100), {}
+        for _ in range(500):
+            item, key = rnd.randrange(100), rnd.random()
+            heap.push(item, key)
+            best[item] = min(key, best.get(item, key))
+        assert [heap.pop() for _ in range(len(heap))] == sorted(best.items(), key=lambda entry: entry[1])
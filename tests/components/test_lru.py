@@ -0,0 +1,29 @@
+import pytest
+
+from grapresso.datastruct.lru import LruCache
+
+
+class TestLruCache:
+    def test_evicts_least_recently_used(self):
+        cache = LruCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == 1
+        cache.put('c', 3)
+        assert 'a' in cache and 'b' not in cache and len(cache) == 2
+        assert cache.get('b', 'missing') == 'missing' and (cache.hits, cache.misses) == (1, 1)
+        assert cache.get_or_compute('c', lambda: 0) == 3 and cache.get_or_compute('d', lambda: 4) == 4
+        assert 'a' not in cache
+        with pytest.raises(ValueError):
+            LruCache(max_entries=0)
+
+    def test_memory_bound(self):
+        cache = LruCache(max_entries=10, max_bytes=10, sizeof=len)
+        cache.put(1, 'x' * 4)
+        cache.put(2, 'x' * 4)
+        cache.put(3, 'x' * 4)
+        assert 1 not in cache and cache.bytes == 8
+        cache.put(2, 'x' * 11)
+        assert 2 not in cache and len(cache) == 1 and cache.bytes == 4
+        cache.clear()
+        assert len(cache) == 0 and cache.bytes == 0
@@ -1,6 +1,8 @@
+import pytest
+
 from grapresso.backends.memory import InMemoryBackend
-from grapresso.components.graph import DiGraph
-from grapresso.components.path import CircularTour
+from grapresso.components.graph import DiGraph, UnDiGraph
+from grapresso.components.path import CircularTour, PersistentTour
 
 
 class TestTour:
@@ -22,3 +24,25 @@ class TestTour:
         assert len(list(tour)) == 2
         assert tour.edges[-1].to_node == tour.start_node
         print(tour)
+
+    def test_persistent_tour(self):
+        g = UnDiGraph(InMemoryBackend()) \
+            .add_edge(1, 2, cost=1) \
+            .add_edge(2, 3, cost=2) \
+            .add_edge(3, 1, cost=3) \
+            .add_edge(2, 4, cost=4) \
+            .add_edge(4, 1, cost=5)
+
+        tour = PersistentTour(g.node(1)).go(g.edge(1, 2))
+        branch = tour.branch().go(g.edge(2, 3))
+        other_branch = tour.branch().go(g.edge(2, 4))
+        assert len(tour) == 1 and len(branch) == len(other_branch) == 2
+        assert g.node(2) in branch.visited and g.node(3) not in branch.visited
+        assert g.node(4) not in branch.visited and g.node(2) in other_branch.visited
+        with pytest.raises(ValueError):
+            tour.branch().go(g.edge(3, 1))
+
+        circular_tour = branch.finish().materialize()
+        assert isinstance(circular_tour, CircularTour)
+        assert [e.to_node.name for e in circular_tour] == [2, 3, 1] and circular_tour.cost == branch.cost == 6
+        assert other_branch.finish().cost == 10
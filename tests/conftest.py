@@ -1,9 +1,10 @@
 import pytest
 
 from grapresso.backends.memory import InMemoryBackend, Trait
+from grapresso.backends.matrix import MatrixBackend
 from grapresso.backends.networkx import NetworkXBackend
 
-ALL_BACKENDS = ('InMemory-OptimizeMemory', 'InMemory-OptimizePerformance', 'NetworkXBackend',)
+ALL_BACKENDS = ('InMemory-OptimizeMemory', 'InMemory-OptimizePerformance', 'NetworkXBackend', 'Matrix',)
 ENABLED_BACKENDS = ALL_BACKENDS
 
 
@@ -14,6 +15,7 @@ def create_backend(request, tmp_path):
             ALL_BACKENDS[0]: InMemoryBackend(Trait.OPTIMIZE_MEMORY),
             ALL_BACKENDS[1]: InMemoryBackend(Trait.OPTIMIZE_PERFORMANCE),
             ALL_BACKENDS[2]: NetworkXBackend(),
+            ALL_BACKENDS[3]: MatrixBackend(),
             # 'PickleFile': PickleFileBackend(str(tmp_path))
         }[request.param]
 
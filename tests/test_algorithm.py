@@ -1,9 +1,16 @@
 import math
+import random
+
+import pytest
 
 from grapresso import DiGraph, UnDiGraph
 from grapresso.backends import NetworkXBackend
 from grapresso.backends.memory import InMemoryBackend
+from grapresso.components.contraction import ContractionHierarchy
 from grapresso.components.path import Flow
+from grapresso.components.reachability import ReachabilityIndex
+from grapresso.datastruct import compact
+from grapresso.tools.generators import random_gnm
 
 
 class TestAlgorithm:
@@ -44,6 +51,29 @@ class TestAlgorithm:
 
         assert l1 != l2
 
+    def test_lazy_traversal(self, create_backend):
+        g = DiGraph(create_backend()) \
+            .add_edge("a", "b", cost=1) \
+            .add_edge("a", "c", cost=2) \
+            .add_edge("c", "d", cost=1) \
+            .add_edge('d', 'e', cost=2) \
+            .add_edge('e', 'a', cost=1)
+        assert ''.join(n.name for n in g.iter_dfs('a')) == "acdeb"
+        assert ''.join(n.name for n in g.iter_bfs('a')) == "abcde"
+        assert [(s.node.name, s.depth, s.parent and s.parent.name) for s in g.iter_dfs('a', max_depth=2, steps=True)] \
+               == [('a', 0, None), ('c', 1, 'a'), ('d', 2, 'c'), ('b', 1, 'a')]
+        assert [n.name for n in g.iter_bfs('a', max_depth=1)] == ['a', 'b', 'c']
+        assert [n.name for n in g.iter_bfs('a', edge_filter=lambda e: e.cost == 1)] == ['a', 'b']
+
+        # Breaking out of the loop stops the traversal, the remaining nodes are never scanned:
+        with g.instrumented() as stats:
+            for node in g.iter_bfs('c'):
+                if node.name == 'd':
+                    break
+        assert stats.edges_relaxed == 1 and stats.nodes_settled == 2
+        assert [e.to_node.name for e in g.shortest_path('c', 'b')] == ['d', 'e', 'a', 'b']
+        assert g.shortest_path('b', 'a') is None and g.shortest_path('a', 'a') is None
+
     def test_full_enumeration(self, create_backend):
         g = UnDiGraph(create_backend()) \
             .add_edge("Aachen", "Amsterdam", cost=230) \
@@ -111,3 +141,454 @@ class TestAlgorithm:
 
         edge = graph.edge("Aachen", "Amsterdam")
         assert edge.capacity == 100
+
+    def test_all_pairs_shortest_paths(self, create_backend, monkeypatch):
+        g = DiGraph(create_backend()) \
+            .add_edge('a', 'b', cost=4) \
+            .add_edge('a', 'c', cost=1) \
+            .add_edge('c', 'b', cost=2) \
+            .add_edge('b', 'd', cost=5) \
+            .add_edge('d', 'a', cost=1)
+        g.add_node('e')
+
+        results = [g.perform_all_pairs_dijkstra(), g.perform_floyd_warshall()]
+        monkeypatch.setattr(compact, 'np', None)
+        results.append(g.perform_floyd_warshall())
+        for apsp in results:
+            for node in g.backend:
+                expected = g.perform_dijkstra(node.name)
+                assert {n.name: e.dist for n, e in apsp.distance_table(node.name).items()} \
+                       == {n.name: e.dist for n, e in expected.items()}
+            assert apsp.distance('a', 'e') == math.inf and apsp.path('a', 'e') is None
+            assert [e.to_node.name for e in apsp.path('a', 'd')] == ['c', 'b', 'd']
+            assert apsp.path('d', 'b').cost == apsp.distance('d', 'b') == 4
+
+    def test_floyd_warshall_negative_costs(self):
+        g = DiGraph().add_edge(1, 2, cost=3).add_edge(2, 3, cost=-2).add_edge(1, 3, cost=2)
+        assert g.all_pairs_shortest_paths('floyd-warshall').distance(1, 3) == 1
+        with pytest.raises(ValueError):
+            g.perform_all_pairs_dijkstra()
+        g.add_edge(3, 1, cost=-2)
+        with pytest.raises(ValueError):
+            g.perform_floyd_warshall()
+
+    def test_johnson(self, create_backend):
+        g = DiGraph(create_backend()) \
+            .add_edge('a', 'b', cost=4) \
+            .add_edge('a', 'c', cost=5) \
+            .add_edge('c', 'b', cost=-3) \
+            .add_edge('b', 'd', cost=2) \
+            .add_edge('d', 'a', cost=1) \
+            .add_edge('d', 'c', cost=2)
+        g.add_node('e')
+
+        expected = g.perform_floyd_warshall()
+        johnson = g.perform_johnson()
+        for u in g.backend.node_names():
+            for v in g.backend.node_names():
+                assert johnson.distance(u, v) == expected.distance(u, v)
+        assert [e.to_node.name for e in johnson.path('a', 'b')] == ['c', 'b']
+        assert list(johnson.to_matrix(processes=2).dist) == list(expected.dist)
+
+        g.add_edge('b', 'a', cost=-7)
+        with pytest.raises(ValueError):
+            g.perform_johnson()
+
+        # Nodes can be relaxed more than n times by SPFA without a negative cycle:
+        g = DiGraph(create_backend())
+        for u, v, cost in ((0, 2, -4), (1, 0, -16), (1, 2, 2), (3, 0, -11), (3, 1, -11), (3, 2, -18),
+                           (4, 0, 3), (4, 1, -5), (4, 2, -19), (4, 3, -1)):
+            g.add_edge(u, v, cost=cost)
+        assert not g.perform_bellman_ford(4).is_cycle_detected
+        assert g.perform_johnson().distance(4, 2) == g.perform_floyd_warshall().distance(4, 2) == -32
+
+    def test_connected_components(self, create_backend):
+        g = UnDiGraph(create_backend()).add_edge(1, 2).add_edge(3, 4).add_node(5)
+        assert g.count_connected_components() == 3 and not g.is_connected()
+        assert g.component_of(1) == g.component_of(2) != g.component_of(3)
+
+        g.add_edge(2, 3).add_node(6)
+        assert g.count_connected_components() == 3
+        assert g.component_of(1) == g.component_of(4)
+        labels = g.component_labels()
+        assert sorted(labels.values()) == [0, 0, 0, 0, 1, 2] and labels[5] != labels[6]
+
+        g.add_edge(4, 5).add_edge(6, 1)
+        assert g.is_connected()
+
+    def test_strongly_connected_components(self, create_backend):
+        g = DiGraph(create_backend()) \
+            .add_edge('a', 'b', cost=1) \
+            .add_edge('b', 'c', cost=1) \
+            .add_edge('c', 'a', cost=1) \
+            .add_edge('c', 'd', cost=3) \
+            .add_edge('b', 'd', cost=2) \
+            .add_edge('d', 'e', cost=1) \
+            .add_edge('e', 'd', cost=1) \
+            .add_edge('f', 'e', cost=1)
+
+        scc = g.strongly_connected_components()
+        assert scc.count == 3
+        assert sorted(sorted(c) for c in scc.components()) == [['a', 'b', 'c'], ['d', 'e'], ['f']]
+        assert scc.label('a') == scc.label('c') < scc.label('d') == scc.label('e')
+        assert scc.label('f') < scc.label('e')
+        dag = scc.condensation
+        assert len(dag) == 3 and sum(1 for _ in dag.edges()) == 2
+        assert dag.edge(scc.label('a'), scc.label('d')).cost == 2
+
+    def test_strongly_connected_components_deep(self):
+        # A single long cycle would exceed the recursion limit of a recursive implementation:
+        g = DiGraph()
+        for i in range(5000):
+            g.add_edge(i, (i + 1) % 5000)
+        assert g.strongly_connected_components(condense=False).count == 1
+
+    def test_max_matchings(self, create_backend):
+        workers, shifts = {'w1', 'w2', 'w3', 'w4', 'w5'}, {'s1', 's2', 's3', 's4'}
+        g = UnDiGraph(create_backend())
+        for w, s in [('w1', 's1'), ('w1', 's2'), ('w2', 's1'), ('w3', 's2'), ('w3', 's3'),
+                     ('w4', 's3'), ('w4', 's4'), ('w5', 's4'), ('w1', 'w2')]:
+            g.add_edge(w, s)
+
+        matching = g.max_matchings(workers, shifts)
+        assert len(matching) == 4
+        assert all(e.from_node.name in workers and e.to_node.name in shifts for e in matching)
+        assert len({e.from_node.name for e in matching}) == len({e.to_node.name for e in matching}) == 4
+
+    def test_hopcroft_karp_phases_use_shortest_paths(self, create_backend):
+        # Small ints as names, so that A is scanned in ascending order by all backends (even if they return sets):
+        g = UnDiGraph(create_backend())
+        for a, b in [(1, 11), (1, 12), (2, 11), (3, 13), (3, 14), (4, 13), (5, 14), (5, 16)]:
+            g.add_edge(a, b)
+
+        with g.instrumented() as stats:
+            matching = g.perform_hopcroft_karp({1, 2, 3, 4, 5}, {11, 12, 13, 14, 16})
+        assert len(matching) == stats.augmentations == 5
+        # Phase 1 matches 1-11, 3-13 and 5-14. Then 2 has an augmenting path of length 3 and 4 one of length 5,
+        # which must not be augmented in the same phase, so it takes three phases plus the final one finding nothing:
+        assert stats.phase_calls['layering'] == 4
+
+    def test_streaming_tours(self, create_backend):
+        g = UnDiGraph(create_backend())
+        cities = ['a', 'b', 'c', 'd', 'e', 'f']
+        for i, u in enumerate(cities):
+            for j, v in enumerate(cities[i + 1:], i + 1):
+                g.add_edge(u, v, cost=(i + 1) * (j + 2) % 7 + 1)
+
+        tours = list(g.iter_tours('a'))
+        assert len(tours) == math.factorial(len(cities) - 1) // 2
+        assert len({frozenset(frozenset((e.from_node.name, e.to_node.name)) for e in t) for t in tours}) == len(tours)
+        names = list(g.iter_tours('a', as_names=True, predicate=lambda t: t.cost <= 20))
+        assert all(len(t) == len(cities) and t[0] == 'a' for t in names)
+        assert len(names) == sum(1 for t in tours if t.cost <= 20)
+
+        costs = sorted(t.cost for t in tours)
+        cheapest = g.cheapest_tours(5, 'a')
+        assert [t.cost for t in cheapest] == costs[:5]
+        assert cheapest[0].cost == g.cheapest_tour('a').cost
+        assert len(g.cheapest_tours(1000, 'a', as_names=True)) == len(tours)
+
+    def test_flows(self, create_backend):
+        def build():
+            g = DiGraph(create_backend())
+            for name, balance in (('s', 4), ('a', 0), ('b', 0), ('t', -4)):
+                g.add_node(name, balance=balance)
+            return g \
+                .add_edge('s', 'a', capacity=3, cost=1) \
+                .add_edge('s', 'b', capacity=2, cost=4) \
+                .add_edge('a', 'b', capacity=2, cost=1) \
+                .add_edge('a', 't', capacity=2, cost=5) \
+                .add_edge('b', 't', capacity=3, cost=1)
+
+        max_flow = build().perform_edmonds_karp('s', 't')
+        assert max_flow.max_flow == 5
+        assert sum(f for e, f in max_flow.to_dict().items() if e.from_node.name == 's') == 5
+
+        for min_cost_flow in (build().perform_successive_shortest_path(), build().perform_cycle_cancelling()):
+            assert min_cost_flow.cost == 17
+            assert min_cost_flow[build().edge('a', 'b')] == 2
+
+    def test_flow_edge_ids(self, create_backend):
+        # Both graphs number their edges alike, so their ids collide:
+        g1 = DiGraph(create_backend()).add_edge('a', 'b', capacity=5).add_edge('b', 'c', capacity=5)
+        g2 = DiGraph(create_backend()).add_edge('x', 'y', capacity=5)
+        flow = Flow({g1.edge('a', 'b'): 1, g1.edge('b', 'c'): 2})
+        flow[g2.edge('x', 'y')] = 3
+        assert flow[g1.edge('a', 'b')] == 1 and flow[g1.edge('b', 'c')] == 2 and flow[g2.edge('x', 'y')] == 3
+        assert {(e.from_node.name, e.to_node.name): f for e, f in flow.to_dict().items()} \
+               == {('a', 'b'): 1, ('b', 'c'): 2, ('x', 'y'): 3}
+
+        # Ids of removed edges are not reused, even if the backend reuses the storage of the removed node:
+        flow = Flow({g1.edge('a', 'b'): 1})
+        g1.remove_node('a')
+        g1.add_node('z')
+        g1.add_edge('z', 'b', capacity=5)
+        assert flow[g1.edge('z', 'b')] == 0
+
+    def test_minimum_spanning_forest(self, create_backend):
+        g = UnDiGraph(create_backend()) \
+            .add_edge('a', 'b', cost=1) \
+            .add_edge('b', 'c', cost=2) \
+            .add_edge('a', 'c', cost=2) \
+            .add_edge('c', 'd', cost=7) \
+            .add_edge('x', 'y', cost=3)
+        g.add_node('z')
+        for algorithm in ('prim', 'dense-prim', 'kruskal', 'boruvka'):
+            tree_edges = []
+            costs = {'prim': g.perform_prim, 'dense-prim': g.perform_dense_prim, 'kruskal': g.perform_kruskal,
+                     'boruvka': g.perform_boruvka}[algorithm](on_new_edge_cb=tree_edges.append)
+            assert costs == 13 and len(tree_edges) == 4, algorithm
+            assert sum(e.cost for e in tree_edges) == 13
+            mst = g.build_mst(UnDiGraph(), algorithm).tree
+            assert mst.count_connected_components() == 2 and len(mst) == 6 and 'z' not in mst.backend
+        # Each further tree grows from a node that is not covered yet:
+        assert g.perform_prim('y') == g.perform_dense_prim('z') == 13
+        assert UnDiGraph(create_backend()).perform_prim() == 0
+
+    def test_bidirectional_shortest_path(self, create_backend):
+        for graph_type in (DiGraph, UnDiGraph):
+            g = random_gnm(graph_type(create_backend()), 40, 70, seed=3)
+            for source in range(0, 40, 7):
+                hops = {step.node.name: step.depth for step in g.iter_bfs(source, steps=True)}
+                for target in range(40):
+                    path = g.shortest_path(source, target)
+                    if target == source or target not in hops:
+                        assert path is None
+                    else:
+                        edges = list(path)
+                        assert len(edges) == hops[target] and edges[-1].to_node.name == target
+                        assert all(e.to_node == f.from_node for e, f in zip(edges, edges[1:]))
+
+        # Both searches meet halfway, far fewer nodes are explored than by a one-sided search:
+        g = DiGraph(create_backend())
+        for u in range(1, 1 + 10 + 100):
+            g.add_edge((u - 1) // 10, u).add_edge(u, (u - 1) // 10)
+        with g.instrumented() as stats:
+            assert len(list(g.shortest_path(1, 2))) == 2
+            assert len(list(g.shortest_path(11, 101))) == 4
+        assert stats.nodes_settled < 60
+
+    def test_multi_source_bfs(self, create_backend):
+        g = random_gnm(DiGraph(create_backend()), 90, 150, seed=5)
+        # Two batches, the second one is partially filled and contains a duplicate source:
+        sources = list(range(0, 90, 2)) + list(range(1, 90, 3)) + [0]
+        result = g.perform_ms_bfs(sources)
+        reachability = g.perform_ms_bfs(sources, hops=False, batch_size=7)
+        assert len(result.reach) == 2 and len(reachability.reach) == 11
+        for source in sources:
+            hops = {step.node.name: step.depth for step in g.iter_bfs(source, steps=True)}
+            assert sorted(result.reached(source)) == sorted(reachability.reached(source)) == sorted(hops)
+            for target in range(90):
+                assert result.distance(source, target) == hops.get(target, math.inf)
+                assert result.reaches(source, target) == reachability.reaches(source, target) == (target in hops)
+        assert sorted(reachability.sources_reaching(0)) == sorted(s for s in sources if result.reaches(s, 0))
+        with pytest.raises(ValueError):
+            reachability.distance(0, 1)
+        with pytest.raises(ValueError):
+            g.perform_ms_bfs(sources, batch_size=65)
+
+    def test_reachability_index(self, create_backend):
+        g = random_gnm(DiGraph(create_backend()), 60, 80, seed=11)
+        g.add_node('isolated')
+        for _ in range(2):
+            for u in g.backend.node_names():
+                reached = {n.name for n in g.perform_dfs(u)}
+                for v in g.backend.node_names():
+                    assert g.reaches(u, v) == (v in reached)
+            # Modifications invalidate the index, it is rebuilt on the next query:
+            g.add_edge('isolated', 0).add_edge(59, 'isolated')
+        assert g.reaches(59, 0) and g.reaches(0, 0)
+        with pytest.raises(KeyError):
+            g.reaches(0, 'missing')
+
+    def test_reachability_interval_labels(self, create_backend):
+        # Diamonds and cycles, so that there are components only reachable via non-tree edges of the DFS:
+        g = random_gnm(DiGraph(create_backend()), 80, 150, seed=5)
+        g.add_edge('s', 'a').add_edge('s', 'b').add_edge('a', 't').add_edge('b', 't').add_edge('t', 's')
+        g.add_edge('b', 'c').add_edge('a', 'd').add_edge('c', 'd')
+        bitsets, intervals = ReachabilityIndex(g), ReachabilityIndex(g, bitset_limit=0)
+        assert bitsets.component_count == intervals.component_count
+        for u in g.backend.node_names():
+            reached = {n.name for n in g.perform_dfs(u)}
+            for v in g.backend.node_names():
+                assert intervals.reaches(u, v) == bitsets.reaches(u, v) == (v in reached)
+
+        # A long chain would take k²/16 bytes as bitset rows:
+        chain = DiGraph(create_backend())
+        for i in range(3000):
+            chain.add_edge(i, i + 1)
+        index = ReachabilityIndex(chain)
+        assert index.component_count == 3001
+        assert index.reaches(0, 3000) and index.reaches(1500, 1501) and not index.reaches(3000, 0)
+
+    def test_contraction_hierarchy(self, create_backend, tmp_path):
+        for graph_type in (DiGraph, UnDiGraph):
+            g = random_gnm(graph_type(create_backend()), 50, 120, seed=13)
+            g.add_node('isolated')
+            hierarchy = g.contraction_hierarchy()
+            hierarchy.save(str(tmp_path / 'ch.pickle'))
+            loaded = ContractionHierarchy.load(str(tmp_path / 'ch.pickle'), g)
+            for source in range(0, 50, 3):
+                dist = {n.name: e.dist for n, e in g.perform_dijkstra(source).items()}
+                for target in list(range(50)) + ['isolated']:
+                    assert hierarchy.distance(source, target) == dist.get(target, math.inf)
+                    path = loaded.path(source, target)
+                    if target not in dist:
+                        assert path is None
+                    else:
+                        # Shortcuts are unpacked into original edges:
+                        edges = list(path)
+                        assert sum(e.cost for e in edges) == dist[target]
+                        assert all(g.edge(e.from_node.name, e.to_node.name) is not None for e in edges)
+        with pytest.raises(ValueError):
+            ContractionHierarchy.load(str(tmp_path / 'ch.pickle')).path(0, 1)
+        with pytest.raises(ValueError):
+            DiGraph(create_backend()).add_edge('a', 'b', cost=-1).contraction_hierarchy()
+
+    def test_kruskal_cost_ranking(self, create_backend, monkeypatch):
+        # Integral costs are radix sorted, fractional or wide-ranged ones are compared as floats:
+        for scale in (1, 0.5, 1e6):
+            g = UnDiGraph(create_backend())
+            rng = random.Random(7)
+            for _ in range(60):
+                g.add_edge(rng.randrange(20), rng.randrange(20), cost=rng.randrange(-3, 10) * scale)
+            picked = []
+            costs = g.perform_kruskal(picked.append)
+            assert costs == g.perform_prim()
+            # Ties are broken by edge order, so the tree does not depend on the sort:
+            monkeypatch.setattr(compact, 'np', None)
+            replayed = []
+            assert g.perform_kruskal(replayed.append) == costs and replayed == picked
+            monkeypatch.undo()
+
+    def test_instrumentation(self, create_backend):
+        g = DiGraph(create_backend()) \
+            .add_edge('a', 'b', cost=1) \
+            .add_edge('a', 'c', cost=4) \
+            .add_edge('b', 'c', cost=1) \
+            .add_edge('c', 'd', cost=1)
+        assert g.stats is None
+
+        with g.instrumented() as stats:
+            g.perform_dijkstra('a')
+            g.all_pairs_shortest_paths('dijkstra')
+        assert g.stats is None
+        # c is pushed twice (via a and via b), so its edges are scanned twice:
+        assert stats.edges_relaxed == 5 and stats.nodes_settled == 4
+        assert stats.heap_pushes == stats.heap_pops == 5
+        assert set(stats.phase_ns) == {'export', 'dijkstra'} and stats.phase_calls['export'] == 1
+
+        g.perform_dijkstra('a')
+        assert stats.edges_relaxed == 5
+
+        g = DiGraph(create_backend()) \
+            .add_edge('s', 'a', capacity=2) \
+            .add_edge('s', 'b', capacity=1) \
+            .add_edge('a', 't', capacity=1) \
+            .add_edge('b', 't', capacity=2)
+        with g.instrumented(stats) as accumulated:
+            stats.reset()
+            g.perform_edmonds_karp('s', 't')
+        assert accumulated is stats and stats.augmentations == 2
+        assert stats.residual_rebuilds == 3 == stats.phase_calls['residual-graph']
+        assert stats.to_dict()['phase_calls']['augmenting-path'] == 3
+        # Searches on the residual graphs are counted as well:
+        assert stats.nodes_settled > 0
+
+    def test_result_cache(self, create_backend):
+        g = UnDiGraph(create_backend()) \
+            .add_edge('a', 'b', cost=1) \
+            .add_edge('b', 'c', cost=2) \
+            .add_edge('a', 'c', cost=5)
+        version = g.backend.version
+        cache = g.enable_result_cache(max_entries=8)
+
+        dist = g.perform_dijkstra('a')
+        assert g.perform_dijkstra('a') is dist and cache.hits == 1
+        visited = []
+        assert g.perform_dfs('a') == g.perform_dfs('a', lambda n: visited.append(n.name))
+        assert len(visited) == 3 and cache.hits == 2
+        mst = g.build_mst(UnDiGraph(), 'kruskal')
+        replayed = g.build_mst(UnDiGraph(), 'kruskal')
+        assert mst.costs == replayed.costs == 3 and len(replayed.tree.edges()) == len(mst.tree.edges())
+        assert cache.hits == 3 and g.backend.version == version
+
+        # Every modification invalidates the results:
+        g.edge('a', 'c').cost = 2
+        assert g.backend.version > version and g.perform_dijkstra('a') is not dist and len(cache) == 1
+        assert g.perform_dijkstra('a')[g.node('c')].dist == 2
+        g.add_node('d')
+        assert g.node('d') in g.perform_bfs('d')
+
+        g.disable_result_cache()
+        assert g.perform_dijkstra('a') is not g.perform_dijkstra('a')
+
+    def test_dynamic_dijkstra(self, create_backend):
+        g = DiGraph(create_backend()) \
+            .add_edge('a', 'b', cost=1) \
+            .add_edge('b', 'c', cost=1) \
+            .add_edge('c', 'd', cost=1) \
+            .add_edge('a', 'c', cost=5)
+        g.add_node('e')
+
+        def assert_matches_dijkstra(paths):
+            expected = {n.name: e.dist for n, e in g.perform_dijkstra('a').items()}
+            assert {n: paths.distance(n) for n in g.backend.node_names() if n in expected} == expected
+            assert len(paths) == len(expected)
+
+        with g.dynamic_dijkstra('a') as paths:
+            assert paths.distance('d') == 3 and paths.parent('c') == 'b' and paths.distance('e') == math.inf
+            # Cheaper edge, the subtree of c follows:
+            g.edge('a', 'c').cost = 1
+            assert paths.distance('d') == 2 and paths.parent('c') == 'a'
+            assert_matches_dijkstra(paths)
+            # More expensive tree edge, the subtree of c is re-attached via b:
+            g.edge('a', 'c').cost = 10
+            assert paths.distance('d') == 3 and paths.parent('c') == 'b'
+            assert_matches_dijkstra(paths)
+            # New edge:
+            g.add_edge('d', 'e', cost=2)
+            assert paths.distance('e') == 5 and [e.to_node.name for e in paths.path('e')] == ['b', 'c', 'd', 'e']
+            assert_matches_dijkstra(paths)
+            assert paths.distance_table()[g.node('e')].parent == g.node('d')
+            # Non-tree edge, nothing to update:
+            g.edge('a', 'c').cost = 20
+            assert paths.distance('c') == 2
+        g.edge('a', 'b').cost = 100
+        # No longer registered:
+        assert paths.distance('b') == 1
+
+        # Negative costs invalidate the paths, but neither the modification nor later listeners are affected:
+        paths = g.dynamic_dijkstra('a')
+        later = g.dynamic_dijkstra('a')
+        g.edge('a', 'c').cost = -1
+        assert g.edge('a', 'c').cost == -1 and not paths.is_valid and not later.is_valid
+        with pytest.raises(ValueError):
+            paths.distance('c')
+        g.edge('a', 'c').cost = 1
+        with pytest.raises(ValueError):
+            later.path('c')
+        assert not g.backend._listeners
+        g.edge('a', 'b').cost = -1
+        with pytest.raises(ValueError):
+            g.dynamic_dijkstra('a')
+
+    def test_dynamic_dijkstra_random_updates(self, create_backend):
+        g = random_gnm(DiGraph(create_backend()), 30, 90, seed=3, cost_range=(1, 10))
+        rnd = random.Random(7)
+        paths = g.dynamic_dijkstra(0)
+        for _ in range(60):
+            edges = g.edges()
+            edge = rnd.choice(edges)
+            action = rnd.random()
+            if action < 0.4:
+                edge.cost = rnd.randint(1, 20)
+            elif action < 0.7:
+                u, v = rnd.sample(range(30), 2)
+                if g.edge(u, v) is None:
+                    g.add_edge(u, v, cost=rnd.randint(1, 20))
+            else:
+                g.remove_edge(edge.from_node.name, edge.to_node.name)
+            expected = {n.name: e.dist for n, e in g.perform_dijkstra(0).items()}
+            assert {n: paths.distance(n) for n in range(30) if paths.distance(n) < math.inf} == expected
+        paths.close()
@@ -1,5 +1,7 @@
 import pytest
 
+from grapresso import UnDiGraph
+from grapresso.backends.matrix import MatrixBackend
 from grapresso.components.node import Node
 
 
@@ -44,3 +46,70 @@ class TestBackend:
         edge.capacity = 20
         assert edge.capacity == 20
 
+    def test_removal(self, create_backend):
+        backend = create_backend()
+        for name in 'abcd':
+            backend.add_node(name)
+        backend.add_edge('a', 'b', cost=1)
+        backend.add_edge('a', 'c', cost=2)
+        backend.add_edge('a', 'd', cost=3)
+        backend.add_edge('b', 'c', symmetric=True, cost=4)
+        backend.add_edge('d', 'c', cost=5)
+        assert set(backend.predecessors('c')) == {'a', 'b', 'd'} and list(backend.predecessors('a')) == []
+
+        # The last edge is moved into the gap, the others stay accessible:
+        backend.remove_edge('a', 'b')
+        assert [e.to_node.name for e in sorted(backend['a'].edges, key=lambda e: e.cost)] == ['c', 'd']
+        assert backend['a'].edge('d').cost == 3 and set(backend.predecessors('b')) == {'c'}
+        with pytest.raises(KeyError):
+            backend['a'].edge('b')
+        with pytest.raises(KeyError):
+            backend.remove_edge('a', 'b')
+
+        # Symmetric edges and all edges to the node are removed with it:
+        backend.remove_node('c')
+        assert 'c' not in backend and len(backend) == 3
+        assert [(e.from_node.name, e.to_node.name) for e in backend.edges()] == [('a', 'd')]
+        assert list(backend['b'].edges) == [] and list(backend['d'].edges) == []
+        backend.add_edge('d', 'b', cost=6)
+        assert list(backend.predecessors('b')) == ['d'] and backend['d'].edge('b').cost == 6
+
+    def test_canonical_objects(self, create_backend):
+        backend = create_backend()
+        for name in ('a', 'b'):
+            backend.add_node(name)
+        backend.add_edge('a', 'b', cost=1)
+        if backend.canonical:
+            assert backend['a'] is backend['a']
+            assert backend['a'].edge('b') is next(iter(backend.edges()))
+        assert backend['a'] == 'a' and backend['a'] == backend['a'] != backend['b']
+        assert hash(backend['a'].edge('b')) == hash((backend['a'], backend['b'])) == hash(('a', 'b'))
+        assert {backend['a'].edge('b'): 1}[backend['a'].edge(backend['b'])] == 1
+
+
+class TestMatrixBackend:
+    def test_removal_reuses_slots(self):
+        backend = MatrixBackend()
+        for name in 'abc':
+            backend.add_node(name)
+        backend.add_edge('a', 'b', symmetric=True, cost=3, capacity=7, label='ab')
+        backend.add_edge('b', 'c', cost=5)
+        assert backend['b'].edge('a')['label'] == 'ab'
+
+        backend.remove_node('a')
+        assert 'a' not in backend and len(backend) == 2
+        assert sum(1 for _ in backend.edges()) == 1
+
+        backend.add_node('d')
+        backend.add_edge('d', 'c', cost=1)
+        assert [n.name for n in backend['d'].neighbours] == ['c']
+        assert backend['d'].edge('c').capacity == 0.0 and 'label' not in backend['d'].edge('c').data
+        with pytest.raises(KeyError):
+            backend['b'].edge('d')
+
+    def test_metric_tour(self):
+        positions = {'Aachen': (0, 0), 'Brussels': (0, 3), 'Amsterdam': (4, 3), 'Luxembourg': (4, 0)}
+        graph = UnDiGraph(MatrixBackend.from_positions(positions))
+        assert graph.edge('Aachen', 'Amsterdam').cost == 5
+        assert sum(1 for _ in graph.edges()) == 12
+        assert graph.cheapest_tour('Aachen').cost == 14
@@ -0,0 +1,54 @@
+import pytest
+
+from grapresso import DiGraph, UnDiGraph
+from grapresso.tools import benchmark
+from grapresso.tools.generators import random_gnm, grid, complete_euclidean, bipartite_flow_network
+
+
+class TestGenerators:
+    def test_deterministic(self, create_backend):
+        def edges(graph):
+            return sorted((e.from_node.name, e.to_node.name, e.cost) for e in graph.edges())
+
+        assert edges(random_gnm(DiGraph(create_backend()), 50, 200, seed=7)) \
+               == edges(random_gnm(DiGraph(), 50, 200, seed=7)) \
+               != edges(random_gnm(DiGraph(), 50, 200, seed=8))
+
+    def test_sizes(self, create_backend):
+        assert len(list(random_gnm(DiGraph(create_backend()), 20, 60).edges())) == 60
+        assert len(list(random_gnm(UnDiGraph(create_backend()), 20, 60).edges())) == 120
+        with pytest.raises(ValueError):
+            random_gnm(UnDiGraph(create_backend()), 4, 7)
+        g = grid(DiGraph(create_backend()), 3, 4)
+        assert len(g) == 12 and len(list(g.edges())) == 2 * (3 * 3 + 2 * 4)
+        assert len(list(complete_euclidean(UnDiGraph(create_backend()), 6).edges())) == 6 * 5
+
+    def test_flow_network_is_balanced(self, create_backend):
+        g = bipartite_flow_network(DiGraph(create_backend()), 4, 3, seed=1)
+        assert sum(n.balance for n in g.backend) == 0
+        flow = g.perform_successive_shortest_path()
+        assert flow.max_flow == sum(n.balance for n in g.backend if n.balance > 0)
+
+
+class TestBenchmark:
+    def test_timing(self):
+        timing = benchmark.Timing([40, 10, 30, 20])
+        assert timing.fastest == 10 and timing.median == 25
+        assert timing.percentile(100) == 40 and timing.to_dict()['p90'] == 37
+
+    def test_run_and_compare(self):
+        calls = []
+        timing = benchmark.measure(calls.append, repeat=3, warmup=2, setup=lambda: (len(calls),))
+        assert calls == [0, 1, 2, 3, 4] and len(timing.samples) == 3
+
+        report = benchmark.run(['bfs', 'cycle-cancelling'], ['InMemory-OptimizePerformance'],
+                               scale=0.02, repeat=2, warmup=0)
+        assert [r['benchmark'] for r in report['results']] == ['bfs', 'cycle-cancelling']
+        slower = {'results': [dict(r, timing_ns=dict(r['timing_ns'], p50=r['timing_ns']['p50'] * 2))
+                              for r in report['results']]}
+        assert not any(c['regression'] for c in benchmark.compare(report, report))
+        assert all(c['regression'] and c['ratio'] == 2 for c in benchmark.compare(report, slower))
+
+    def test_all_benchmarks_run_scaled_down(self):
+        report = benchmark.run(scale=0.01, repeat=1, warmup=0)
+        assert len(report['results']) == len(benchmark.BENCHMARKS) * len(benchmark.BACKENDS)
@@ -0,0 +1,27 @@
+from grapresso import DiGraph, UnDiGraph
+from grapresso.backends.memory import InMemoryBackend, Trait
+from grapresso.tools.generators import random_gnm
+from grapresso.tools.memory import footprint, COMPONENTS
+
+
+class TestFootprint:
+    def test_components(self, create_backend):
+        g = random_gnm(DiGraph(create_backend()), 200, 1000)
+        exact = footprint(g)
+        assert exact.is_exact and exact.node_count == 200 and exact.edge_count == 1000
+        assert set(exact.components) == set(COMPONENTS) and exact.total > 0
+        assert exact.components['attributes'] > 0
+        assert exact.per_edge()['attributes'] == exact.components['attributes'] / 1000
+        assert footprint(g.backend).total == exact.total
+
+        # Samples are extrapolated:
+        estimate = footprint(g, sample_size=50)
+        assert not estimate.is_exact and estimate.sampled_nodes == 50
+        assert 0.8 < estimate.total / exact.total < 1.2
+        assert 0.8 < estimate.edge_count / exact.edge_count < 1.2
+
+    def test_symmetric_edges_stored_once(self):
+        def edge_bytes(trait):
+            return footprint(random_gnm(UnDiGraph(InMemoryBackend(trait)), 100, 400)).components['edges']
+
+        assert edge_bytes(Trait.OPTIMIZE_PERFORMANCE) > 1.9 * edge_bytes(Trait.OPTIMIZE_MEMORY)
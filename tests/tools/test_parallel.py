@@ -0,0 +1,48 @@
+import math
+
+from grapresso import DiGraph, UnDiGraph
+from grapresso.datastruct.compact import CompactGraph, boruvka, rank_edges, reorder
+from grapresso.tools.generators import random_gnm
+from grapresso.tools.parallel import MultiSourceExecutor, parallel_boruvka
+
+
+class TestMultiSourceExecutor:
+    def test_parallel_equals_sequential(self):
+        g = DiGraph()
+        for i in range(30):
+            g.add_edge(i, (i + 1) % 30, cost=1 + i % 4)
+            g.add_edge(i, (i * 7) % 30, cost=10)
+        g.add_node('isolated')
+        sources = list(range(0, 30, 3)) + ['isolated']
+
+        with MultiSourceExecutor(g, processes=2) as executor:
+            assert executor.is_parallel
+            parallel = executor.run(sources, chunk_size=2)
+            pool = executor._pool
+            parallel_bfs = executor.run(sources, 'bfs')
+            # The pool is started once and reused by all runs:
+            assert executor._pool is pool is not None
+        assert executor._pool is None
+        sequential = g.perform_multi_source(sources, processes=1)
+
+        assert list(parallel.dist) == list(sequential.dist) and list(parallel.pred) == list(sequential.pred)
+        for source in sources:
+            expected = g.perform_dijkstra(source)
+            assert {n.name: e.dist for n, e in parallel.distance_table(source).items()} \
+                   == {n.name: e.dist for n, e in expected.items()}
+        assert parallel.distance('isolated', 0) == math.inf
+        assert parallel_bfs.distance(0, 29) == len(parallel_bfs.path(0, 29).edges) == len(g.shortest_path(0, 29).edges)
+
+
+class TestParallelBoruvka:
+    def test_parallel_equals_sequential(self):
+        # Few distinct costs, so that the tie-breaking is exercised:
+        g = random_gnm(UnDiGraph(), 300, 900, seed=5, cost_range=(1, 4))
+        csr = CompactGraph.from_backend(g.backend)
+        ranks, tails = rank_edges(csr.costs), csr.tails()
+        tails, heads = reorder(tails, ranks), reorder(csr.targets, ranks)
+        sequential = boruvka(len(csr), tails, heads)
+        parallel = parallel_boruvka(len(csr), tails, heads, processes=2, shard_size=100)
+        assert sorted(parallel) == sorted(sequential)
+        assert sum(csr.costs[ranks[e]] for e in parallel) == g.perform_kruskal() == g.perform_boruvka(processes=2)
+        assert len(parallel) == len(csr) - g.count_connected_components()